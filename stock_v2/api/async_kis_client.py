@@ -0,0 +1,217 @@
+import asyncio
+import json
+import time
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+
+# aiohttp: asyncio 기반 HTTP 클라이언트 (requests의 비동기 버전이라고 생각하면 됨)
+import aiohttp
+
+from stock_v2.api.kis_client import KisClient
+from stock_v2.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 루프 하나가 동시에 열어둘 수 있는 최대 연결 수
+# 스레드와 달리 연결 하나하나가 가볍기 때문에 스레드 풀보다 훨씬 크게 잡을 수 있음
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+class AsyncKisClient:
+    """
+    KisClient의 asyncio 버전
+
+    - 메서드 이름과 반환값은 KisClient와 동일하지만, 모두 `await`로 호출하는 코루틴임
+    - 요청 구성/응답 해석, 토큰, 속도 제한기(토큰 버킷), 리스너는 내부의 KisClient와 공유하므로
+      동기/비동기 경로가 같은 규칙과 같은 초당 한도를 따름
+    - 전송 계층만 requests(스레드 블로킹) 대신 aiohttp(논블로킹)를 사용함
+
+    사용법:
+        async with AsyncKisClient(**config) as client:
+            rows = await client.get_chart_price("005930", "20260101", "20260131")
+
+    학습 포인트:
+    - async def로 정의한 함수는 호출하면 바로 실행되지 않고 '코루틴 객체'를 돌려줌.
+      await를 만나면 I/O를 기다리는 동안 이벤트 루프가 다른 코루틴을 실행함
+    - 그래서 스레드 수백 개 없이도 요청 수백 건을 동시에 대기시킬 수 있음
+    """
+
+    def __init__(self, app_key: str, app_secret: str, acc_no: str, mock: bool = True,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS, **client_options: Any):
+        """
+        Args:
+            app_key, app_secret, acc_no, mock: KisClient와 동일
+            max_connections: aiohttp 커넥션 풀 크기
+            client_options: KisClient에 그대로 전달할 추가 옵션 (timeout, rate_limiter 등)
+        """
+        self._init(KisClient(app_key, app_secret, acc_no, mock=mock, **client_options), max_connections)
+
+    @classmethod
+    def from_client(cls, client: KisClient, max_connections: int = DEFAULT_MAX_CONNECTIONS) -> "AsyncKisClient":
+        """
+        이미 만들어진 KisClient의 설정/토큰/속도 제한기를 그대로 공유하는 비동기 클라이언트 생성
+
+        학습 포인트:
+        - cls.__new__(cls)는 __init__을 거치지 않고 빈 인스턴스만 만듦 (대체 생성자 패턴)
+        """
+        instance = cls.__new__(cls)
+        instance._init(client, max_connections)
+        return instance
+
+    def _init(self, client: KisClient, max_connections: int) -> None:
+        self.client = client
+        self.mock = client.mock
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncKisClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def add_listener(self, listener) -> None:
+        """요청 결과 리스너 등록 (KisClient.add_listener와 동일)"""
+        self.client.add_listener(listener)
+
+    def remove_listener(self, listener) -> None:
+        """요청 결과 리스너 제거 (KisClient.remove_listener와 동일)"""
+        self.client.remove_listener(listener)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """현재 이벤트 루프에서 사용할 aiohttp 세션 (없거나 닫혔으면 생성)"""
+        if self._session is None or self._session.closed:
+            connect_timeout, read_timeout = self.client.timeout
+            timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def close(self) -> None:
+        """aiohttp 세션(커넥션 풀) 정리"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _send_request(self, method: str, url: str, headers: Optional[Dict] = None,
+                            params: Optional[Dict] = None, data: Optional[Dict] = None,
+                            max_retries: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        API 요청 전송 (KisClient._send_request와 같은 재시도 규칙의 비동기 버전)
+
+        학습 포인트:
+        - 토큰 버킷의 reserve()는 대기 시간만 계산해 주므로, 여기서는 time.sleep 대신
+          await asyncio.sleep으로 기다려 이벤트 루프를 막지 않음
+        """
+        client = self.client
+        tr_id = headers.get('tr_id') if headers else None
+        ticker = params.get('FID_INPUT_ISCD') if params else None
+        with span("kis.request", cat="api", tr_id=tr_id, ticker=ticker) as request_span:
+            for i in range(max_retries):
+                wait = 0.0
+                started = None
+                try:
+                    with span("kis.rate_limit_wait", cat="api", tr_id=tr_id, ticker=ticker):
+                        wait = client.rate_limiter.reserve()
+                        if wait > 0:
+                            await asyncio.sleep(wait)
+                    session = self._get_session()
+                    with span("kis.http", cat="api", tr_id=tr_id, ticker=ticker, attempt=i) as http_span:
+                        started = time.perf_counter()
+                        if method == 'GET':
+                            request = session.get(url, headers=headers, params=params)
+                        else:
+                            request = session.post(url, headers=headers, data=json.dumps(data) if data else None)
+                        async with request as res:
+                            status = res.status
+                            body = await res.read()
+                        latency = time.perf_counter() - started
+                        http_span.set(status=status)
+                    event = {'tr_id': tr_id, 'status': status, 'latency': latency, 'wait': wait, 'attempt': i,
+                             'bytes': len(body)}
+
+                    if status == 200:
+                        data_json = json.loads(body)
+                        if client._is_rate_limited(data_json):
+                            wait_time = 0.5 * (2 ** i)
+                            client._notify({**event, 'outcome': 'rate_limited', 'backoff': wait_time})
+                            client.rate_limiter.drain()
+                            logger.warning(f"[KIS] API 제한 도달. {wait_time}초 대기 후 재시도 ({i+1}/{max_retries})")
+                            with span("kis.backoff", cat="api", tr_id=tr_id, ticker=ticker, reason="rate_limited"):
+                                await asyncio.sleep(wait_time)
+                            continue
+                        client._notify({**event, 'outcome': 'ok'})
+                        request_span.set(attempts=i + 1, outcome='ok')
+                        return data_json
+                    else:
+                        if status >= 500:
+                            client._notify({**event, 'outcome': 'server_error', 'backoff': 1.0})
+                            logger.warning(f"[KIS] Server Error {status}. Retrying...")
+                            with span("kis.backoff", cat="api", tr_id=tr_id, ticker=ticker, reason="server_error"):
+                                await asyncio.sleep(1.0)
+                            continue
+                        client._notify({**event, 'outcome': 'client_error'})
+                        logger.error(f"[KIS] Request Failed: {status} {body.decode('utf-8', 'replace')}")
+                        request_span.set(attempts=i + 1, outcome='client_error')
+                        return None
+                except asyncio.CancelledError:
+                    # 작업 취소는 재시도하지 않고 그대로 전파해야 함
+                    raise
+                except Exception as e:
+                    latency = time.perf_counter() - started if started is not None else 0.0
+                    client._notify({'tr_id': tr_id, 'status': None, 'latency': latency, 'wait': wait, 'attempt': i,
+                                    'outcome': 'exception', 'backoff': 1.0})
+                    logger.error(f"[KIS] Request Error: {e}")
+                    with span("kis.backoff", cat="api", tr_id=tr_id, ticker=ticker, reason="exception"):
+                        await asyncio.sleep(1.0)
+            request_span.set(attempts=max_retries, outcome='gave_up')
+        return None
+
+    async def auth(self) -> bool:
+        """
+        접근 토큰 발급
+
+        토큰 발급은 스캔당 한 번뿐이므로, single-flight/파일 잠금 규칙을 그대로 따르도록
+        동기 KisClient.auth를 별도 스레드에서 실행함 (이벤트 루프는 막지 않음)
+        발급 구간(kis.auth)도 KisClient.auth가 그 스레드에서 기록함
+        """
+        if self.client._token_valid():
+            return True
+        return await asyncio.to_thread(self.client.auth)
+
+    async def _ensure_auth(self) -> bool:
+        if not self.client.access_token:
+            return await self.auth()
+        return True
+
+    async def _request(self, spec: Tuple[str, Dict[str, str], Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        url, headers, params = spec
+        return await self._send_request('GET', url, headers=headers, params=params)
+
+    async def get_current_price(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """주식 현재가 시세 및 종목 정보 조회"""
+        if not await self._ensure_auth():
+            return None
+        data = await self._request(self.client._current_price_request(ticker))
+        return self.client._parse_current_price(data)
+
+    async def get_balance(self) -> Optional[tuple]:
+        """주식 잔고 조회"""
+        if not await self._ensure_auth():
+            return None
+        data = await self._request(self.client._balance_request())
+        return self.client._parse_balance(data)
+
+    async def get_chart_price(self, ticker: str, start_date: str, end_date: str, period: str = "D") -> Optional[List[Dict[str, Any]]]:
+        """기간별 시세 조회 (차트 데이터)"""
+        if not await self._ensure_auth():
+            return None
+        data = await self._request(self.client._chart_price_request(ticker, start_date, end_date, period))
+        return self.client._parse_chart_price(data)
+
+    async def get_investor_trend(self, ticker: str) -> Optional[List[Dict[str, Any]]]:
+        """종목별 투자자 매매동향 (일별 집계)"""
+        if not await self._ensure_auth():
+            return None
+        data = await self._request(self.client._investor_trend_request(ticker))
+        return self.client._parse_investor_trend(data)
@@ -1,20 +1,55 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import datetime
 import time
 import logging
-import os
-from typing import Optional, Dict, Any, List, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Union, Tuple, Callable
+import pandas as pd
+from stock_v2.api.rate_limiter import TokenBucket, get_shared_limiter
+from stock_v2.api.token_cache import TokenCache, token_cache_key, process_lock
+from stock_v2.api.metrics import RequestMetrics
+from stock_v2.tracing import span
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 커넥션 풀 기본값
+# - POOL_SIZE: 스레드(세션) 하나가 KIS 호스트에 유지할 keep-alive 연결 수
+# - 타임아웃: (연결, 읽기) 초. requests는 timeout을 주지 않으면 무한 대기하므로 반드시 지정
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+
+# 관심종목(멀티종목) 시세조회 1회에 담을 수 있는 최대 종목 수
+MULTI_PRICE_MAX_TICKERS = 30
+
+# 멀티종목 시세 응답 필드 → 내부 표준 컬럼 (정수형 컬럼)
+MULTI_PRICE_INT_FIELDS = {
+    'inter2_prpr': '현재가',
+    'inter2_prdy_vrss': '전일대비',
+    'inter2_oprc': '시가',
+    'inter2_hgpr': '고가',
+    'inter2_lwpr': '저가',
+    'inter2_prdy_clpr': '전일종가',
+    'acml_vol': '거래량',
+    'acml_tr_pbmn': '거래대금',
+}
+
 class KisClient:
     """
     한국투자증권(KIS) API 클라이언트
     """
-    def __init__(self, app_key: str, app_secret: str, acc_no: str, mock: bool = True):
+    def __init__(self, app_key: str, app_secret: str, acc_no: str, mock: bool = True,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 token_cache: Optional[TokenCache] = None,
+                 base_url: Optional[str] = None):
         self.app_key = app_key
         self.app_secret = app_secret
         
@@ -35,37 +70,122 @@ class KisClient:
         else:
             self.base_url = "https://openapi.koreainvestment.com:9443"
             logger.info("[KIS] 실전투자 모드로 초기화되었습니다.")
+        # 서버 주소 직접 지정 (오프라인 시뮬레이터 등)
+        if base_url:
+            self.base_url = base_url.rstrip('/')
+            logger.info(f"[KIS] 서버 주소 지정: {self.base_url}")
             
         self.access_token = None
         self.token_expiry = None
-        self.token_file = "kis_token.json" # Current directory
+        # 토큰 캐시: 실행 위치와 무관한 고정 경로(~/.stock_v2/kis_token.json)에 파일 잠금으로 공유
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        self.token_key = token_cache_key(app_key, mock)
+        if base_url:
+            # 다른 서버에서 받은 토큰이 섞이지 않도록 주소별로 캐시 키를 나눔
+            self.token_key = f"{self.token_key}@{self.base_url}"
+
+        # HTTP 커넥션 풀 설정
+        # requests.get/post를 매번 직접 호출하면 요청마다 새 TCP/TLS 연결을 맺게 됨.
+        # Session을 재사용하면 keep-alive로 연결을 유지하여 핸드셰이크 비용을 아낄 수 있음.
+        # Session은 스레드 안전이 보장되지 않으므로, threading.local()로 스레드마다 하나씩 둠.
+        self.pool_size = pool_size
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+
+        # 초당 호출 한도 제어 (토큰 버킷)
+        # 지정하지 않으면 같은 계좌 종류(모의/실전)의 모든 클라이언트가 공유하는 버킷을 사용.
+        # 한도 초과 응답을 받은 '뒤에' 물러서는 대신, 보내기 '전에' 속도를 맞춰 대기 시간을 줄임
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_shared_limiter(mock)
+
+        # 요청 결과 리스너 (동시성 제어기 등 외부에서 응답 상태를 관찰하기 위한 훅)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # TR ID별 요청/재시도/대기 시간 지표 (client.metrics.summary(), .dump(path))
+        self.metrics = RequestMetrics()
+        self.add_listener(self.metrics)
 
         # Try to load token
         self._load_token()
 
-    def _load_token(self):
-        if os.path.exists(self.token_file):
-            try:
-                with open(self.token_file, 'r') as f:
-                    data = json.load(f)
-                    expiry = datetime.datetime.strptime(data['expiry'], "%Y-%m-%d %H:%M:%S")
-                    if expiry > datetime.datetime.now():
-                        self.access_token = data['access_token']
-                        self.token_expiry = expiry
-                        logger.info(f"[KIS] Loaded valid token (Expires: {expiry})")
-            except Exception as e:
-                logger.warning(f"[KIS] Failed to load token: {e}")
+    def _load_token(self) -> bool:
+        """공유 토큰 캐시에서 유효한 토큰을 읽어와 적용 (성공 여부 반환)"""
+        try:
+            cached = self.token_cache.load(self.token_key)
+        except Exception as e:
+            logger.warning(f"[KIS] Failed to load token: {e}")
+            return False
+        if cached:
+            self.access_token, self.token_expiry = cached
+            logger.info(f"[KIS] Loaded valid token (Expires: {self.token_expiry})")
+            return True
+        return False
 
     def _save_token(self, token, expiry):
         try:
-            with open(self.token_file, 'w') as f:
-                json.dump({
-                    'access_token': token,
-                    'expiry': expiry.strftime("%Y-%m-%d %H:%M:%S")
-                }, f)
+            self.token_cache.save(self.token_key, token, expiry)
         except Exception as e:
             logger.warning(f"[KIS] Failed to save token: {e}")
 
+    def _get_session(self) -> requests.Session:
+        """
+        현재 스레드 전용 keep-alive 세션을 반환 (없으면 생성)
+
+        학습 포인트:
+        - threading.local()에 저장한 속성은 스레드마다 독립적인 값을 가짐
+        - HTTPAdapter의 pool_maxsize가 호스트당 유지할 연결 수를 결정함
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # max_retries=0: 재시도는 _send_request의 로직이 담당하므로 어댑터 재시도는 끔
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            # close()에서 모든 스레드의 세션을 정리할 수 있도록 목록에 보관
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """모든 스레드의 세션(커넥션 풀)을 닫음"""
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        # 현재 스레드가 닫힌 세션을 다시 쓰지 않도록 초기화
+        self._local = threading.local()
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        요청 시도(attempt)마다 호출될 리스너 등록
+
+        리스너는 다음 키를 가진 dict를 받음:
+        - tr_id: 거래 ID (헤더에 없으면 None)
+        - outcome: 'ok' | 'rate_limited' | 'server_error' | 'client_error' | 'exception'
+        - status: HTTP 상태 코드 (예외 시 None)
+        - latency: HTTP 왕복 시간(초, 속도 제한 대기 제외)
+        - wait: 속도 제한기(토큰 버킷)에서 대기한 시간(초)
+        - attempt: 재시도 회차 (0부터)
+        - bytes: 응답 본문 크기 (응답을 받은 경우만)
+        - backoff: 이 시도 뒤 재시도 전에 잠들 시간(초, 재시도하는 경우만)
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """등록된 리스너 제거 (없으면 무시)"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: Dict[str, Any]) -> None:
+        """리스너에게 요청 결과 전달 (리스너 오류가 요청 흐름을 깨지 않도록 보호)"""
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"[KIS] Listener Error: {e}")
+
     def _get_headers(self, tr_id: Optional[str] = None) -> Dict[str, str]:
         """API 요청 헤더 생성"""
         headers = {
@@ -78,47 +198,79 @@ class KisClient:
             headers["tr_id"] = tr_id
         return headers
 
+    @staticmethod
+    def _is_rate_limited(data_json: Dict[str, Any]) -> bool:
+        """응답 본문이 '초당 전송건수 초과' 안내인지 확인"""
+        msg = data_json.get('msg1', '')
+        return '초당 전송건수' in msg or '초과' in msg
+
     def _send_request(self, method: str, url: str, headers: Optional[Dict] = None, 
                      params: Optional[Dict] = None, data: Optional[Dict] = None, 
                      max_retries: int = 10) -> Optional[Dict[str, Any]]:
         """API 요청 전송 (재시도 로직 포함)"""
-        for i in range(max_retries):
-            try:
-                if method == 'GET':
-                    res = requests.get(url, headers=headers, params=params)
-                else:
-                    res = requests.post(url, headers=headers, data=json.dumps(data) if data else None)
-                
-                if res.status_code == 200:
-                    data_json = res.json()
-                    # 초당 전송건수 초과 체크 (msg1에 포함됨)
-                    msg = data_json.get('msg1', '')
-                    if '초당 전송건수' in msg or '초과' in msg:
-                        # 잠시 대기 후 재시도 (지수 백오프)
-                        wait_time = 0.5 * (2 ** i) 
-                        logger.warning(f"[KIS] API 제한 도달. {wait_time}초 대기 후 재시도 ({i+1}/{max_retries})")
-                        time.sleep(wait_time)
-                        continue
-                    return data_json
-                else:
-                    # 500번대 에러 등은 잠시 대기 후 재시도
-                    if res.status_code >= 500:
-                        logger.warning(f"[KIS] Server Error {res.status_code}. Retrying...")
+        tr_id = headers.get('tr_id') if headers else None
+        ticker = params.get('FID_INPUT_ISCD') if params else None
+        with span("kis.request", cat="api", tr_id=tr_id, ticker=ticker) as request_span:
+            for i in range(max_retries):
+                wait = 0.0
+                started = None
+                try:
+                    # 요청 전에 토큰을 받아 초당 한도 아래로 속도를 맞춤
+                    with span("kis.rate_limit_wait", cat="api", tr_id=tr_id, ticker=ticker):
+                        wait = self.rate_limiter.acquire()
+                    session = self._get_session()
+                    with span("kis.http", cat="api", tr_id=tr_id, ticker=ticker, attempt=i) as http_span:
+                        started = time.perf_counter()
+                        if method == 'GET':
+                            res = session.get(url, headers=headers, params=params, timeout=self.timeout)
+                        else:
+                            res = session.post(url, headers=headers, data=json.dumps(data) if data else None, timeout=self.timeout)
+                        latency = time.perf_counter() - started
+                        http_span.set(status=res.status_code)
+                    event = {'tr_id': tr_id, 'status': res.status_code, 'latency': latency, 'wait': wait, 'attempt': i,
+                             'bytes': len(res.content)}
+
+                    if res.status_code == 200:
+                        data_json = res.json()
+                        # 초당 전송건수 초과 체크 (msg1에 포함됨)
+                        if self._is_rate_limited(data_json):
+                            # 잠시 대기 후 재시도 (지수 백오프)
+                            wait_time = 0.5 * (2 ** i)
+                            self._notify({**event, 'outcome': 'rate_limited', 'backoff': wait_time})
+                            # 다른 프로세스 등 버킷 밖의 호출로 한도를 넘은 경우:
+                            # 공유 버킷을 비워 모든 스레드가 함께 속도를 늦추도록 함
+                            self.rate_limiter.drain()
+                            logger.warning(f"[KIS] API 제한 도달. {wait_time}초 대기 후 재시도 ({i+1}/{max_retries})")
+                            with span("kis.backoff", cat="api", tr_id=tr_id, ticker=ticker, reason="rate_limited"):
+                                time.sleep(wait_time)
+                            continue
+                        self._notify({**event, 'outcome': 'ok'})
+                        request_span.set(attempts=i + 1, outcome='ok')
+                        return data_json
+                    else:
+                        # 500번대 에러 등은 잠시 대기 후 재시도
+                        if res.status_code >= 500:
+                            self._notify({**event, 'outcome': 'server_error', 'backoff': 1.0})
+                            logger.warning(f"[KIS] Server Error {res.status_code}. Retrying...")
+                            with span("kis.backoff", cat="api", tr_id=tr_id, ticker=ticker, reason="server_error"):
+                                time.sleep(1.0)
+                            continue
+                        self._notify({**event, 'outcome': 'client_error'})
+                        logger.error(f"[KIS] Request Failed: {res.status_code} {res.text}")
+                        request_span.set(attempts=i + 1, outcome='client_error')
+                        return None
+                except Exception as e:
+                    latency = time.perf_counter() - started if started is not None else 0.0
+                    self._notify({'tr_id': tr_id, 'status': None, 'latency': latency, 'wait': wait, 'attempt': i,
+                                  'outcome': 'exception', 'backoff': 1.0})
+                    logger.error(f"[KIS] Request Error: {e}")
+                    with span("kis.backoff", cat="api", tr_id=tr_id, ticker=ticker, reason="exception"):
                         time.sleep(1.0)
-                        continue
-                    logger.error(f"[KIS] Request Failed: {res.status_code} {res.text}")
-                    return None
-            except Exception as e:
-                logger.error(f"[KIS] Request Error: {e}")
-                time.sleep(1.0)
+            request_span.set(attempts=max_retries, outcome='gave_up')
         return None
 
-    def auth(self) -> bool:
-        """접근 토큰 발급"""
-        # Check if current token is valid
-        if self.access_token and self.token_expiry and self.token_expiry > datetime.datetime.now():
-            return True
-
+    def _token_request(self) -> Tuple[str, Dict[str, str]]:
+        """토큰 발급 요청 구성 (url, body)"""
         path = "/oauth2/tokenP"
         url = f"{self.base_url}{path}"
         body = {
@@ -126,15 +278,57 @@ class KisClient:
             "appkey": self.app_key,
             "appsecret": self.app_secret
         }
+        return url, body
+
+    def _apply_token(self, data: Dict[str, Any]) -> None:
+        """토큰 발급 응답을 클라이언트 상태에 반영하고 캐시에 저장"""
+        self.access_token = data['access_token']
+        self.token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=int(data['expires_in']))
+        logger.info(f"[KIS] Access Token 발급 완료 (만료: {self.token_expiry})")
+        self._save_token(self.access_token, self.token_expiry)
+
+    def _token_valid(self) -> bool:
+        """현재 보유한 토큰이 만료 전인지 확인"""
+        return bool(self.access_token and self.token_expiry and self.token_expiry > datetime.datetime.now())
+
+    def auth(self) -> bool:
+        """
+        접근 토큰 발급 (single-flight)
+
+        1. 프로세스 내부 잠금: 여러 스레드가 동시에 들어와도 한 스레드만 진행
+        2. 파일 잠금: 다른 프로세스가 발급 중이면 끝날 때까지 대기
+        3. 잠금을 잡은 뒤 캐시를 다시 확인 → 먼저 들어온 쪽이 발급한 토큰이 있으면 재사용
+
+        학습 포인트:
+        - '잠금 획득 후 다시 확인(double-checked)' 패턴으로 불필요한 중복 발급을 막음
+        """
+        # Check if current token is valid
+        if self._token_valid():
+            return True
+
+        with span("kis.auth", cat="api"), process_lock(self.token_key):
+            # 기다리는 동안 다른 스레드가 발급했을 수 있음
+            if self._token_valid():
+                return True
+            try:
+                with self.token_cache.locked():
+                    # 다른 프로세스가 발급해 둔 토큰이 있으면 재사용
+                    if self._load_token():
+                        return True
+                    return self._issue_token()
+            except OSError as e:
+                # 캐시 디렉토리에 접근할 수 없는 환경에서도 발급 자체는 가능해야 함
+                logger.warning(f"[KIS] Token cache unavailable: {e}")
+                return self._issue_token()
+
+    def _issue_token(self) -> bool:
+        """/oauth2/tokenP로 새 토큰 발급 (잠금을 잡은 상태에서 호출)"""
+        url, body = self._token_request()
         
         try:
-            res = requests.post(url, data=json.dumps(body), headers={"content-type": "application/json"})
+            res = self._get_session().post(url, data=json.dumps(body), headers={"content-type": "application/json"}, timeout=self.timeout)
             if res.status_code == 200:
-                data = res.json()
-                self.access_token = data['access_token']
-                self.token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=int(data['expires_in']))
-                logger.info(f"[KIS] Access Token 발급 완료 (만료: {self.token_expiry})")
-                self._save_token(self.access_token, self.token_expiry)
+                self._apply_token(res.json())
                 return True
             else:
                 logger.error(f"[KIS] Auth Failed: {res.text}")
@@ -143,12 +337,14 @@ class KisClient:
             logger.error(f"[KIS] Auth Error: {e}")
             return False
 
-    def get_current_price(self, ticker: str) -> Optional[Dict[str, Any]]:
-        """주식 현재가 시세 및 종목 정보 조회"""
-        if not self.access_token:
-            if not self.auth():
-                return None
-            
+    # ------------------------------------------------------------------
+    # 요청 구성(_*_request)과 응답 해석(_parse_*)
+    # 동기 클라이언트와 비동기 클라이언트(AsyncKisClient)가 같은 규칙을 공유하도록
+    # 전송(transport)과 분리해 둠
+    # ------------------------------------------------------------------
+
+    def _current_price_request(self, ticker: str) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """현재가 조회 요청 구성 (url, headers, params)"""
         path = "/uapi/domestic-stock/v1/quotations/inquire-price"
         url = f"{self.base_url}{path}"
         
@@ -158,8 +354,9 @@ class KisClient:
             "fid_cond_mrkt_div_code": "J", # J: 주식, ETF, ETN
             "fid_input_iscd": ticker
         }
-        
-        data = self._send_request('GET', url, headers=headers, params=params)
+        return url, headers, params
+
+    def _parse_current_price(self, data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         if data and data.get('rt_cd') == '0':
             return data['output']
         elif data:
@@ -168,12 +365,8 @@ class KisClient:
         else:
             return None
 
-    def get_balance(self) -> Optional[tuple]:
-        """주식 잔고 조회"""
-        if not self.access_token:
-            if not self.auth():
-                return None
-
+    def _balance_request(self) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """잔고 조회 요청 구성 (url, headers, params)"""
         path = "/uapi/domestic-stock/v1/trading/inquire-balance"
         url = f"{self.base_url}{path}"
         
@@ -195,8 +388,9 @@ class KisClient:
             "CTX_AREA_FK100": "",
             "CTX_AREA_NK100": ""
         }
-        
-        data = self._send_request('GET', url, headers=headers, params=params)
+        return url, headers, params
+
+    def _parse_balance(self, data: Optional[Dict[str, Any]]) -> Optional[tuple]:
         if data and data.get('rt_cd') == '0':
             # output2는 리스트로 반환되므로 첫 번째 요소를 추출
             account_info = data.get('output2')
@@ -209,15 +403,8 @@ class KisClient:
         else:
             return None
 
-    def get_chart_price(self, ticker: str, start_date: str, end_date: str, period: str = "D") -> Optional[List[Dict[str, Any]]]:
-        """
-        기간별 시세 조회 (차트 데이터)
-        period: D(일), W(주), M(월), Y(년)
-        """
-        if not self.access_token:
-            if not self.auth():
-                return None
-
+    def _chart_price_request(self, ticker: str, start_date: str, end_date: str, period: str = "D") -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """기간별 시세 요청 구성 (url, headers, params)"""
         path = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
         url = f"{self.base_url}{path}"
         
@@ -232,8 +419,9 @@ class KisClient:
             "FID_PERIOD_DIV_CODE": period,  # 기간분류코드
             "FID_ORG_ADJ_PRC": "0"          # 수정주가반영여부 (0:반영)
         }
-        
-        data = self._send_request('GET', url, headers=headers, params=params)
+        return url, headers, params
+
+    def _parse_chart_price(self, data: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
         if data and data.get('rt_cd') == '0':
             return data.get('output2') # 일별 데이터 리스트
         elif data:
@@ -242,14 +430,8 @@ class KisClient:
         else:
             return None
 
-    def get_investor_trend(self, ticker: str) -> Optional[List[Dict[str, Any]]]:
-        """
-        종목별 투자자 매매동향 (당일 실시간 추정치 아님, 일별 집계)
-        """
-        if not self.access_token:
-            if not self.auth():
-                return None
-
+    def _investor_trend_request(self, ticker: str) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """투자자 매매동향 요청 구성 (url, headers, params)"""
         path = "/uapi/domestic-stock/v1/quotations/inquire-investor"
         url = f"{self.base_url}{path}"
         
@@ -260,8 +442,9 @@ class KisClient:
             "FID_COND_MRKT_DIV_CODE": "J",
             "FID_INPUT_ISCD": ticker
         }
-        
-        data = self._send_request('GET', url, headers=headers, params=params)
+        return url, headers, params
+
+    def _parse_investor_trend(self, data: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
         if data and data.get('rt_cd') == '0':
             return data.get('output') # 일별 투자자 동향 리스트
         elif data:
@@ -269,3 +452,146 @@ class KisClient:
             return None
         else:
             return None
+
+    def _multi_price_request(self, tickers: List[str]) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """관심종목(멀티종목) 시세 요청 구성 (url, headers, params) - 최대 30종목"""
+        path = "/uapi/domestic-stock/v1/quotations/intstock-multprice"
+        url = f"{self.base_url}{path}"
+        
+        # TR_ID: 관심종목(멀티종목) 시세조회 (FHKST11300006)
+        headers = self._get_headers(tr_id="FHKST11300006")
+        
+        # 종목 번호를 1부터 붙여 FID_COND_MRKT_DIV_CODE_1, FID_INPUT_ISCD_1 ... 형태로 전달
+        params = {}
+        for i, ticker in enumerate(tickers, start=1):
+            params[f"FID_COND_MRKT_DIV_CODE_{i}"] = "J"
+            params[f"FID_INPUT_ISCD_{i}"] = ticker
+        return url, headers, params
+
+    def _parse_multi_price(self, data: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        if data and data.get('rt_cd') == '0':
+            # 빈 슬롯이 빈 dict로 올 수 있으므로 종목코드가 있는 행만 사용
+            return [row for row in (data.get('output') or []) if row.get('inter_shrn_iscd')]
+        elif data:
+            logger.error(f"[KIS] API Error (MultiPrice): {data.get('msg1')}")
+            return None
+        else:
+            return None
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def get_current_price(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """주식 현재가 시세 및 종목 정보 조회"""
+        if not self.access_token:
+            if not self.auth():
+                return None
+            
+        url, headers, params = self._current_price_request(ticker)
+        data = self._send_request('GET', url, headers=headers, params=params)
+        return self._parse_current_price(data)
+
+    def get_balance(self) -> Optional[tuple]:
+        """주식 잔고 조회"""
+        if not self.access_token:
+            if not self.auth():
+                return None
+
+        url, headers, params = self._balance_request()
+        data = self._send_request('GET', url, headers=headers, params=params)
+        return self._parse_balance(data)
+
+    def get_chart_price(self, ticker: str, start_date: str, end_date: str, period: str = "D") -> Optional[List[Dict[str, Any]]]:
+        """
+        기간별 시세 조회 (차트 데이터)
+        period: D(일), W(주), M(월), Y(년)
+        """
+        if not self.access_token:
+            if not self.auth():
+                return None
+
+        url, headers, params = self._chart_price_request(ticker, start_date, end_date, period)
+        data = self._send_request('GET', url, headers=headers, params=params)
+        return self._parse_chart_price(data)
+
+    def get_investor_trend(self, ticker: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        종목별 투자자 매매동향 (당일 실시간 추정치 아님, 일별 집계)
+        """
+        if not self.access_token:
+            if not self.auth():
+                return None
+
+        url, headers, params = self._investor_trend_request(ticker)
+        data = self._send_request('GET', url, headers=headers, params=params)
+        return self._parse_investor_trend(data)
+
+    def get_multi_price(self, tickers: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        관심종목(멀티종목) 시세 조회 - 한 번에 최대 30종목
+        (KIS 안내상 실전투자 전용 TR이므로 모의투자 계좌에서는 실패할 수 있음)
+        """
+        if len(tickers) > MULTI_PRICE_MAX_TICKERS:
+            raise ValueError(f"멀티종목 시세는 한 번에 최대 {MULTI_PRICE_MAX_TICKERS}종목까지 조회할 수 있습니다.")
+        if not self.access_token:
+            if not self.auth():
+                return None
+
+        url, headers, params = self._multi_price_request(tickers)
+        data = self._send_request('GET', url, headers=headers, params=params)
+        return self._parse_multi_price(data)
+
+    def get_quotes(self, tickers: List[str], max_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        임의 길이의 종목 리스트에 대한 현재가 스냅샷을 하나의 DataFrame으로 반환
+
+        1. 30종목 단위로 나눔 (200종목 → 7회 요청)
+        2. 묶음들을 스레드 풀로 동시에 조회 (초당 한도는 토큰 버킷이 계속 지킴)
+        3. 문자열 응답을 정수/실수 컬럼으로 변환
+
+        Args:
+            tickers: 종목 코드 리스트
+            max_workers: 동시 요청 수 (기본값: 커넥션 풀 크기)
+
+        Returns:
+            DataFrame: code(str), name(str), 현재가/전일대비/시가/고가/저가/전일종가/거래량/거래대금(int64),
+                       등락률(float64). 조회에 실패한 묶음의 종목은 빠짐
+
+        학습 포인트:
+        - range(0, n, step)로 리스트를 일정 크기로 자르는 '청크(chunk)' 패턴
+        - executor.map은 입력 순서대로 결과를 돌려주므로 결과 정렬이 필요 없음
+        """
+        # 중복 제거 (순서 유지) 후 30개씩 나눔
+        unique = list(dict.fromkeys(tickers))
+        chunks = [unique[i:i + MULTI_PRICE_MAX_TICKERS] for i in range(0, len(unique), MULTI_PRICE_MAX_TICKERS)]
+        if not chunks:
+            return self._quotes_frame([])
+
+        # 첫 요청들이 동시에 토큰을 발급받지 않도록 미리 인증
+        if not self.access_token and not self.auth():
+            return self._quotes_frame([])
+
+        workers = max_workers or self.pool_size
+        rows: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            for chunk_rows in executor.map(self.get_multi_price, chunks):
+                if chunk_rows:
+                    rows.extend(chunk_rows)
+                    
+        return self._quotes_frame(rows)
+
+    @staticmethod
+    def _quotes_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        """멀티종목 시세 응답 행들을 타입이 지정된 DataFrame으로 변환"""
+        columns: Dict[str, Any] = {
+            'code': pd.Series([row.get('inter_shrn_iscd', '') for row in rows], dtype='object'),
+            'name': pd.Series([row.get('inter_kor_isnm', '') for row in rows], dtype='object'),
+        }
+        for field, column in MULTI_PRICE_INT_FIELDS.items():
+            # 빈 문자열 등 숫자가 아닌 값은 0으로 처리
+            values = pd.to_numeric(pd.Series([row.get(field) for row in rows], dtype='object'), errors='coerce')
+            columns[column] = values.fillna(0).astype('int64')
+        rate = pd.to_numeric(pd.Series([row.get('prdy_ctrt') for row in rows], dtype='object'), errors='coerce')
+        columns['등락률'] = rate.fillna(0.0).astype('float64')
+        return pd.DataFrame(columns)
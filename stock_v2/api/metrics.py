@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+
+# 응답 시간 히스토그램 구간 상한(초) - Prometheus 기본 구간과 같은 배치
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# TR ID → 읽기 쉬운 이름 (요약표/Prometheus 라벨용)
+TR_NAMES = {
+    'FHKST01010100': '현재가',
+    'FHKST03010100': '기간별시세',
+    'FHKST01010900': '투자자동향',
+    'FHKST11300006': '멀티종목시세',
+    'TTTC8434R': '잔고',
+    'VTTC8434R': '잔고(모의)',
+}
+
+# Prometheus 지표 이름 앞에 붙는 접두사
+METRIC_PREFIX = "kis"
+
+# 결과(outcome)별 카운터 이름
+OUTCOMES = ('ok', 'rate_limited', 'server_error', 'client_error', 'exception')
+
+
+class Histogram:
+    """
+    누적 구간 히스토그램 (Prometheus histogram과 같은 의미)
+
+    - counts[i]: LATENCY_BUCKETS[i] 이하인 관측 수 (마지막 칸은 +Inf)
+    - 개별 값을 저장하지 않으므로 요청이 아무리 많아도 메모리가 일정함
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """구간 상한으로 근사한 분위수 (관측이 없으면 None, +Inf 칸이면 마지막 상한)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[min(i, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def cumulative(self) -> List[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'buckets': list(self.buckets), 'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+
+
+class EndpointStats:
+    """TR ID 하나의 누적 통계"""
+
+    def __init__(self):
+        self.requests = 0                 # HTTP 시도 수 (재시도 포함)
+        self.retries = 0                  # 두 번째 이후 시도 수
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self.limiter_wait = 0.0           # 토큰 버킷 대기 시간 합계(초)
+        self.backoff_sleep = 0.0          # 한도 초과/오류 뒤 재시도 전 잠든 시간 합계(초)
+        self.bytes = 0                    # 받은 응답 본문 크기 합계
+        self.latency = Histogram()
+
+    def observe(self, event: Dict[str, Any]) -> None:
+        self.requests += 1
+        if event.get('attempt', 0) > 0:
+            self.retries += 1
+        outcome = event.get('outcome')
+        if outcome in self.outcomes:
+            self.outcomes[outcome] += 1
+        self.limiter_wait += event.get('wait') or 0.0
+        self.backoff_sleep += event.get('backoff') or 0.0
+        self.bytes += event.get('bytes') or 0
+        if event.get('status') is not None:
+            self.latency.observe(event.get('latency') or 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            **self.outcomes,
+            'limiter_wait_seconds': round(self.limiter_wait, 6),
+            'backoff_sleep_seconds': round(self.backoff_sleep, 6),
+            'bytes': self.bytes,
+            'latency': self.latency.to_dict(),
+        }
+
+
+class RequestMetrics:
+    """
+    KisClient 요청 지표 (TR ID별 카운터 + 응답 시간 히스토그램)
+
+    - KisClient의 리스너로 등록되어 요청 시도마다 observe()가 호출됨
+      (KisClient는 생성 시 client.metrics로 하나를 만들어 등록해 둠)
+    - 요청 수, 재시도, 한도 초과, 5xx, 토큰 버킷 대기/백오프 수면 시간, 받은 바이트, 응답 시간 분포
+    - to_prometheus(): Prometheus 텍스트 형식, to_json(): JSON 문자열, summary(): 요약 DataFrame
+
+    사용법:
+        before = client.metrics.totals()
+        ... 스캔 ...
+        print(client.metrics.summary())
+        client.metrics.dump("scan_metrics.prom")
+
+    학습 포인트:
+    - _send_request의 재시도/수면은 로그 몇 줄로만 남아 얼마나 시간을 잃는지 알기 어려움
+      → 시도마다 '왜 다시 보냈는지'와 '얼마나 잤는지'를 세어 두면 스스로 만든 대기 시간이 드러남
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, event: Dict[str, Any]) -> None:
+        """KisClient 리스너 (요청 시도 하나 기록)"""
+        tr_id = event.get('tr_id') or 'unknown'
+        with self._lock:
+            stats = self._stats.get(tr_id)
+            if stats is None:
+                stats = self._stats[tr_id] = EndpointStats()
+            stats.observe(event)
+
+    __call__ = observe
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """TR ID → 누적 통계 dict"""
+        with self._lock:
+            return {tr_id: stats.to_dict() for tr_id, stats in self._stats.items()}
+
+    def totals(self) -> Dict[str, float]:
+        """모든 TR ID를 합친 카운터 (스캔 전후 차이를 볼 때 사용)"""
+        total: Dict[str, float] = {}
+        for stats in self.snapshot().values():
+            for key, value in stats.items():
+                if key != 'latency':
+                    total[key] = total.get(key, 0) + value
+        return total
+
+    def summary(self) -> pd.DataFrame:
+        """TR ID별 요약표 (요청 수 내림차순, 응답 시간 분위수는 구간 상한 근사)"""
+        rows = []
+        with self._lock:
+            for tr_id, stats in self._stats.items():
+                p50, p99 = stats.latency.quantile(0.5), stats.latency.quantile(0.99)
+                rows.append({
+                    'tr_id': tr_id,
+                    'name': TR_NAMES.get(tr_id, ''),
+                    'requests': stats.requests,
+                    'retries': stats.retries,
+                    'rate_limited': stats.outcomes['rate_limited'],
+                    'server_error': stats.outcomes['server_error'],
+                    'limiter_wait_s': round(stats.limiter_wait, 2),
+                    'backoff_s': round(stats.backoff_sleep, 2),
+                    'kbytes': round(stats.bytes / 1024, 1),
+                    'latency_avg_ms': round(stats.latency.sum / stats.latency.count * 1000, 1) if stats.latency.count else None,
+                    'latency_p50_ms': p50 * 1000 if p50 is not None else None,
+                    'latency_p99_ms': p99 * 1000 if p99 is not None else None,
+                })
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values('requests', ascending=False, ignore_index=True)
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식 (counter/histogram, 라벨: tr_id, name)"""
+        p = METRIC_PREFIX
+        counters = (
+            ('requests_total', '요청 시도 수 (재시도 포함)', lambda s: s.requests),
+            ('retries_total', '재시도 수', lambda s: s.retries),
+            ('limiter_wait_seconds_total', '토큰 버킷 대기 시간', lambda s: s.limiter_wait),
+            ('backoff_sleep_seconds_total', '재시도 전 백오프 수면 시간', lambda s: s.backoff_sleep),
+            ('response_bytes_total', '받은 응답 본문 크기', lambda s: s.bytes),
+        )
+        lines: List[str] = []
+        with self._lock:
+            items = sorted(self._stats.items())
+            for metric, help_text, getter in counters:
+                lines.append(f"# HELP {p}_{metric} {help_text}")
+                lines.append(f"# TYPE {p}_{metric} counter")
+                for tr_id, stats in items:
+                    lines.append(f"{p}_{metric}{{{_labels(tr_id)}}} {_format(getter(stats))}")
+
+            lines.append(f"# HELP {p}_responses_total 결과별 요청 수")
+            lines.append(f"# TYPE {p}_responses_total counter")
+            for tr_id, stats in items:
+                for outcome, count in stats.outcomes.items():
+                    lines.append(f'{p}_responses_total{{{_labels(tr_id)},outcome="{outcome}"}} {count}')
+
+            lines.append(f"# HELP {p}_request_latency_seconds HTTP 응답 시간 (속도 제한 대기 제외)")
+            lines.append(f"# TYPE {p}_request_latency_seconds histogram")
+            for tr_id, stats in items:
+                histogram = stats.latency
+                for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.cumulative()):
+                    lines.append(f'{p}_request_latency_seconds_bucket{{{_labels(tr_id)},le="{bound}"}} {count}')
+                lines.append(f"{p}_request_latency_seconds_sum{{{_labels(tr_id)}}} {_format(histogram.sum)}")
+                lines.append(f"{p}_request_latency_seconds_count{{{_labels(tr_id)}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """파일로 저장 (.prom/.txt면 Prometheus 텍스트, 그 외는 JSON)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def _labels(tr_id: str) -> str:
+    return f'tr_id="{tr_id}",name="{TR_NAMES.get(tr_id, "")}"'
+
+
+def _format(value: float) -> str:
+    return f"{value:.6f}".rstrip('0').rstrip('.') if isinstance(value, float) else str(value)
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict, Optional
+
+# KIS 초당 호출 한도 (계좌 종류별)
+# - 실전투자: 초당 20건, 모의투자: 초당 2건 (KIS 공지 기준)
+# - 버킷 크기가 1이면 임의의 1초 구간에 최대 (1 + rate)건이 나갈 수 있으므로,
+#   그 값이 한도를 넘지 않도록 한도보다 조금 낮게 설정함
+REAL_RATE_PER_SEC = 18.0
+MOCK_RATE_PER_SEC = 1.8
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷 (Token Bucket) 속도 제한기
+
+    - 버킷에는 최대 capacity개의 토큰이 들어가며, 초당 rate개씩 다시 채워짐
+    - 요청 1건마다 토큰 1개를 소비하고, 토큰이 없으면 채워질 때까지 기다림
+    - 결과적으로 장기 평균 속도는 rate 이하, 순간 몰림(burst)은 capacity 이하로 제한됨
+
+    학습 포인트:
+    - reserve()는 '기다려야 할 시간'만 계산해서 돌려주고 직접 잠들지 않음.
+      그래서 스레드(time.sleep)와 asyncio(await asyncio.sleep) 양쪽에서 같은 버킷을 공유할 수 있음
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 토큰 충전 속도 (= 초당 허용 요청 수)
+            capacity: 버킷 최대 크기 (기본값: 1 → 요청 간격을 고르게 펴서 보냄)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else 1.0
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """경과 시간만큼 토큰을 채움 (반드시 lock을 잡은 상태에서 호출)"""
+        elapsed = now - self._last
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 예약하고, 사용 가능해질 때까지 기다려야 할 시간(초)을 반환
+
+        토큰을 '빚'으로 미리 차감(음수 허용)하기 때문에, 여러 스레드가 동시에 호출해도
+        각자 겹치지 않는 순서의 대기 시간을 받게 됨 (선착순 공정성).
+
+        Returns:
+            float: 대기해야 할 시간(초). 0이면 즉시 요청 가능
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 얻을 때까지 현재 스레드를 재움 (동기 코드용)
+
+        Returns:
+            float: 실제로 대기한 시간(초)
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def drain(self) -> None:
+        """
+        남은 토큰을 모두 비움
+
+        서버에서 '초당 전송건수 초과' 응답을 받았다는 것은 다른 프로세스 등
+        우리가 모르는 호출이 있다는 뜻이므로, 모든 호출자가 잠시 쉬도록 버킷을 비움
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+
+# 프로세스 전체에서 공유하는 버킷 (모의/실전 별도)
+# KisClient 인스턴스를 여러 개 만들어도 같은 계좌 종류라면 같은 한도를 나눠 씀
+_SHARED_BUCKETS: Dict[bool, TokenBucket] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_limiter(mock: bool) -> TokenBucket:
+    """
+    계좌 종류(모의/실전)별 공유 토큰 버킷을 반환 (없으면 생성)
+
+    Args:
+        mock: 모의투자 여부
+
+    Returns:
+        TokenBucket: 같은 계좌 종류의 모든 KisClient가 함께 쓰는 버킷
+    """
+    with _SHARED_LOCK:
+        bucket = _SHARED_BUCKETS.get(mock)
+        if bucket is None:
+            rate = MOCK_RATE_PER_SEC if mock else REAL_RATE_PER_SEC
+            bucket = TokenBucket(rate)
+            _SHARED_BUCKETS[mock] = bucket
+        return bucket
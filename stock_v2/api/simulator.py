@@ -0,0 +1,422 @@
+import json
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from stock_v2.core.bar_store import BarStore
+from stock_v2.core.trading_calendar import KrxCalendar
+
+# 실제 KIS가 초당 한도를 넘었을 때 돌려주는 안내 (KisClient._is_rate_limited가 이 문구로 판정)
+RATE_LIMIT_MSG_CD = "EGW00201"
+RATE_LIMIT_MESSAGE = "초당 전송건수를 초과하였습니다."
+
+# 실제 API와 같은 응답 크기 제한
+CHART_MAX_ROWS = 100        # 기간별 시세 1회 최대 봉 수
+INVESTOR_ROWS = 30          # 투자자 동향은 최근 30거래일만 제공
+SIM_TOKEN_SECONDS = 86400   # 발급 토큰 유효 기간
+
+# 투자자 순매수 금액은 API에서 백만원 단위
+AMOUNT_UNIT = 1_000_000
+
+
+@dataclass
+class SimulatorConfig:
+    """
+    시뮬레이터 동작 설정
+
+    - latency / jitter: 요청마다 latency + U(0, jitter)초 지연
+    - rate_limit: 초당 허용 요청 수 (직전 1초 창 기준, 토큰 발급 제외). 0이면 제한 없음
+    - error_rate: 5xx(500) 응답을 섞을 확률 (0~1)
+    - require_auth: 시뮬레이터가 발급하지 않은 토큰의 요청을 401로 거부할지 여부
+    - seed: 지연/오류 주입 난수 시드 (같은 시드면 같은 순서로 재현)
+    """
+    latency: float = 0.03
+    jitter: float = 0.02
+    rate_limit: float = 20.0
+    error_rate: float = 0.0
+    require_auth: bool = True
+    seed: int = 0
+
+
+class SyntheticMarket:
+    """
+    종목코드별로 항상 같은 값을 내는 가상 일봉 (실행 간 재현 가능)
+
+    - 거래일은 KrxCalendar 기준 (주말/휴장일 제외), end_date까지 sessions개
+    - 최근 cache_size 종목만 메모리에 보관 (같은 코드는 다시 만들어도 같은 값)
+    - daily(code)는 내부 표준 컬럼(종가, 시가, ..., 외국인_순매수금액[원])의 DataFrame
+    """
+
+    def __init__(self, end_date: Optional[datetime] = None, sessions: int = 400, seed: int = 0,
+                 calendar: Optional[KrxCalendar] = None, cache_size: int = 1024):
+        calendar = calendar or KrxCalendar()
+        end_date = end_date or datetime.now()
+        # 대략 거래일 1개당 1.5 달력일로 넉넉히 잡고 뒤에서 sessions개만 사용
+        days = calendar.sessions_between(end_date - timedelta(days=sessions * 3 // 2 + 30), end_date)[-sessions:]
+        self.index = pd.DatetimeIndex(pd.to_datetime(days), name='날짜')
+        self.seed = seed
+        # 최근 생성한 종목만 보관 (LRU) - 종목 수 × 기간이 커도 메모리가 일정하도록
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def daily(self, code: str) -> pd.DataFrame:
+        with self._lock:
+            if code in self._cache:
+                self._cache.move_to_end(code)
+                return self._cache[code]
+        df = self._generate(code)
+        with self._lock:
+            self._cache[code] = df
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return df
+
+    def _generate(self, code: str) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, *code.encode('utf-8')])
+        n = len(self.index)
+        close = np.maximum(100, np.round(rng.uniform(5_000, 200_000) * np.cumprod(1 + rng.normal(0, 0.02, n))))
+        open_price = np.round(close * (1 + rng.normal(0, 0.01, n)))
+        high = np.maximum(close, open_price) * (1 + np.abs(rng.normal(0, 0.005, n)))
+        low = np.minimum(close, open_price) * (1 - np.abs(rng.normal(0, 0.005, n)))
+        volume = rng.integers(10_000, 5_000_000, n)
+        df = pd.DataFrame({
+            '종가': close,
+            '시가': open_price,
+            '고가': np.round(high),
+            '저가': np.round(low),
+            '거래량': volume,
+            '거래대금': np.round(volume * close),
+        }, index=self.index)
+        for column in ('개인', '외국인', '기관'):
+            qty = rng.integers(-200_000, 200_000, n)
+            df[f'{column}_순매수'] = qty
+            # 금액은 API 단위(백만원)로 떨어지게 생성
+            df[f'{column}_순매수금액'] = np.round(qty * close / AMOUNT_UNIT) * AMOUNT_UNIT
+        return df
+
+
+class StoreMarket:
+    """로컬 일봉 저장소(BarStore)에 기록된 실제 봉을 그대로 돌려주는 데이터 원천"""
+
+    def __init__(self, store: Optional[BarStore] = None):
+        self.store = store or BarStore()
+
+    def daily(self, code: str) -> pd.DataFrame:
+        df = self.store.read(code)
+        return df if df is not None else pd.DataFrame()
+
+
+# 응답 필드 → (내부 표준 컬럼, 나눌 단위)
+CHART_FIELDS = {
+    'stck_clpr': ('종가', 1),
+    'stck_oprc': ('시가', 1),
+    'stck_hgpr': ('고가', 1),
+    'stck_lwpr': ('저가', 1),
+    'acml_vol': ('거래량', 1),
+    'acml_tr_pbmn': ('거래대금', 1),
+}
+INVESTOR_FIELDS = {
+    'stck_clpr': ('종가', 1),
+    'prsn_ntby_qty': ('개인_순매수', 1),
+    'frgn_ntby_qty': ('외국인_순매수', 1),
+    'orgn_ntby_qty': ('기관_순매수', 1),
+    'prsn_ntby_tr_pbmn': ('개인_순매수금액', AMOUNT_UNIT),
+    'frgn_ntby_tr_pbmn': ('외국인_순매수금액', AMOUNT_UNIT),
+    'orgn_ntby_tr_pbmn': ('기관_순매수금액', AMOUNT_UNIT),
+}
+
+
+def _records(df: pd.DataFrame, fields: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    일봉 DataFrame → KIS 응답 행 목록 (모든 값은 문자열, 없는 컬럼/NaN은 '0')
+
+    컬럼 단위로 한 번에 문자열로 바꿔 행마다 Series를 만드는 iterrows보다 훨씬 빠름
+    """
+    columns = {'stck_bsop_date': df.index.strftime("%Y%m%d")}
+    for field, (column, unit) in fields.items():
+        values = df[column].to_numpy(dtype=float, na_value=0) if column in df.columns else np.zeros(len(df))
+        columns[field] = np.round(values / unit).astype(np.int64).astype(str)
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _num(value: Any) -> str:
+    """KIS 응답처럼 숫자를 문자열로 (NaN은 '0')"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "0"
+    return str(int(round(float(value))))
+
+
+class KisSimulator:
+    """
+    KIS Open API를 흉내 내는 로컬 HTTP 서버 (부하 테스트/벤치마크용)
+
+    지원 엔드포인트 (KisClient가 쓰는 것):
+    - POST /oauth2/tokenP
+    - GET  .../quotations/inquire-price, inquire-daily-itemchartprice, inquire-investor, intstock-multprice
+    - GET  .../trading/inquire-balance
+    - GET  /sim/stats: 시뮬레이터 통계 (요청 수, 한도 초과/오류 주입 횟수)
+
+    사용법:
+        with KisSimulator(config=SimulatorConfig(rate_limit=20, error_rate=0.01)) as sim:
+            client = KisClient("sim", "sim", "00000000-01", mock=False, base_url=sim.url)
+
+    참고:
+    - 초당 한도 초과는 HTTP 200 + msg1 '초당 전송건수...' 로 응답 (KisClient의 재시도 경로를 그대로 탐)
+    - '오늘'은 데이터 원천의 마지막 거래일로 간주 (투자자 동향은 그날부터 30거래일)
+    """
+
+    def __init__(self, market=None, config: Optional[SimulatorConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            market: daily(code) → DataFrame을 가진 데이터 원천 (기본: SyntheticMarket())
+            config: 지연/한도/오류 설정
+            host, port: 바인드 주소 (port=0이면 빈 포트 자동 선택)
+        """
+        self.market = market or SyntheticMarket()
+        self.config = config or SimulatorConfig()
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._recent: deque = deque()
+        # 같은 seed로 띄운 시뮬레이터가 발급한 토큰은 재시작 후에도 유효
+        # (KisClient가 토큰 캐시에 남긴 토큰을 그대로 재사용할 수 있도록)
+        self._token_prefix = f"sim{self.config.seed}-"
+        self.stats: Dict[str, Any] = {'requests': 0, 'rate_limited': 0, 'server_errors': 0,
+                                      'unauthorized': 0, 'tokens': 0, 'by_path': {}}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _bind(self) -> ThreadingHTTPServer:
+        self._server = ThreadingHTTPServer((self.host, self.port), _SimulatorHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        self.port = self._server.server_address[1]
+        return self._server
+
+    def start(self) -> "KisSimulator":
+        """백그라운드 스레드에서 서버 시작"""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 서버 실행 (run_simulator.py용, Ctrl+C로 종료)"""
+        self._bind().serve_forever()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "KisSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # 요청 제어 (지연, 초당 한도, 오류 주입)
+    # ------------------------------------------------------------------
+
+    def _admit(self, path: str) -> Optional[str]:
+        """
+        요청 하나를 받아들일지 결정
+        Returns: None(정상 처리) | 'rate_limited' | 'server_error'
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_path'][path] = self.stats['by_path'].get(path, 0) + 1
+            # 직전 1초 창 안의 요청 수로 초당 한도 판정 (슬라이딩 윈도)
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if self.config.rate_limit and len(self._recent) >= self.config.rate_limit:
+                self.stats['rate_limited'] += 1
+                return 'rate_limited'
+            self._recent.append(now)
+            if self.config.error_rate and self._rng.random() < self.config.error_rate:
+                self.stats['server_errors'] += 1
+                return 'server_error'
+            delay = self.config.latency + self._rng.uniform(0, self.config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        return None
+
+    def issue_token(self) -> Dict[str, Any]:
+        with self._lock:
+            self.stats['tokens'] += 1
+            token = f"{self._token_prefix}{self.stats['tokens']}-{self._rng.getrandbits(32):08x}"
+        expires = datetime.now() + timedelta(seconds=SIM_TOKEN_SECONDS)
+        return {'access_token': token, 'token_type': 'Bearer', 'expires_in': SIM_TOKEN_SECONDS,
+                'access_token_token_expired': expires.strftime("%Y-%m-%d %H:%M:%S")}
+
+    def authorized(self, header: Optional[str]) -> bool:
+        if not self.config.require_auth:
+            return True
+        token = (header or "").replace("Bearer", "").strip()
+        if token.startswith(self._token_prefix):
+            return True
+        with self._lock:
+            self.stats['unauthorized'] += 1
+        return False
+
+    # ------------------------------------------------------------------
+    # 응답 생성
+    # ------------------------------------------------------------------
+
+    def chart(self, code: str, start: str, end: str) -> Dict[str, Any]:
+        df = self.market.daily(code)
+        rows = []
+        if not df.empty:
+            dates = df.index.year * 10000 + df.index.month * 100 + df.index.day
+            part = df[(dates >= int(start)) & (dates <= int(end))]
+            # 최신 날짜부터 최대 100봉 (실제 API와 같은 순서/제한)
+            rows = _records(part.iloc[::-1].head(CHART_MAX_ROWS), CHART_FIELDS)
+        return {'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.',
+                'output1': {'stck_shrn_iscd': code}, 'output2': rows}
+
+    def investor(self, code: str) -> Dict[str, Any]:
+        df = self.market.daily(code)
+        rows = _records(df.iloc[::-1].head(INVESTOR_ROWS), INVESTOR_FIELDS) if not df.empty else []
+        return {'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output': rows}
+
+    def _last_two(self, code: str):
+        df = self.market.daily(code)
+        if df.empty:
+            return None, None
+        last = df.iloc[-1]
+        prev = df.iloc[-2] if len(df) > 1 else last
+        return last, prev
+
+    def price(self, code: str) -> Dict[str, Any]:
+        last, prev = self._last_two(code)
+        if last is None:
+            return {'rt_cd': '1', 'msg_cd': 'EGW00000', 'msg1': '조회할 자료가 없습니다.'}
+        close, prev_close = float(last['종가']), float(prev['종가'])
+        return {'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output': {
+            'stck_shrn_iscd': code,
+            'stck_prpr': _num(close),
+            'prdy_vrss': _num(close - prev_close),
+            'prdy_ctrt': f"{(close / prev_close - 1) * 100:.2f}" if prev_close else "0.00",
+            'stck_oprc': _num(last.get('시가')),
+            'stck_hgpr': _num(last.get('고가')),
+            'stck_lwpr': _num(last.get('저가')),
+            'stck_sdpr': _num(prev_close),
+            'acml_vol': _num(last.get('거래량')),
+            'acml_tr_pbmn': _num(last.get('거래대금')),
+        }}
+
+    def multi_price(self, codes: List[str]) -> Dict[str, Any]:
+        rows = []
+        for code in codes:
+            last, prev = self._last_two(code)
+            if last is None:
+                continue
+            close, prev_close = float(last['종가']), float(prev['종가'])
+            rows.append({
+                'inter_shrn_iscd': code,
+                'inter_kor_isnm': code,
+                'inter2_prpr': _num(close),
+                'inter2_prdy_vrss': _num(close - prev_close),
+                'prdy_ctrt': f"{(close / prev_close - 1) * 100:.2f}" if prev_close else "0.00",
+                'inter2_oprc': _num(last.get('시가')),
+                'inter2_hgpr': _num(last.get('고가')),
+                'inter2_lwpr': _num(last.get('저가')),
+                'inter2_prdy_clpr': _num(prev_close),
+                'acml_vol': _num(last.get('거래량')),
+                'acml_tr_pbmn': _num(last.get('거래대금')),
+            })
+        return {'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output': rows}
+
+    @staticmethod
+    def balance() -> Dict[str, Any]:
+        return {'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output1': [],
+                'output2': [{'dnca_tot_amt': '10000000', 'tot_evlu_amt': '10000000', 'nass_amt': '10000000'}]}
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    """KisSimulator의 HTTP 처리 (keep-alive 유지를 위해 HTTP/1.1 + Content-Length)"""
+
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘을 끄지 않으면 keep-alive 연결에서
+    # 지연 ACK와 맞물려 요청마다 수십 ms가 더해짐 (지연은 latency 설정으로만 주도록)
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args: Any) -> None:
+        # 요청마다 표준 에러에 찍히는 접근 로그는 끔 (통계는 /sim/stats)
+        pass
+
+    @property
+    def sim(self) -> KisSimulator:
+        return self.server.simulator
+
+    def _send(self, body: Dict[str, Any], status: int = 200) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        if urlparse(self.path).path == "/oauth2/tokenP":
+            self._send(self.sim.issue_token())
+        else:
+            self._send({'rt_cd': '1', 'msg1': '지원하지 않는 경로입니다.'}, status=404)
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        path = parsed.path
+        if path == "/sim/stats":
+            with self.sim._lock:
+                self._send(json.loads(json.dumps(self.sim.stats)))
+            return
+
+        outcome = self.sim._admit(path)
+        if outcome == 'rate_limited':
+            self._send({'rt_cd': '1', 'msg_cd': RATE_LIMIT_MSG_CD, 'msg1': RATE_LIMIT_MESSAGE})
+            return
+        if outcome == 'server_error':
+            self._send({'rt_cd': '1', 'msg1': '시뮬레이터 주입 오류'}, status=500)
+            return
+        if not self.sim.authorized(self.headers.get('authorization')):
+            self._send({'rt_cd': '1', 'msg_cd': 'EGW00123', 'msg1': '유효하지 않은 token 입니다.'}, status=401)
+            return
+
+        query = {k.upper(): v[0] for k, v in parse_qs(parsed.query).items()}
+        code = query.get('FID_INPUT_ISCD', '')
+        if path.endswith("/inquire-daily-itemchartprice"):
+            self._send(self.sim.chart(code, query.get('FID_INPUT_DATE_1', '0'), query.get('FID_INPUT_DATE_2', '99999999')))
+        elif path.endswith("/inquire-investor"):
+            self._send(self.sim.investor(code))
+        elif path.endswith("/inquire-price"):
+            self._send(self.sim.price(code))
+        elif path.endswith("/intstock-multprice"):
+            codes = [query[f'FID_INPUT_ISCD_{i}'] for i in range(1, 31) if query.get(f'FID_INPUT_ISCD_{i}')]
+            self._send(self.sim.multi_price(codes))
+        elif path.endswith("/inquire-balance"):
+            self._send(self.sim.balance())
+        else:
+            self._send({'rt_cd': '1', 'msg1': '지원하지 않는 경로입니다.'}, status=404)
@@ -0,0 +1,147 @@
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+from stock_v2.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_FILE = "kis_token.json"
+EXPIRY_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 프로세스 내부 single-flight 잠금 (캐시 키별)
+# 같은 앱키로 만든 KisClient가 여러 개여도 토큰 발급은 한 스레드만 수행하도록 함
+_KEY_LOCKS: Dict[str, threading.Lock] = {}
+_KEY_LOCKS_GUARD = threading.Lock()
+
+
+def token_cache_key(app_key: str, mock: bool) -> str:
+    """
+    토큰 캐시 키 생성 ("mock:<앱키 해시>" / "real:<앱키 해시>")
+
+    앱키 원문을 파일에 남기지 않도록 해시값 일부만 사용함
+    """
+    digest = hashlib.sha256(app_key.encode('utf-8')).hexdigest()[:16]
+    return f"{'mock' if mock else 'real'}:{digest}"
+
+
+def process_lock(key: str) -> threading.Lock:
+    """캐시 키에 대응하는 프로세스 내부 잠금 반환 (없으면 생성)"""
+    with _KEY_LOCKS_GUARD:
+        lock = _KEY_LOCKS.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _KEY_LOCKS[key] = lock
+        return lock
+
+
+@contextmanager
+def _file_lock(lock_path: str) -> Iterator[None]:
+    """
+    프로세스 간 배타 잠금 (OS 파일 잠금)
+
+    학습 포인트:
+    - 리눅스/맥은 fcntl.flock, 윈도우는 msvcrt.locking을 사용 (OS마다 API가 다름)
+    - 잠금은 파일을 닫으면 자동으로 풀리므로, 프로세스가 비정상 종료돼도 영구히 막히지 않음
+    """
+    with open(lock_path, 'a+') as fh:
+        if os.name == 'nt':
+            import msvcrt
+            fh.seek(0)
+            # LK_LOCK은 약 10초 시도 후 OSError를 내므로, 잡힐 때까지 반복
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class TokenCache:
+    """
+    파일 잠금으로 보호되는 접근 토큰 캐시
+
+    - 위치: get_data_dir()/kis_token.json (실행 디렉토리와 무관하게 항상 같은 파일)
+    - 하나의 파일에 앱키/계좌종류별 토큰을 함께 저장
+    - 읽기-발급-쓰기 전체를 파일 잠금으로 감싸서, 여러 프로세스(CLI, 테스트, Streamlit)가
+      동시에 시작해도 토큰은 한 번만 발급됨
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: 캐시 파일 경로 (기본값: get_data_dir()/kis_token.json)
+        """
+        self.path = path or os.path.join(get_data_dir(), TOKEN_CACHE_FILE)
+        self.lock_path = self.path + ".lock"
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """캐시 파일에 대한 프로세스 간 잠금 구간"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _file_lock(self.lock_path):
+            yield
+
+    def _read_all(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            # 파일이 깨졌더라도 새 토큰을 발급받으면 되므로 빈 캐시로 취급
+            logger.warning(f"[KIS] Failed to read token cache: {e}")
+            return {}
+
+    def load(self, key: str) -> Optional[Tuple[str, datetime.datetime]]:
+        """
+        유효한(만료 전) 토큰 조회
+
+        Returns:
+            (access_token, expiry) 또는 None
+        """
+        entry = self._read_all().get(key)
+        if not entry:
+            return None
+        try:
+            expiry = datetime.datetime.strptime(entry['expiry'], EXPIRY_FORMAT)
+        except (KeyError, ValueError):
+            return None
+        if expiry <= datetime.datetime.now():
+            return None
+        return entry['access_token'], expiry
+
+    def save(self, key: str, token: str, expiry: datetime.datetime) -> None:
+        """
+        토큰 저장 (임시 파일에 쓴 뒤 교체하여, 쓰는 도중 다른 프로세스가 깨진 파일을 읽지 않게 함)
+        """
+        data = self._read_all()
+        data[key] = {'access_token': token, 'expiry': expiry.strftime(EXPIRY_FORMAT)}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        if os.name != 'nt':
+            # 토큰은 비밀값이므로 소유자만 읽을 수 있게 함
+            os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.path)
@@ -25,7 +25,33 @@ def load_secrets(file_path: str = None) -> Dict[str, Any]:
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def get_data_dir() -> str:
+    """
+    토큰 캐시, 시세 저장소 등 로컬 데이터를 보관할 디렉토리 경로를 반환합니다.
+    CLI 스크립트, 테스트, Streamlit 앱이 실행 위치(현재 작업 디렉토리)와 상관없이
+    같은 파일을 공유하도록 고정된 위치를 사용합니다.
+
+    - 환경 변수 STOCK_V2_HOME이 있으면 그 경로
+    - 없으면 사용자 홈의 ~/.stock_v2
+    """
+    data_dir = os.environ.get('STOCK_V2_HOME') or os.path.join(os.path.expanduser('~'), '.stock_v2')
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
 def get_kis_config() -> Dict[str, Any]:
+    # 0. 환경 변수 KIS_BASE_URL이 있으면 그 서버(오프라인 시뮬레이터 등)로 접속
+    #    시뮬레이터는 키를 검사하지 않으므로 secrets가 없으면 임시 값을 사용
+    base_url = os.environ.get('KIS_BASE_URL')
+    if base_url:
+        secrets = load_secrets()
+        return {
+            "app_key": secrets.get("APP_KEY") or "simulator",
+            "app_secret": secrets.get("APP_SECRET") or "simulator",
+            "acc_no": secrets.get("ACCOUNT_NO") or "00000000-01",
+            "mock": os.environ.get('KIS_MOCK', '0') == '1',
+            "base_url": base_url,
+        }
+
     # 1. Try Streamlit Secrets (Cloud Deployment)
     try:
         import streamlit as st
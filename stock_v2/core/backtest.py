@@ -0,0 +1,426 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from stock_v2.core.bar_store import BarStore, date_to_int
+from stock_v2.core.data_fetcher import DataFetcher, CHART_MAX_ROWS
+from stock_v2.core.panel import MA_WINDOW
+from stock_v2.core.strategy import StrategyParams, DEFAULT_PARAMS
+from stock_v2.core.trading_calendar import get_calendar
+
+# 스캐너가 종목당 보는 거래일 수 (pipeline.SCAN_SESSIONS와 같은 값)
+# 연속 매수/매도 일수는 이 창 안에서만 세어지므로 백테스트도 같은 상한을 둠
+SCAN_WINDOW = 80
+
+# 성과를 측정할 보유 기간 (거래일)
+DEFAULT_HORIZONS = (1, 5, 20)
+
+# 선정 규칙의 기준값(Top N, 연속 일수, 이격도 등)은 StrategyParams로 받음
+# (기본값은 run_analysis.py / MarketScanner.filter_p2_stocks와 같은 기준)
+
+STRATEGIES = ('P1', 'P2', 'P3')
+
+
+def run_lengths(mask: np.ndarray) -> np.ndarray:
+    """
+    각 칸에서 끝나는 연속 True 길이 (마지막 축 기준, False 칸은 0)
+
+    예: [T, T, F, T] → [1, 2, 0, 1]
+
+    학습 포인트:
+    - False 칸의 위치를 누적 최대(maximum.accumulate)로 앞으로 밀어두면,
+      '현재 위치 - 마지막 False 위치'가 곧 연속 길이가 됨 (파이썬 루프 없음)
+    """
+    idx = np.arange(mask.shape[-1])
+    reset = np.where(mask, -1, idx)
+    last_reset = np.maximum.accumulate(reset, axis=-1)
+    return idx - last_reset
+
+
+def top_n_mask(values: np.ndarray, eligible: np.ndarray, n: int) -> np.ndarray:
+    """행(날짜)마다 eligible 중 values 상위 n개를 True로 표시"""
+    keyed = np.where(eligible, values, -np.inf)
+    order = np.argsort(-keyed, axis=1, kind='stable')
+    # 정렬 순서의 역순열이 곧 각 칸의 순위
+    ranks = np.argsort(order, axis=1)
+    return eligible & (ranks < n)
+
+
+class HistoryPanel:
+    """
+    백테스트용 전체 이력 패널
+
+    - bars: 종목 × 봉 순서 (종목별로 왼쪽 정렬, 거래정지일은 애초에 봉이 없음)
+      → 연속 일수/이동평균/등락률처럼 '종목 자신의 봉 순서' 기준 지표는 여기서 계산
+    - date_pos: 각 봉이 전체 날짜 축(dates)의 몇 번째 칸인지
+      → 계산된 지표를 날짜 × 종목 격자로 옮겨 날짜별 횡단면 선정(Top N 등)에 사용
+    """
+
+    COLUMNS = ('종가', '시가', '외국인_순매수금액', '기관_순매수금액', '개인_순매수금액')
+
+    def __init__(self, tickers_df: pd.DataFrame, frames: Dict[str, pd.DataFrame]):
+        """
+        Args:
+            tickers_df: code, name, market, cap 컬럼을 가진 종목 리스트
+            frames: 종목코드 → 일봉 DataFrame (인덱스: 날짜, 오름차순)
+        """
+        tickers_df = tickers_df[tickers_df['code'].astype(str).isin(frames.keys())]
+        self.codes: List[str] = tickers_df['code'].astype(str).tolist()
+        self.names: List[str] = tickers_df['name'].tolist()
+        self.markets = tickers_df['market'].to_numpy() if 'market' in tickers_df.columns else np.full(len(self.codes), '')
+        self.caps = tickers_df['cap'].to_numpy(dtype=np.float64)
+
+        date_lists = [self._date_ints(frames[code].index) for code in self.codes]
+        self.dates = np.unique(np.concatenate(date_lists)) if date_lists else np.empty(0, dtype=np.int64)
+        self.lengths = np.array([len(d) for d in date_lists], dtype=np.int64)
+        width = int(self.lengths.max()) if len(self.lengths) else 0
+
+        self.date_pos = np.full((len(self.codes), width), -1, dtype=np.int64)
+        self.bars: Dict[str, np.ndarray] = {c: np.full((len(self.codes), width), np.nan) for c in self.COLUMNS}
+        for i, code in enumerate(self.codes):
+            n = self.lengths[i]
+            self.date_pos[i, :n] = np.searchsorted(self.dates, date_lists[i])
+            df = frames[code]
+            for column in self.COLUMNS:
+                if column in df.columns:
+                    self.bars[column][i, :n] = df[column].to_numpy(dtype=np.float64)
+        self.valid = self.date_pos >= 0
+
+    def cap_history(self) -> np.ndarray:
+        """
+        종목 × 봉 축의 날짜별 시가총액 추정치 (현재 시총 × 그날 종가 / 마지막 봉 종가)
+
+        tickers_df의 cap은 '지금' 값이라 과거 날짜의 순위에 그대로 쓰면 미래 주가가 섞임.
+        패널 기간 동안 상장주식수가 같았다고 보고 종가 비율로 되돌림
+        (증자/소각 등 주식수 변화와, 마지막 봉 이후의 주가 변화는 반영되지 않음)
+        """
+        close = self.bars['종가']
+        last_close = close[np.arange(len(self.codes)), np.maximum(self.lengths - 1, 0)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.caps[:, None] * (close / last_close[:, None])
+
+    @staticmethod
+    def _date_ints(index: pd.Index) -> np.ndarray:
+        """날짜 인덱스 → YYYYMMDD 정수 배열 (봉마다 파이썬 변환하지 않도록 벡터 연산)"""
+        if isinstance(index, pd.DatetimeIndex):
+            days = index.to_numpy().astype('datetime64[D]')
+            months = days.astype('datetime64[M]')
+            year = months.astype('datetime64[Y]').astype(np.int64) + 1970
+            month = months.astype(np.int64) % 12 + 1
+            day = (days - months).astype(np.int64) + 1
+            return year * 10000 + month * 100 + day
+        return np.array([date_to_int(d) for d in index], dtype=np.int64)
+
+    @classmethod
+    def from_store(cls, tickers_df: pd.DataFrame, start: Optional[int] = None, end: Optional[int] = None,
+                   store: Optional[BarStore] = None) -> "HistoryPanel":
+        """
+        로컬 일봉 저장소에서 전체 이력을 한 번에 읽어 패널 생성 (API 호출 없음)
+
+        Args:
+            start, end: 읽을 구간 (YYYYMMDD). 지표 계산용 여유 봉을 위해 start는 평가 시작일보다
+                SCAN_WINDOW 거래일 이상 앞으로 잡는 것을 권장
+        """
+        store = store or BarStore()
+        frames = {}
+        for code in tickers_df['code'].astype(str):
+            df = store.read(code, start, end)
+            if df is not None and not df.empty:
+                frames[code] = df
+        return cls(tickers_df, frames)
+
+    def to_grid(self, values: np.ndarray, fill: float = np.nan) -> np.ndarray:
+        """종목 × 봉 배열을 날짜 × 종목 격자로 변환 (봉이 없는 날은 fill)"""
+        grid = np.full((len(self.dates), len(self.codes)), fill, dtype=np.result_type(values.dtype, type(fill)))
+        rows, cols = np.nonzero(self.valid)
+        grid[self.date_pos[rows, cols], rows] = values[rows, cols]
+        return grid
+
+
+def prefetch_history(tickers: Sequence[str], start: datetime, end: datetime,
+                     fetcher: Optional[DataFetcher] = None) -> None:
+    """
+    백테스트 구간의 일봉을 로컬 저장소에 미리 채움 (이미 저장된 구간은 API를 부르지 않음)
+
+    기간별 시세는 1회 최대 100봉이므로, 거래일 달력으로 100거래일씩 끊어서 뒤에서부터 요청함
+
+    참고:
+    - KIS 투자자 동향 API는 최근 구간만 제공하므로, 과거 구간의 외국인/기관/개인 순매수는
+      저장소에 매일 쌓아 둔 범위에서만 채워짐 (그 밖은 0 → P2/P3 신호가 나오지 않음)
+    """
+    fetcher = fetcher or DataFetcher()
+    sessions = get_calendar(fetcher.store).sessions_between(start, end)
+    chunks = [sessions[i:i + CHART_MAX_ROWS] for i in range(0, len(sessions), CHART_MAX_ROWS)]
+    for ticker in tickers:
+        for chunk in reversed(chunks):
+            last = chunk[-1]
+            fetcher.get_stock_data(ticker, end_date=datetime(last.year, last.month, last.day), sessions=len(chunk))
+
+
+class BacktestResult:
+    """
+    백테스트 결과
+
+    - picks: 전략 → 날짜 × 종목 bool 격자 (그날 장 마감 후 선정된 종목)
+    - forward: 보유 기간 h → 날짜 × 종목 수익률 격자 (선정일 종가 매수, h거래일 뒤 종가 매도)
+    - all_dates / codes / names: 격자의 날짜 축(전체)과 종목 축
+      (패널 객체 대신 축 정보만 들고 있으므로 스윕 작업 프로세스에서도 그대로 만들 수 있음)
+    """
+
+    def __init__(self, all_dates: np.ndarray, codes: List[str], names: List[str], eval_rows: np.ndarray,
+                 picks: Dict[str, np.ndarray], forward: Dict[int, np.ndarray]):
+        self.all_dates = all_dates
+        self.codes = codes
+        self.names = names
+        self.eval_rows = eval_rows
+        self.picks = picks
+        self.forward = forward
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.all_dates[self.eval_rows]
+
+    def summary(self) -> pd.DataFrame:
+        """
+        전략 × 보유기간별 성과 요약
+
+        컬럼:
+        - picks: 선정 건수 (선정일-종목 쌍, 수익률 산출 가능한 것만)
+        - mean_return / median_return: 평균/중앙 수익률(%)
+        - hit_rate: 수익률 > 0 비율(%)
+        - excess_return: 같은 날 전체 종목 평균 대비 초과 수익률(%)
+        - turnover: 전날 선정 종목 중 교체된 비율의 일평균(%)
+        """
+        rows = []
+        for strategy, picked in self.picks.items():
+            turnover = self._turnover(picked)
+            for horizon, returns in self.forward.items():
+                ret = returns[self.eval_rows]
+                usable = picked & ~np.isnan(ret)
+                values = ret[usable]
+                # 같은 날 수익률을 알 수 있는 전체 종목 평균 (시장 기준선)
+                known = ~np.isnan(ret)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    universe_mean = np.where(known, ret, 0.0).sum(axis=1) / known.sum(axis=1)
+                baseline = np.broadcast_to(universe_mean[:, None], ret.shape)[usable]
+                rows.append({
+                    'strategy': strategy,
+                    'horizon': horizon,
+                    'picks': int(usable.sum()),
+                    'mean_return': float(values.mean() * 100) if len(values) else np.nan,
+                    'median_return': float(np.median(values) * 100) if len(values) else np.nan,
+                    'hit_rate': float((values > 0).mean() * 100) if len(values) else np.nan,
+                    'excess_return': float((values - baseline).mean() * 100) if len(values) else np.nan,
+                    'turnover': turnover,
+                })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def _turnover(picked: np.ndarray) -> float:
+        """연속한 두 평가일 사이에 새로 들어온 종목 비율의 평균(%)"""
+        if len(picked) < 2:
+            return np.nan
+        prev, curr = picked[:-1], picked[1:]
+        size = curr.sum(axis=1)
+        new = (curr & ~prev).sum(axis=1)
+        days = size > 0
+        if not days.any():
+            return np.nan
+        return float((new[days] / size[days]).mean() * 100)
+
+    def picks_frame(self) -> pd.DataFrame:
+        """선정 내역 (날짜, 전략, 종목, 보유기간별 수익률%)"""
+        records = []
+        dates = self.dates
+        for strategy, picked in self.picks.items():
+            rows, cols = np.nonzero(picked)
+            for r, c in zip(rows, cols):
+                record = {
+                    'date': int(dates[r]),
+                    'strategy': strategy,
+                    'code': self.codes[c],
+                    'name': self.names[c],
+                }
+                for horizon, returns in self.forward.items():
+                    value = returns[self.eval_rows[r], c]
+                    record[f'fwd_{horizon}d'] = float(value * 100) if not np.isnan(value) else np.nan
+                records.append(record)
+        return pd.DataFrame(records)
+
+
+def select_picks(grid: Dict[str, np.ndarray], markets: np.ndarray,
+                 params: StrategyParams = DEFAULT_PARAMS) -> Dict[str, np.ndarray]:
+    """
+    날짜 × 종목 특징 격자(Backtester.features)에 기준값을 적용해 전략별 선정 격자 계산
+
+    특징 격자는 기준값과 무관하므로, 기준값만 바꿔 가며 이 함수만 다시 부르면 됨 (파라미터 스윕)
+
+    Args:
+        grid: Backtester.features() 결과
+        markets: 종목별 시장 구분 (P2 Top N은 시장별로 적용)
+        params: 판정 기준값
+
+    Returns:
+        전략 → 날짜 × 종목 bool 격자 (전체 날짜)
+    """
+    available = grid['available']
+    foreign_run = grid['foreign_run']
+    disparity = grid['disparity']
+
+    enough = available >= params.min_rows
+    is_p1 = enough & grid['is_p1']
+    is_p2 = enough & (foreign_run > 0)
+    with np.errstate(invalid='ignore'):
+        is_p3 = (enough & grid['bullish'] & (disparity <= params.p3_max_disparity)
+                 & (foreign_run >= params.p3_min_foreign_days))
+
+    # P1: 전체 시장 지수 기여도 상위 k
+    p1 = top_n_mask(grid['contribution'], is_p1, params.p1_top_k)
+
+    # P2: 시장별 외인/기관 순매수 상위 N 교집합 + 연속일수/손바뀜/초기포착 조건
+    p2 = np.zeros_like(p1)
+    with np.errstate(invalid='ignore'):
+        positive = (is_p1 | is_p2 | is_p3) & (grid['foreign'] > 0) & (grid['inst'] > 0)
+    for market in np.unique(markets):
+        in_market = positive & (markets == market)[None, :]
+        both_top = (top_n_mask(grid['foreign'], in_market, params.p2_top_n)
+                    & top_n_mask(grid['inst'], in_market, params.p2_top_n))
+        p2 |= both_top
+    with np.errstate(invalid='ignore'):
+        p2 &= ((foreign_run >= params.p2_min_foreign_days) & (foreign_run <= params.p2_max_foreign_days)
+               & (grid['personal_run'] >= params.p2_min_personal_sell_days)
+               & (disparity <= params.p2_max_disparity))
+
+    # P3: 바닥 반등 조건을 만족한 모든 종목
+    return {'P1': p1, 'P2': p2, 'P3': is_p3}
+
+
+def eval_range(dates: np.ndarray, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+    """날짜 축에서 [start, end] 구간에 해당하는 행 번호 (생략 시 전체)"""
+    lo = 0 if start is None else int(np.searchsorted(dates, start, side='left'))
+    hi = len(dates) if end is None else int(np.searchsorted(dates, end, side='right'))
+    return np.arange(lo, hi)
+
+
+class Backtester:
+    """
+    P1/P2/P3 규칙의 과거 성과를 한 번에 계산하는 벡터화 백테스터
+
+    - 전체 이력을 한 번만 읽고(HistoryPanel), 모든 날짜의 지표/신호를 배열 연산으로 계산
+    - 날짜마다 run_scan을 다시 돌리는 것과 같은 결과를, 날짜 수만큼의 재조회 없이 얻음
+
+    사용법:
+        panel = HistoryPanel.from_store(tickers_df, start=20240101, end=20260101)
+        result = Backtester(panel).run(start=20240401, end=20251201)
+        print(result.summary())
+
+    재현 기준 (스캐너와 같게 맞춘 부분):
+    - 종목별로 '그날까지의 최근 80봉'만 보는 것과 같게 연속 일수 상한을 80으로 둠
+    - 봉 min_rows개 미만 종목은 분석 제외, 등락률은 직전 봉 종가 대비
+    - P1: 지수 기여도 양수 종목 중 전체 상위 k / P2: 시장별 filter_p2_stocks 규칙 / P3: is_p3
+
+    한계 (스캐너와 다른 부분):
+    - 종목 목록은 '지금' 상장된 시총 상위 종목이므로, 그 사이 상장폐지/순위 밖으로 밀려난 종목은
+      빠져 있음 (생존 편향)
+    - P1 기여도의 시가총액은 현재 시총을 종가 비율로 되돌린 추정치 (HistoryPanel.cap_history)
+
+    학습 포인트:
+    - 기준값과 무관한 특징(연속 일수, 이격도, 수익률 등)과 기준값 적용(select_picks)을 나눠 두면,
+      특징은 한 번만 계산하고 기준값 조합만 바꿔 가며 재사용할 수 있음
+    """
+
+    def __init__(self, panel: HistoryPanel, horizons: Sequence[int] = DEFAULT_HORIZONS,
+                 params: Optional[StrategyParams] = None):
+        """
+        Args:
+            params: 판정 기준값 (기본값: DEFAULT_PARAMS, run()에서 따로 줄 수도 있음)
+        """
+        self.panel = panel
+        self.horizons = tuple(horizons)
+        self.params = params or DEFAULT_PARAMS
+        self._features: Optional[Dict[str, np.ndarray]] = None
+
+    def _bar_features(self) -> Dict[str, np.ndarray]:
+        """종목 × 봉 축에서 종목별 지표 계산 (스캐너의 종목별 분석과 같은 값, 기준값과 무관)"""
+        p = self.panel
+        close = p.bars['종가']
+        open_price = p.bars['시가']
+        foreign = p.bars['외국인_순매수금액']
+        personal = p.bars['개인_순매수금액']
+        width = close.shape[1]
+        idx = np.arange(width)[None, :]
+
+        # 스캐너 창 안의 봉 수 (그날 포함 최대 SCAN_WINDOW개)
+        available = np.broadcast_to(np.minimum(idx + 1, SCAN_WINDOW), close.shape)
+
+        # 등락률: 직전 봉 대비 (첫 봉은 0)
+        prev_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = np.nan_to_num((close / prev_close - 1) * 100, nan=0.0)
+
+        # 연속 일수 (창 길이로 상한)
+        foreign_run = np.minimum(run_lengths(foreign > 0), available)
+        personal_run = np.minimum(run_lengths(personal < 0), available)
+
+        # 20일 이동평균 (누적합의 차이로 모든 날짜를 한 번에)
+        filled = np.nan_to_num(close)
+        csum = np.cumsum(filled, axis=1)
+        window_sum = csum - np.concatenate([np.zeros((close.shape[0], MA_WINDOW)), csum[:, :-MA_WINDOW]], axis=1)[:, :width]
+        ma20 = np.where(idx + 1 >= MA_WINDOW, window_sum / MA_WINDOW, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            disparity = np.where(ma20 > 0, close / ma20 * 100, 0.0)
+
+        contribution = p.cap_history() * rate
+        features = {
+            'available': available,
+            'contribution': contribution,
+            'is_p1': contribution > 0,
+            'bullish': close > open_price,
+            'foreign_run': foreign_run,
+            'personal_run': personal_run,
+            'disparity': disparity,
+            'foreign': foreign,
+            'inst': p.bars['기관_순매수금액'],
+        }
+        # 보유 기간별 수익률: h봉 뒤 종가 / 오늘 종가 - 1
+        for h in self.horizons:
+            future = np.full_like(close, np.nan)
+            if h < width:
+                future[:, :-h] = close[:, h:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                features[f'fwd_{h}'] = future / close - 1
+        return features
+
+    def features(self) -> Dict[str, np.ndarray]:
+        """
+        날짜 × 종목 특징 격자 (처음 한 번만 계산하고 재사용)
+
+        봉이 없는 칸은 bool은 False, available은 0, 나머지는 NaN
+        """
+        if self._features is None:
+            p = self.panel
+            fills = {'available': 0}
+            self._features = {
+                name: p.to_grid(values, fill=fills.get(name, False if values.dtype == bool else np.nan))
+                for name, values in self._bar_features().items()
+            }
+        return self._features
+
+    def run(self, start: Optional[int] = None, end: Optional[int] = None,
+            params: Optional[StrategyParams] = None) -> BacktestResult:
+        """
+        [start, end] 구간의 모든 거래일에 대해 선정 종목과 성과 계산
+
+        Args:
+            start, end: 평가 구간 (YYYYMMDD, 생략 시 패널 전체)
+            params: 이번 실행의 판정 기준값 (생략 시 생성자에서 받은 값)
+        """
+        p = self.panel
+        grid = self.features()
+        selected = select_picks(grid, p.markets, params or self.params)
+        eval_rows = eval_range(p.dates, start, end)
+        picks = {strategy: selected[strategy][eval_rows] for strategy in STRATEGIES}
+        forward = {h: grid[f'fwd_{h}'] for h in self.horizons}
+        return BacktestResult(p.dates, p.codes, p.names, eval_rows, picks, forward)
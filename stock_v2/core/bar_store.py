@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_v2.config import get_data_dir
+
+# 내부 표준 컬럼 → 파일 이름 (컬럼 하나당 .npy 파일 하나)
+# 파일 이름은 OS 호환을 위해 영문으로 둠
+PRICE_FIELDS: Dict[str, str] = {
+    '종가': 'close',
+    '시가': 'open',
+    '고가': 'high',
+    '저가': 'low',
+    '거래량': 'volume',
+    '거래대금': 'amount',
+}
+INVESTOR_FIELDS: Dict[str, str] = {
+    '개인_순매수': 'prsn_qty',
+    '외국인_순매수': 'frgn_qty',
+    '기관_순매수': 'orgn_qty',
+    '개인_순매수금액': 'prsn_amt',
+    '외국인_순매수금액': 'frgn_amt',
+    '기관_순매수금액': 'orgn_amt',
+}
+DATE_FILE = 'date'
+META_FILE = 'meta.json'
+
+
+def date_to_int(value) -> int:
+    """날짜(datetime/Timestamp/'YYYYMMDD')를 정수 YYYYMMDD로 변환"""
+    if isinstance(value, str):
+        return int(value.replace('-', ''))
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+# pd.to_datetime이 만드는 날짜 인덱스의 해상도 (pandas 버전에 따라 ns 또는 us)
+_DATE_DTYPE = pd.to_datetime(['20000101'], format="%Y%m%d").dtype
+
+
+def dates_to_index(dates: np.ndarray) -> pd.DatetimeIndex:
+    """
+    YYYYMMDD 정수 배열 → '날짜' DatetimeIndex
+    (문자열로 바꿔 파싱하지 않고 연/월/일 산술로 변환, 결과는 pd.to_datetime과 같은 dtype)
+    """
+    dates = np.asarray(dates, dtype=np.int64)
+    months = (dates // 10000 - 1970) * 12 + dates // 100 % 100 - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + (dates % 100 - 1).astype('timedelta64[D]')
+    return pd.DatetimeIndex(days.astype(_DATE_DTYPE), name='날짜')
+
+
+def next_day_int(value: int) -> int:
+    """YYYYMMDD 정수의 다음 날 (월/연 경계 처리를 위해 날짜 연산 사용)"""
+    day = datetime.strptime(str(value), "%Y%m%d") + timedelta(days=1)
+    return date_to_int(day)
+
+
+class BarStore:
+    """
+    종목별 일봉 + 투자자 동향 로컬 컬럼 저장소
+
+    디렉토리 구조:
+        <data_dir>/bars/<종목코드>/
+            date.npy        (int32, YYYYMMDD, 오름차순)
+            close.npy ...   (int64, 컬럼별 1개 파일)
+            meta.json       ({"covered_from": YYYYMMDD, "checked_through": YYYYMMDD})
+
+    - covered_from: 이 날짜부터는 빠짐없이 받아 두었다는 표시
+    - checked_through: 이 날짜까지는 확정 데이터를 모두 받아 두었다는 표시
+      (요청 구간이 [covered_from, checked_through] 안에 있으면 API를 부를 필요가 없음)
+
+    학습 포인트:
+    - 컬럼 단위(.npy) 저장: 필요한 컬럼만 읽을 수 있고, np.load(mmap_mode='r')로
+      파일 전체를 메모리에 올리지 않고도 필요한 부분만 접근할 수 있음
+    - 임시 파일에 쓴 뒤 os.replace로 교체하여, 쓰는 도중 읽어도 깨진 파일을 보지 않음
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: 저장소 루트 경로 (기본값: get_data_dir()/bars)
+        """
+        self.root = root or os.path.join(get_data_dir(), 'bars')
+        os.makedirs(self.root, exist_ok=True)
+        # 같은 종목을 여러 스레드가 동시에 갱신하지 않도록 종목별 잠금
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(ticker)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[ticker] = lock
+            return lock
+
+    def _dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker)
+
+    def tickers(self) -> List[str]:
+        """저장된 종목 코드 목록"""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, META_FILE))
+        )
+
+    def dates(self, ticker: str) -> np.ndarray:
+        """저장된 날짜 배열 (YYYYMMDD int32, 없으면 빈 배열)"""
+        path = os.path.join(self._dir(ticker), f"{DATE_FILE}.npy")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=np.int32)
+        return np.load(path, mmap_mode='r')
+
+    def coverage(self, ticker: str) -> Optional[Tuple[int, int]]:
+        """
+        저장 범위 조회
+
+        Returns:
+            (covered_from, checked_through) 또는 저장된 적이 없으면 None
+        """
+        path = os.path.join(self._dir(ticker), META_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            return int(meta['covered_from']), int(meta['checked_through'])
+        except (OSError, ValueError, KeyError):
+            # 메타 파일이 깨졌다면 저장된 적 없는 것으로 보고 다시 받음
+            return None
+
+    def _load_arrays(self, ticker: str) -> Optional[Dict[str, np.ndarray]]:
+        directory = self._dir(ticker)
+        date_path = os.path.join(directory, f"{DATE_FILE}.npy")
+        if not os.path.exists(date_path):
+            return None
+        arrays = {DATE_FILE: np.load(date_path, mmap_mode='r')}
+        for column, name in {**PRICE_FIELDS, **INVESTOR_FIELDS}.items():
+            path = os.path.join(directory, f"{name}.npy")
+            if os.path.exists(path):
+                arrays[column] = np.load(path, mmap_mode='r')
+        return arrays
+
+    def read(self, ticker: str, start: Optional[int] = None, end: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        저장된 봉을 DataFrame으로 읽음 (인덱스: '날짜' DatetimeIndex, 오름차순)
+
+        Args:
+            ticker: 종목 코드
+            start, end: 조회 구간 (YYYYMMDD 정수, 양 끝 포함). None이면 제한 없음
+
+        Returns:
+            DataFrame (저장된 데이터가 없거나 구간이 비면 None)
+        """
+        arrays = self._load_arrays(ticker)
+        if arrays is None:
+            return None
+        dates = arrays[DATE_FILE]
+        # 날짜가 정렬되어 있으므로 이진 탐색으로 구간 경계를 찾음
+        lo = 0 if start is None else int(np.searchsorted(dates, start, side='left'))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, end, side='right'))
+        if hi <= lo:
+            return None
+
+        data = {column: np.asarray(values[lo:hi]) for column, values in arrays.items() if column != DATE_FILE}
+        return pd.DataFrame(data, index=dates_to_index(dates[lo:hi]))
+
+    def upsert(self, ticker: str, df: pd.DataFrame, covered_from: int, checked_through: int) -> None:
+        """
+        새로 받은 봉을 저장소에 병합 (같은 날짜는 새 값으로 덮어씀)
+
+        Args:
+            ticker: 종목 코드
+            df: get_stock_data 형식의 DataFrame (인덱스: 날짜)
+            covered_from: 이번 조회로 빠짐없이 받은 구간의 시작 (YYYYMMDD)
+            checked_through: 이번 조회로 확정된 마지막 날짜 (YYYYMMDD)
+        """
+        with self._lock(ticker):
+            columns = [c for c in {**PRICE_FIELDS, **INVESTOR_FIELDS} if c in df.columns]
+            new = df[columns].copy()
+            new.index = pd.Index([date_to_int(d) for d in new.index], name=DATE_FILE)
+            # 확정되지 않은 봉(장중 당일 등)은 저장하지 않음
+            new = new[new.index <= checked_through]
+
+            old = self.read(ticker)
+            if old is not None:
+                old.index = pd.Index([date_to_int(d) for d in old.index], name=DATE_FILE)
+                # combine_first: new 값을 우선하고, new에 없는 날짜/컬럼은 old 값으로 채움
+                merged = new.combine_first(old)
+            else:
+                merged = new
+            merged = merged.sort_index()
+            # 투자자 데이터가 없는 날짜(조회 범위 밖 과거)는 기존 로직과 같게 0으로 둠
+            merged = merged.fillna(0)
+
+            prev = self.coverage(ticker)
+            if prev is not None:
+                prev_from, prev_through = prev
+                # 기존 범위와 이어지거나 겹칠 때만 범위를 합침 (끊기면 새 범위 기준)
+                if covered_from <= next_day_int(prev_through) and prev_from <= checked_through:
+                    covered_from = min(covered_from, prev_from)
+                    checked_through = max(checked_through, prev_through)
+            self._write(ticker, merged, covered_from, checked_through)
+
+    def _write(self, ticker: str, merged: pd.DataFrame, covered_from: int, checked_through: int) -> None:
+        directory = self._dir(ticker)
+        os.makedirs(directory, exist_ok=True)
+
+        def save(name: str, values: np.ndarray) -> None:
+            tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+            np.save(tmp_path, values)
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+
+        save(DATE_FILE, merged.index.to_numpy(dtype=np.int32))
+        for column, name in {**PRICE_FIELDS, **INVESTOR_FIELDS}.items():
+            if column in merged.columns:
+                save(name, merged[column].to_numpy(dtype=np.int64))
+
+        # 메타 파일은 마지막에 교체 → 메타가 가리키는 범위의 데이터는 항상 이미 기록되어 있음
+        tmp_meta = os.path.join(directory, f"{META_FILE}.tmp")
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump({'covered_from': covered_from, 'checked_through': checked_through}, f)
+        os.replace(tmp_meta, os.path.join(directory, META_FILE))
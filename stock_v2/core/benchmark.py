@@ -0,0 +1,341 @@
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+import numpy as np
+import pandas as pd
+
+from stock_v2.config import get_data_dir
+
+# 결과 파일 형식 버전 (필드나 측정 방식이 바뀌면 올려서 예전 기준선과 잘못 비교하지 않도록 함)
+# 2: indicators/analyze 처리량에서 가상 일봉 생성/복사/지표 준비 시간을 제외
+# 3: indicators/analyze 메모리 최고치를 호출 한 번 기준으로 잼 (종목 수에 비례해 커지지 않음)
+BENCHMARK_FORMAT = 3
+
+# 기준선 파일 기본 위치 (get_data_dir() 아래)
+BASELINE_FILE = os.path.join("benchmarks", "baseline.json")
+
+# 재현성을 위해 고정한 가상 시장의 마지막 거래일
+BENCHMARK_END_DATE = datetime(2025, 12, 30)
+
+# 1년 ≈ 거래일 수
+SESSIONS_PER_YEAR = 250
+
+# 기준선 대비 처리량이 이 비율 이상 떨어지면 회귀로 판정
+DEFAULT_TOLERANCE = 0.10
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """가상 시장 크기 하나 (종목 수 × 기간)"""
+    tickers: int
+    years: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.tickers}x{self.years}y"
+
+
+# 미리 정해 둔 규모
+SUITES = {
+    'quick': (BenchmarkCase(200, 1),),
+    'default': (BenchmarkCase(200, 1), BenchmarkCase(2500, 3)),
+    'full': (BenchmarkCase(200, 1), BenchmarkCase(2500, 3), BenchmarkCase(10000, 10)),
+}
+
+
+def parse_case(text: str) -> BenchmarkCase:
+    """'2500x3' 또는 '2500x3y' → BenchmarkCase(2500, 3)"""
+    tickers, _, years = text.lower().rstrip('y').partition('x')
+    return BenchmarkCase(int(tickers), int(years or 1))
+
+
+class StageTimer:
+    """
+    단계 하나의 호출별 소요 시간과 메모리 최고치 기록
+
+    - 호출마다 time.perf_counter로 잰 시간을 모아 p50/p99를 계산
+    - with 블록으로 쓰면: elapsed는 블록 전체 시간, trace_memory면 블록 전체를 tracemalloc으로 감싸
+      Python/NumPy 할당의 최고치를 잼 (같은 프로세스의 시뮬레이터 스레드가 할당한 메모리도 포함,
+      할당 추적 때문에 시간도 늘어남)
+    - with 없이 measure만 쓰면: elapsed는 measure 호출 시간의 합, 메모리는 호출 한 번 안에서
+      새로 할당한 양의 최고치 (호출 사이의 입력 준비는 시간/메모리 어디에도 들어가지 않음)
+
+    학습 포인트:
+    - 평균만 보면 몇 번의 느린 호출(꼬리 지연)이 가려짐 → 백분위수(p99)를 함께 봐야 함
+    """
+
+    def __init__(self, name: str, trace_memory: bool = True):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.samples: List[float] = []
+        self.items = 0
+        self.elapsed = 0.0
+        self.peak_bytes = 0
+        self._started = 0.0
+        self._entered = False
+
+    def __enter__(self) -> "StageTimer":
+        self._entered = True
+        if self.trace_memory:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.elapsed = time.perf_counter() - self._started
+        if self.trace_memory:
+            _, self.peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    def measure(self, func: Callable[..., Any], *args: Any, items: int = 1, **kwargs: Any) -> Any:
+        """func 호출 한 번을 재고 결과를 그대로 반환"""
+        per_call = not self._entered
+        if per_call and self.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        sample = time.perf_counter() - started
+        if per_call and self.trace_memory:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.samples.append(sample)
+        self.items += items
+        if per_call:
+            self.elapsed += sample
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        samples = np.array(self.samples) if self.samples else np.zeros(1)
+        return {
+            'calls': len(self.samples),
+            'items': self.items,
+            'elapsed_s': round(self.elapsed, 4),
+            'throughput_per_s': round(self.items / self.elapsed, 2) if self.elapsed else 0.0,
+            'p50_ms': round(float(np.percentile(samples, 50)) * 1000, 3),
+            'p99_ms': round(float(np.percentile(samples, 99)) * 1000, 3),
+            'peak_mb': round(self.peak_bytes / 2 ** 20, 2) if self.trace_memory else None,
+        }
+
+
+def synthetic_universe(count: int, seed: int, path: str):
+    """
+    가상 종목 count개의 종목 리스트 파일을 만들고 그 파일의 TickerUniverse 반환
+    (종목코드 000001~, 시가총액은 seed로 고정한 로그 정규 분포)
+    """
+    from stock_v2.core.universe import TickerUniverse
+
+    rng = np.random.default_rng(seed)
+    caps = np.round(np.exp(rng.normal(27, 1.5, count)))
+    records = [{'code': f"{i + 1:06d}", 'name': f"SIM{i + 1:06d}", 'market': 'KOSPI', 'cap': int(cap)}
+               for i, cap in enumerate(caps)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+    return TickerUniverse(path)
+
+
+class ScanBenchmark:
+    """
+    가상 시장(오프라인 KIS 시뮬레이터) 위에서 스캔 경로의 단계별 성능 측정
+
+    측정 단계:
+    - fetch: DataFetcher.get_stock_data (시뮬레이터 HTTP 왕복 + DataFrame 구성, 저장소 끔)
+    - indicators: calculate_indicators (case.years 기간 전체 일봉)
+    - analyze: StockStrategy.analyze (지표가 계산된 같은 일봉)
+    - scan: MarketScanner.run_scan (종목 리스트 → 조회 → 분석 → 결과, 호출 1번 = 스캔 1번)
+
+    참고:
+    - 시뮬레이터의 지연/초당 한도는 0으로 둠 → 네트워크가 아닌 우리 코드의 비용만 잼
+    - 데이터 디렉토리(STOCK_V2_HOME)를 임시 디렉토리로 바꿔, 일봉 저장소/지표 상태가
+      항상 빈 상태에서 시작하고 실제 데이터와 섞이지 않게 함
+    - 같은 seed/case면 같은 종목, 같은 시세 → 실행 간 결과 비교 가능
+
+    사용법:
+        bench = ScanBenchmark(seed=0)
+        report = bench.run([BenchmarkCase(200, 1)])
+    """
+
+    def __init__(self, seed: int = 0, fetch_sample: int = 200, scan_repeat: int = 1,
+                 trace_memory: bool = True, end_date: datetime = BENCHMARK_END_DATE):
+        """
+        Args:
+            seed: 가상 시장 시드
+            fetch_sample: fetch 단계에서 조회할 종목 수 상한 (전 종목 HTTP 조회는 scan 단계가 담당)
+            scan_repeat: scan 단계 반복 횟수 (p50/p99 표본 수)
+            trace_memory: 단계별 메모리 최고치 측정 여부 (끄면 시간만, 오버헤드 없음)
+            end_date: 가상 시장의 마지막 거래일 (스캔 기준일)
+        """
+        self.seed = seed
+        self.fetch_sample = fetch_sample
+        self.scan_repeat = scan_repeat
+        self.trace_memory = trace_memory
+        self.end_date = end_date
+
+    def run(self, cases: List[BenchmarkCase]) -> Dict[str, Any]:
+        """모든 case를 차례로 측정해 결과(dict, JSON으로 저장 가능) 반환"""
+        report = {'format': BENCHMARK_FORMAT, 'meta': self._meta(), 'cases': {}}
+        for case in cases:
+            print(f"=== Benchmark {case.name} ===")
+            report['cases'][case.name] = self.run_case(case)
+        return report
+
+    def run_case(self, case: BenchmarkCase) -> Dict[str, Any]:
+        from stock_v2.api.rate_limiter import TokenBucket
+        from stock_v2.api.simulator import KisSimulator, SimulatorConfig, SyntheticMarket
+
+        previous_env = {key: os.environ.get(key) for key in ('STOCK_V2_HOME', 'KIS_BASE_URL')}
+        market = SyntheticMarket(end_date=self.end_date, sessions=case.years * SESSIONS_PER_YEAR, seed=self.seed)
+        config = SimulatorConfig(latency=0.0, jitter=0.0, rate_limit=0, seed=self.seed)
+        stages: Dict[str, Dict[str, Any]] = {}
+        with tempfile.TemporaryDirectory() as home, KisSimulator(market, config) as simulator:
+            os.environ['STOCK_V2_HOME'] = home
+            os.environ['KIS_BASE_URL'] = simulator.url
+            try:
+                universe = synthetic_universe(case.tickers, self.seed, os.path.join(home, 'tickers.json'))
+                tickers = universe.top('KOSPI')
+                # 클라이언트 쪽 속도 제한도 풀어 둠 (실제 초당 한도는 측정 대상이 아님)
+                unlimited = TokenBucket(1e9)
+
+                stages['fetch'] = self._bench_fetch(tickers, unlimited).to_dict()
+                indicators, analyze = self._bench_compute(market, tickers)
+                stages['indicators'] = indicators.to_dict()
+                stages['analyze'] = analyze.to_dict()
+                stages['scan'] = self._bench_scan(case, universe, unlimited, home).to_dict()
+            finally:
+                for key, value in previous_env.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+            requests = simulator.stats['requests']
+
+        for name, stage in stages.items():
+            peak = f"{stage['peak_mb']:>8.1f}MB" if stage['peak_mb'] is not None else "-"
+            print(f"  {name:<10} {stage['throughput_per_s']:>10.1f}/s  p50 {stage['p50_ms']:>9.2f}ms  "
+                  f"p99 {stage['p99_ms']:>9.2f}ms  peak {peak}")
+        return {'tickers': case.tickers, 'years': case.years, 'api_requests': requests, 'stages': stages}
+
+    def _bench_fetch(self, tickers: pd.DataFrame, rate_limiter) -> StageTimer:
+        from stock_v2.core.data_fetcher import DataFetcher
+
+        fetcher = DataFetcher(use_store=False)
+        fetcher.client.rate_limiter = rate_limiter
+        with StageTimer('fetch', self.trace_memory) as timer:
+            for code in tickers['code'].head(self.fetch_sample):
+                timer.measure(fetcher.get_stock_data, code, end_date=self.end_date)
+        fetcher.client.close()
+        return timer
+
+    def _bench_compute(self, market, tickers: pd.DataFrame):
+        """
+        지표 계산과 전략 판정을 종목마다 따로 잼
+        - 종목 하나씩 가상 일봉 생성/복사(타이머 밖) → calculate_indicators → 그 결과로 strategy.analyze
+          순서로 처리하고 다음 종목으로 넘어감 (한 번에 한 종목의 일봉만 메모리에 있음)
+        - 두 타이머 모두 measure 호출만 누적 (elapsed/처리량/메모리 최고치에 입력 준비는 들어가지 않음)
+        """
+        from stock_v2.core.indicators import calculate_indicators
+        from stock_v2.core.strategy import StockStrategy
+
+        strategy = StockStrategy()
+        indicators = StageTimer('indicators', self.trace_memory)
+        analyze = StageTimer('analyze', self.trace_memory)
+        for code, cap in zip(tickers['code'], tickers['cap']):
+            df = market.daily(code).copy()
+            df = indicators.measure(calculate_indicators, df)
+            analyze.measure(strategy.analyze, df, cap)
+        return indicators, analyze
+
+    def _bench_scan(self, case: BenchmarkCase, universe, rate_limiter, home: str) -> StageTimer:
+        from stock_v2.core.pipeline import MarketScanner
+
+        timer = StageTimer('scan', self.trace_memory)
+        with timer:
+            for _ in range(self.scan_repeat):
+                # 반복마다 빈 데이터 디렉토리의 새 스캐너 (저장소/지표 상태가 없는 첫 스캔과 같은 양을 조회)
+                os.environ['STOCK_V2_HOME'] = tempfile.mkdtemp(dir=home)
+                scanner = MarketScanner(universe=universe)
+                scanner.data_fetcher.client.rate_limiter = rate_limiter
+                timer.measure(scanner.run_scan, 'KOSPI', top_n=case.tickers, target_date=self.end_date,
+                              items=case.tickers)
+                scanner.data_fetcher.client.close()
+        return timer
+
+    def _meta(self) -> Dict[str, Any]:
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'seed': self.seed,
+            'fetch_sample': self.fetch_sample,
+            'scan_repeat': self.scan_repeat,
+            'trace_memory': self.trace_memory,
+            'end_date': self.end_date.strftime("%Y-%m-%d"),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        }
+
+
+def default_baseline_path() -> str:
+    return os.path.join(get_data_dir(), BASELINE_FILE)
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path: str) -> Optional[Dict[str, Any]]:
+    """저장된 결과 읽기 (없거나 형식 버전이 다르면 None)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('format') != BENCHMARK_FORMAT:
+        print(f"기준선 형식이 다릅니다 (format {report.get('format')} != {BENCHMARK_FORMAT}): {path}")
+        return None
+    return report
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> pd.DataFrame:
+    """
+    현재 결과와 기준선을 (case, stage)별로 비교
+
+    Returns:
+        case, stage, 처리량/p50/p99/메모리의 기준선·현재 값, 처리량 변화율(change),
+        regression(처리량이 tolerance 이상 감소) 컬럼의 DataFrame (양쪽에 모두 있는 항목만)
+    """
+    rows = []
+    for case, result in current['cases'].items():
+        base_case = baseline.get('cases', {}).get(case)
+        if base_case is None:
+            continue
+        for stage, now in result['stages'].items():
+            before = base_case['stages'].get(stage)
+            if before is None:
+                continue
+            change = (now['throughput_per_s'] / before['throughput_per_s'] - 1) if before['throughput_per_s'] else 0.0
+            rows.append({
+                'case': case,
+                'stage': stage,
+                'throughput_before': before['throughput_per_s'],
+                'throughput_after': now['throughput_per_s'],
+                'change': round(change, 4),
+                'p50_before': before['p50_ms'],
+                'p50_after': now['p50_ms'],
+                'p99_before': before['p99_ms'],
+                'p99_after': now['p99_ms'],
+                'peak_mb_before': before['peak_mb'],
+                'peak_mb_after': now['peak_mb'],
+                'regression': change < -tolerance,
+            })
+    return pd.DataFrame(rows)
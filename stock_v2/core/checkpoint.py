@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from stock_v2.config import get_data_dir
+from stock_v2.core.bar_store import date_to_int
+from stock_v2.core.data_fetcher import MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE
+from stock_v2.core.strategy import StrategyParams, STRATEGY_VERSION
+
+# 체크포인트 파일을 두는 하위 디렉토리 (get_data_dir() 아래)
+CHECKPOINT_DIR = "checkpoints"
+
+# 장중(미확정) 데이터로 만든 체크포인트를 이어받을 수 있는 시간 (마지막 기록 기준)
+# 이보다 오래되면 그 사이 시세가 바뀌었으므로 처음부터 다시 스캔
+LIVE_RESUME_TTL = timedelta(minutes=10)
+
+
+def strategy_version(params: StrategyParams) -> str:
+    """
+    판정 로직 버전 + 기준값 해시 (예: 'v1-3f2a9c1b')
+
+    기준값이나 로직이 바뀌면 예전 체크포인트의 결과를 재사용하면 안 되므로 키에 포함함
+    """
+    digest = hashlib.sha1(json.dumps(params.to_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+    return f"v{STRATEGY_VERSION}-{digest[:8]}"
+
+
+def _to_json(value: Any) -> Any:
+    """분석 결과의 NumPy 스칼라(np.float64, np.bool_ 등)를 JSON 기본 타입으로 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON으로 저장할 수 없는 값입니다: {type(value).__name__}")
+
+
+class ScanCheckpoint:
+    """
+    스캔 중간 결과 체크포인트 (시장, 기준일, 전략 버전별 파일 하나)
+
+    - 종목 하나가 끝날 때마다 한 줄(JSON)씩 덧붙여 씀 → 스캔이 중간에 죽어도 끝난 종목은 남음
+    - 다시 실행하면 load()로 끝난 종목을 읽어 조회를 건너뜀
+    - 조건을 만족하지 않은 종목도 result=None으로 기록 (다시 조회하지 않도록)
+    - 조회에 실패한 종목은 retry로만 기록 (이어받지 않고 재실행 시 다시 조회)
+    - 첫 줄에 시작 시각을 남겨, 기준일 장 마감 전(장중 시세)에 만든 체크포인트는
+      아직 장중이고 마지막 기록이 LIVE_RESUME_TTL 이내일 때만 이어받음
+      (오전에 끊긴 스캔을 오후/장 마감 후에 다시 돌릴 때 오전 시세 결과가 섞이지 않도록)
+
+    학습 포인트:
+    - 파일 전체를 다시 쓰지 않고 한 줄씩 덧붙이면(append-only) 기록 비용이 종목 수와 무관하게 일정함
+    - 쓰는 도중 죽어 마지막 줄이 잘려도, 읽을 때 그 줄만 버리면 나머지는 그대로 사용 가능
+    """
+
+    def __init__(self, market: str, target_date: Optional[datetime], version: str,
+                 directory: Optional[str] = None):
+        """
+        Args:
+            market: 시장 (KOSPI/KOSDAQ)
+            target_date: 기준일 (None이면 오늘)
+            version: strategy_version() 결과
+            directory: 체크포인트 디렉토리 (기본: 데이터 디렉토리/checkpoints)
+        """
+        self.market = market
+        day = target_date or datetime.now()
+        self.date = date_to_int(day)
+        # 기준일 봉이 확정되는 시각 (이후에 시작한 체크포인트는 확정 봉 기준)
+        self.final_at = datetime(day.year, day.month, day.day, MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE)
+        self.version = version
+        directory = directory or os.path.join(get_data_dir(), CHECKPOINT_DIR)
+        self.path = os.path.join(directory, f"{market}_{self.date}_{version}.jsonl")
+
+    def load(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        기록된 종목코드 → 분석 결과 (조건 불만족 종목은 None)
+        - retry 기록(조회 실패) 종목은 넣지 않음 → 다시 조회
+        - 이어받을 수 없는 체크포인트(_is_stale)는 지우고 빈 결과 반환
+        """
+        finished: Dict[str, Optional[Dict[str, Any]]] = {}
+        if not os.path.exists(self.path):
+            return finished
+        started = None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if 'started' in record:
+                        started = datetime.fromisoformat(record['started'])
+                    elif record.get('retry'):
+                        finished.pop(record['code'], None)
+                    else:
+                        finished[record['code']] = record['result']
+                except (ValueError, KeyError, TypeError):
+                    # 기록 도중 끊긴 줄 → 그 종목은 다시 조회
+                    continue
+        if self._is_stale(started):
+            print(f"[Checkpoint] {os.path.basename(self.path)}: 장중 시세로 만든 지난 체크포인트 - 처음부터 다시 스캔")
+            self.clear()
+            return {}
+        return finished
+
+    def _is_stale(self, started: Optional[datetime]) -> bool:
+        """
+        이어받으면 안 되는 체크포인트인지 판정
+        - 기준일 장 마감 이후에 시작: 확정 봉 기준이므로 언제든 이어받음
+        - 장 마감 전(장중)에 시작: 지금도 장중이고 마지막 기록이 LIVE_RESUME_TTL 이내일 때만 이어받음
+        """
+        if started is not None and started >= self.final_at:
+            return False
+        now = datetime.now()
+        if now >= self.final_at:
+            return True
+        last_write = datetime.fromtimestamp(os.path.getmtime(self.path))
+        return now - last_write > LIVE_RESUME_TTL
+
+    def record(self, code: str, result: Optional[Dict[str, Any]]) -> None:
+        """종목 하나의 결과를 덧붙여 기록 (호출하는 쪽은 한 스레드)"""
+        self._append({'code': code, 'result': result})
+
+    def record_failure(self, code: str) -> None:
+        """조회 실패 기록 (결과로는 쓰지 않고, 재실행 시 다시 조회)"""
+        self._append({'code': code, 'retry': True})
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = []
+        if not os.path.exists(self.path):
+            lines.append(json.dumps({'started': datetime.now().isoformat(timespec='seconds')}))
+        lines.append(json.dumps(record, ensure_ascii=False, default=_to_json))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def clear(self) -> None:
+        """스캔이 한 바퀴 끝나면 삭제 (다음 실행은 새로 시작)"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
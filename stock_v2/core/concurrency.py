@@ -0,0 +1,154 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+# 계좌 종류별 동시성 범위 (초기값, 최소, 최대)
+# - 모의투자는 초당 한도가 매우 낮아 동시 요청을 늘려도 이득이 없음
+# - 실전투자는 한도가 넉넉하므로 응답 지연이 허용하는 만큼 늘려봄
+MOCK_CONCURRENCY = (1, 1, 3)
+REAL_CONCURRENCY = (4, 1, 16)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD(Additive Increase / Multiplicative Decrease) 방식의 동시 작업 수 제어기
+
+    - 건강한 응답이 '현재 한도만큼' 쌓일 때마다 한도를 +1 (가산 증가)
+    - 한도 초과('초당 전송건수')나 5xx 응답을 받으면 한도를 절반으로 (승산 감소)
+    - TCP 혼잡 제어와 같은 원리로, 서버가 버틸 수 있는 수준 근처에서 자동으로 수렴함
+
+    사용법:
+        controller = AdaptiveConcurrency.for_account(mock=True)
+        client.add_listener(controller.on_request)   # 응답 신호 수집
+        with controller.slot():                      # 작업 1개 실행 권한 획득
+            ...
+
+    학습 포인트:
+    - threading.Condition: '한도에 여유가 생길 때까지' 기다렸다가 깨어나는 동기화 도구
+    - ThreadPoolExecutor의 max_workers는 '최대치'로만 두고, 실제 동시 실행 수는 이 클래스가 조절함
+    """
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 16,
+                 latency_tolerance: float = 2.0, cooldown: float = 1.0):
+        """
+        Args:
+            initial: 시작 동시성
+            min_limit: 최소 동시성
+            max_limit: 최대 동시성 (스레드 풀 크기로도 사용)
+            latency_tolerance: 최저 응답시간 대비 평균 응답시간이 이 배수를 넘으면 증가를 멈춤
+            cooldown: 감소 후 다음 감소까지의 최소 간격(초). 같은 원인으로 연달아 깎이는 것을 방지
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = min(max(int(initial), self.min_limit), self.max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._successes = 0
+        self._last_decrease = 0.0
+
+        # 응답 지연 추적 (지수이동평균 + 관측된 최저값)
+        self._latency_ewma: Optional[float] = None
+        self._latency_min: Optional[float] = None
+
+        # 스캔 종료 후 보고용 통계
+        self.peak_limit = self.limit
+        self.increases = 0
+        self.decreases = 0
+
+    @classmethod
+    def for_account(cls, mock: bool, initial: Optional[int] = None) -> "AdaptiveConcurrency":
+        """
+        계좌 종류에 맞는 범위로 제어기 생성
+
+        Args:
+            mock: 모의투자 여부
+            initial: 시작 동시성 (이전 스캔에서 수렴한 값을 이어받을 때 사용)
+        """
+        start, low, high = MOCK_CONCURRENCY if mock else REAL_CONCURRENCY
+        return cls(initial=initial if initial is not None else start, min_limit=low, max_limit=high)
+
+    def acquire(self) -> None:
+        """현재 한도에 여유가 생길 때까지 기다린 뒤 작업 슬롯 1개를 차지"""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """작업 슬롯 반납"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """with 문으로 acquire/release를 짝지어 주는 컨텍스트 매니저"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_request(self, event: Dict[str, Any]) -> None:
+        """
+        KisClient 리스너: 요청 결과를 보고 한도를 조절
+
+        Args:
+            event: KisClient._send_request가 전달하는 요청 결과 (outcome, latency, wait 등)
+        """
+        outcome = event.get('outcome')
+        if outcome in ('rate_limited', 'server_error'):
+            self._decrease()
+        elif outcome == 'ok':
+            self._record_success(event.get('latency', 0.0), event.get('wait', 0.0))
+
+    def _record_success(self, latency: float, wait: float) -> None:
+        """정상 응답 기록 및 (조건 충족 시) 가산 증가"""
+        with self._cond:
+            if self._latency_min is None or latency < self._latency_min:
+                self._latency_min = latency
+            if self._latency_ewma is None:
+                self._latency_ewma = latency
+            else:
+                self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+
+            # 토큰 버킷에서 기다렸다면 이미 초당 한도가 병목이라는 뜻 → 동시성을 늘려도 빨라지지 않음
+            if wait > 0:
+                self._successes = 0
+                return
+
+            # 응답이 눈에 띄게 느려지고 있다면(서버 혼잡) 늘리지 않음
+            if self._latency_ewma > self._latency_min * self.latency_tolerance:
+                return
+
+            self._successes += 1
+            # 현재 한도만큼 성공이 쌓이면(= 한 '라운드' 동안 문제 없음) +1
+            if self._successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self.increases += 1
+                self.peak_limit = max(self.peak_limit, self.limit)
+                self._successes = 0
+                self._cond.notify()
+
+    def _decrease(self) -> None:
+        """한도 초과/서버 오류 신호에 따라 한도를 절반으로 줄임 (cooldown 내 중복 감소 방지)"""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            new_limit = max(self.min_limit, self.limit // 2)
+            if new_limit < self.limit:
+                self.limit = new_limit
+                self.decreases += 1
+            self._successes = 0
+
+    def summary(self) -> str:
+        """스캔 종료 후 출력할 요약 문자열"""
+        latency = f"{self._latency_ewma * 1000:.0f}ms" if self._latency_ewma is not None else "-"
+        return (f"최종 동시성 {self.limit} (최대 {self.peak_limit}, "
+                f"증가 {self.increases}회/감소 {self.decreases}회, 평균응답 {latency})")
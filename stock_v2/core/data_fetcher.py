@@ -1,19 +1,119 @@
+import asyncio
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Optional, Tuple, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Dict, Any, List
 from stock_v2.api.kis_client import KisClient
 from stock_v2.config import get_kis_config
+from stock_v2.core.bar_store import BarStore, date_to_int, next_day_int, dates_to_index
+from stock_v2.core.trading_calendar import get_calendar
+from stock_v2.tracing import span
+
+# 정규장 시작 시각 (이전에는 당일 봉이 아직 없음)
+MARKET_OPEN_HOUR = 9
+MARKET_OPEN_MINUTE = 0
+
+# 장 마감 후 당일 봉이 '확정'되었다고 보는 시각 (정규장 15:30 마감 + 여유)
+MARKET_CLOSE_HOUR = 15
+MARKET_CLOSE_MINUTE = 40
+
+# 기간별 시세(FHKST03010100) 1회 응답의 최대 봉 수
+CHART_MAX_ROWS = 100
+
+# 응답 필드 → 내부 표준 컬럼 (DataFrame 컬럼 순서도 이 순서)
+CHART_FIELDS = {
+    'stck_clpr': '종가',
+    'stck_oprc': '시가',
+    'stck_hgpr': '고가',
+    'stck_lwpr': '저가',
+    'acml_vol': '거래량',
+    'acml_tr_pbmn': '거래대금',
+}
+INVESTOR_FIELDS = {
+    'prsn_ntby_qty': '개인_순매수',
+    'frgn_ntby_qty': '외국인_순매수',
+    'orgn_ntby_qty': '기관_순매수',
+    'prsn_ntby_tr_pbmn': '개인_순매수금액',
+    'frgn_ntby_tr_pbmn': '외국인_순매수금액',
+    'orgn_ntby_tr_pbmn': '기관_순매수금액',
+}
+# 투자자 순매수 금액 컬럼 (API 단위 백만원 → 원)
+INVESTOR_AMOUNT_COLUMNS = ('개인_순매수금액', '외국인_순매수금액', '기관_순매수금액')
+AMOUNT_UNIT = 1_000_000
+
+
+def _parse_int_column(rows: List[Dict[str, Any]], field: str) -> np.ndarray:
+    """응답 행들의 field 값을 int64 배열로 (빈 값은 0, 소수점이 섞이면 반올림)"""
+    try:
+        return np.fromiter((int(row.get(field) or 0) for row in rows), dtype=np.int64, count=len(rows))
+    except ValueError:
+        values = pd.to_numeric(pd.Series([row.get(field) for row in rows], dtype=object), errors='coerce')
+        return values.fillna(0).round().to_numpy(dtype=np.int64)
+
+
+def _older_page_end(rows: List[Dict[str, Any]], fetch_start: int) -> Optional[str]:
+    """
+    기간별 시세 한 페이지를 받은 뒤, 더 과거를 이어서 요청해야 하면 그 종료일(YYYYMMDD) 반환
+
+    응답은 최신 날짜부터 최대 CHART_MAX_ROWS봉이므로, 꽉 찬 페이지의 가장 오래된 날짜가
+    fetch_start보다 늦으면 그 전날까지를 다시 요청해야 함 (아니면 None)
+    """
+    dates = [int(row['stck_bsop_date']) for row in rows if row.get('stck_bsop_date')]
+    if len(dates) < CHART_MAX_ROWS or min(dates) <= fetch_start:
+        return None
+    day = datetime.strptime(str(min(dates)), "%Y%m%d") - timedelta(days=1)
+    return day.strftime("%Y%m%d")
+
+
+def _decode_rows(rows: List[Dict[str, Any]], fields: Dict[str, str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    KIS 응답 행 → (날짜 int32 YYYYMMDD 배열, 내부 컬럼명 → int64 배열)
+    - 날짜가 빈 행(데이터 없음 표시)은 건너뜀
+    """
+    rows = [row for row in rows if row.get('stck_bsop_date')]
+    dates = np.fromiter((int(row['stck_bsop_date']) for row in rows), dtype=np.int32, count=len(rows))
+    return dates, {column: _parse_int_column(rows, field) for field, column in fields.items()}
 
 class DataFetcher:
-    def __init__(self):
+    def __init__(self, store: Optional[BarStore] = None, use_store: bool = True, allow_stale: bool = False):
+        """
+        Args:
+            store: 로컬 일봉 저장소 (기본값: get_data_dir()/bars)
+            use_store: False면 저장소 없이 매번 API로 전체 구간을 조회 (기존 동작)
+            allow_stale: True면 API 실패 시 요청 종료일에 못 미치는 저장 봉이라도 반환 (오프라인 분석용)
+                반환된 DataFrame의 attrs['stale_through']에 마지막 봉 날짜(YYYYMMDD)를 기록함
+                False(기본)면 오류로 처리해, 지난 봉이 오늘 신호로 분석되지 않게 함
+        """
         config = get_kis_config()
         self.client = KisClient(**config)
+        # 로컬 저장소: 이미 받은 확정 봉은 다시 요청하지 않고, 빠진 날짜만 받아 덧붙임
+        if store is not None:
+            self.store = store
+        else:
+            self.store = BarStore() if use_store else None
+        self.allow_stale = allow_stale
+        # KRX 거래일 달력 (저장소에 쌓인 실제 봉 날짜로 휴장일을 보정)
+        self.calendar = get_calendar(self.store)
+        # 비동기 클라이언트는 처음 필요할 때 생성 (동기 경로만 쓰는 경우 aiohttp 불필요)
+        self._async_client = None
 
-    def get_stock_data(self, ticker: str, days: int = 100, end_date: Optional[datetime] = None, period: str = "D") -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    @property
+    def async_client(self):
         """
-        특정 종목의 차트 데이터와 투자자 동향을 가져와서 DataFrame으로 반환
+        self.client와 토큰/속도 제한기를 공유하는 AsyncKisClient (지연 생성)
+
+        학습 포인트:
+        - @property: 메서드를 속성처럼(괄호 없이) 접근하게 해 주는 데코레이터
+        - import를 함수 안에서 하면, 실제로 비동기 경로를 쓸 때만 aiohttp를 불러옴
         """
-        # 날짜 계산
+        if self._async_client is None:
+            from stock_v2.api.async_kis_client import AsyncKisClient
+            self._async_client = AsyncKisClient.from_client(self.client)
+        return self._async_client
+
+    @staticmethod
+    def _date_range(days: int, end_date: Optional[datetime]) -> Tuple[str, str]:
+        """조회 기간 계산 (YYYYMMDD 시작일, 종료일)"""
         if end_date:
             end_dt = end_date
         else:
@@ -23,6 +123,179 @@ class DataFetcher:
         
         start_str = start_dt.strftime("%Y%m%d")
         end_str = end_dt.strftime("%Y%m%d")
+        return start_str, end_str
+
+    @staticmethod
+    def _last_final_date() -> int:
+        """
+        확정된 마지막 날짜(YYYYMMDD 정수)
+        - 장 마감 전에는 당일 봉이 계속 바뀌므로 전일까지만 확정으로 봄
+        """
+        now = datetime.now()
+        if (now.hour, now.minute) >= (MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE):
+            return date_to_int(now)
+        return date_to_int(now - timedelta(days=1))
+
+    def _plan_fetch(self, ticker: str, start: int, end: int) -> Optional[int]:
+        """
+        저장소 상태를 보고 API로 받아야 할 구간의 시작일을 결정
+
+        Returns:
+            None: 저장소만으로 충분 (API 호출 불필요)
+            int: 이 날짜(YYYYMMDD)부터 end까지 받아야 함
+        """
+        coverage = self.store.coverage(ticker)
+        if coverage is None:
+            return start
+        covered_from, checked_through = coverage
+        if covered_from <= start and end <= checked_through:
+            return None
+        if covered_from <= start <= checked_through:
+            # 앞부분은 이미 있으므로 마지막 확정일 다음 날부터만 받음 (증분 조회)
+            return next_day_int(checked_through)
+        return start
+
+    def _merge_fetched(self, ticker: str, start: int, end: int, fetch_start: Optional[int],
+                       chart_data: Optional[List[Dict[str, Any]]],
+                       investor_data: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        새로 받은 데이터를 저장소에 반영하고, 요청 구간 [start, end]의 DataFrame을 만들어 반환
+        """
+        fresh = None
+        if fetch_start is not None:
+            if chart_data is None or investor_data is None:
+                # 투자자 동향만 실패해도 저장하지 않음: 순매수 금액이 0으로 저장되고 범위가 확정되면
+                # 다음 실행에서 다시 조회하지 않아 0이 실제 값처럼 영구히 남음
+                reason = "차트 데이터 조회 실패" if chart_data is None else "투자자 동향 조회 실패"
+                return self._stored_fallback(ticker, start, end, reason)
+
+            # KIS는 데이터가 없을 때 빈 dict가 담긴 리스트를 주기도 하므로 날짜 있는 행만 사용
+            rows = [row for row in chart_data if row.get('stck_bsop_date')]
+            if rows:
+                with span("fetch.build_frame", ticker=ticker, rows=len(rows)):
+                    fresh = self._build_dataframe(rows, investor_data, "D", fill_missing=False)
+            checked_through = min(end, self._last_final_date())
+            try:
+                with span("fetch.store_write", ticker=ticker):
+                    self.store.upsert(ticker, fresh if fresh is not None else pd.DataFrame(),
+                                      covered_from=fetch_start, checked_through=checked_through)
+            except OSError as e:
+                # 저장 실패는 분석을 막을 이유가 없으므로 경고만 남기고 진행
+                print(f"[Store] {ticker} 저장 실패: {e}")
+
+        with span("fetch.store_read", ticker=ticker):
+            df = self.store.read(ticker, start, end)
+        if fresh is not None:
+            # 저장되지 않은 미확정 봉(장중 당일 등)은 새로 받은 데이터에서 이어 붙임
+            last_stored = date_to_int(df.index[-1]) if df is not None else 0
+            pending = fresh[[date_to_int(d) > last_stored for d in fresh.index]]
+            if not pending.empty:
+                df = pending if df is None else pd.concat([df, pending])
+        if df is None or df.empty:
+            return None, "차트 데이터 조회 실패"
+        return self._finish_frame(df), None
+
+    def _stored_fallback(self, ticker: str, start: int, end: int,
+                         reason: str = "차트 데이터 조회 실패") -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        API 실패(차트 또는 투자자 동향) 시 저장소 데이터로 대체할지 결정
+
+        - 저장 봉이 요청 구간의 마지막 거래일까지 있으면 그대로 사용 (빠진 것은 앞부분뿐)
+        - 마지막 거래일에 못 미치면 지난 데이터이므로 오류 (allow_stale이면 표시를 붙여 반환)
+        """
+        stored = self.store.read(ticker, start, end)
+        if stored is None:
+            return None, reason
+        last_stored = date_to_int(stored.index[-1])
+        if last_stored >= date_to_int(self.calendar.previous_session(end)):
+            return self._finish_frame(stored), None
+        if not self.allow_stale:
+            return None, f"{reason} (저장된 봉은 {last_stored}까지)"
+        print(f"[DataFetcher] {ticker}: API 실패, {last_stored}까지의 저장 봉으로 대체 (요청 종료일 {end})")
+        df = self._finish_frame(stored)
+        df.attrs['stale_through'] = last_stored
+        return df, None
+
+    @staticmethod
+    def _finish_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        저장소에서 읽은 구간에 파생 컬럼을 붙임
+        - 등락률은 기존 경로와 같게 '조회 구간 안에서' 전일 대비로 계산 (첫 봉은 0)
+        """
+        df = df.fillna(0)
+        rate = (df['종가'].pct_change() * 100).fillna(0)
+        # API 경로와 같은 컬럼 순서(가격 컬럼 바로 뒤)에 등락률을 둠
+        loc = df.columns.get_loc('거래대금') + 1 if '거래대금' in df.columns else len(df.columns)
+        df.insert(loc, '등락률', rate)
+        return df
+
+    def _resolve_range(self, days: int, end_date: Optional[datetime], period: str, sessions: Optional[int]) -> Tuple[str, str]:
+        """
+        조회 구간 결정
+        - sessions가 주어지면(일봉) 거래일 달력으로 '정확히 N거래일'을 덮는 구간을 계산
+          (기준일이 휴장일이면 직전 거래일로 맞춰, 주말에 실행해도 같은 구간/캐시 키가 됨)
+        - 아니면 기존처럼 달력일(days) 기준
+        """
+        if sessions is not None and period == "D":
+            if sessions > CHART_MAX_ROWS and self.store is None:
+                # 저장소 경로는 나눠서 요청하지만, 저장소 없이 한 번에 받는 경로는 1회 한도에 걸림
+                print(f"[DataFetcher] 기간별 시세는 1회 최대 {CHART_MAX_ROWS}봉까지만 제공됩니다. (요청: {sessions})")
+            start, end = self.calendar.window(self._last_available_session(end_date), sessions)
+            return start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+        return self._date_range(days, end_date)
+
+    def _last_available_session(self, end_date: Optional[datetime]) -> date:
+        """
+        조회 창의 마지막 거래일 (봉이 존재하는 마지막 날)
+        - 기준일 당일 또는 직전 거래일
+        - 기준일이 오늘이고 장 시작 전이면 당일 봉이 아직 없으므로 그 전 거래일
+          (그대로 두면 모든 종목이 N-1봉만 받아 경고가 쏟아지고, 2거래일 창은 등락률이 0이 됨)
+        """
+        now = datetime.now()
+        day = self.calendar.previous_session(end_date or now)
+        if day == now.date() and (now.hour, now.minute) < (MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE):
+            day = self.calendar.previous_session(day - timedelta(days=1))
+        return day
+
+    @staticmethod
+    def _trim_sessions(ticker: str, df: Optional[pd.DataFrame], sessions: Optional[int]) -> Optional[pd.DataFrame]:
+        """
+        요청한 거래일 수에 맞게 자르고, 부족하면 경고 (짧은 창으로 조용히 분석되는 것을 방지)
+        """
+        if df is None or sessions is None:
+            return df
+        if len(df) < sessions:
+            print(f"[DataFetcher] {ticker}: 요청 {sessions}거래일 중 {len(df)}봉만 수신 (신규상장/거래정지/달력 불일치 가능)")
+            return df
+        return df.iloc[-sessions:]
+
+    def get_stock_data(self, ticker: str, days: int = 100, end_date: Optional[datetime] = None, period: str = "D",
+                       sessions: Optional[int] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        특정 종목의 차트 데이터와 투자자 동향을 가져와서 DataFrame으로 반환
+        - 일봉이고 저장소가 켜져 있으면, 저장소에 없는 날짜만 API로 받아 덧붙임
+
+        Args:
+            days: 조회 기간 (달력일 기준, sessions가 없을 때 사용)
+            sessions: 조회할 거래일 수 (일봉 전용). 주어지면 정확히 이 개수의 봉을 반환
+        """
+        with span("fetch.get_stock_data", ticker=ticker):
+            # 날짜 계산
+            start_str, end_str = self._resolve_range(days, end_date, period, sessions)
+            df, error = self._fetch_range(ticker, start_str, end_str, period)
+            return self._trim_sessions(ticker, df, sessions), error
+
+    def _fetch_range(self, ticker: str, start_str: str, end_str: str, period: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """[start_str, end_str] 구간 조회 (저장소 우선)"""
+        if self.store is not None and period == "D":
+            start, end = int(start_str), int(end_str)
+            fetch_start = self._plan_fetch(ticker, start, end)
+            chart_data = investor_data = None
+            if fetch_start is not None:
+                chart_data = self._get_chart_pages(ticker, fetch_start, end_str)
+                if chart_data is not None:
+                    investor_data = self.client.get_investor_trend(ticker)
+            return self._merge_fetched(ticker, start, end, fetch_start, chart_data, investor_data)
 
         # 1. 차트 데이터 조회
         chart_data = self.client.get_chart_price(ticker, start_str, end_str, period=period)
@@ -33,69 +306,142 @@ class DataFetcher:
         investor_data = None
         if period == "D":
             investor_data = self.client.get_investor_trend(ticker)
-        
-        # 데이터프레임 변환 및 병합
-        df = pd.DataFrame(chart_data)
-        
-        # 컬럼명 매핑 (한투 API -> 내부 표준)
-        df = df.rename(columns={
-            'stck_bsop_date': '날짜',
-            'stck_clpr': '종가',
-            'stck_oprc': '시가',
-            'stck_hgpr': '고가',
-            'stck_lwpr': '저가',
-            'acml_vol': '거래량',
-            'acml_tr_pbmn': '거래대금'
-        })
-        
-        # 숫자형 변환
-        cols = ['종가', '시가', '고가', '저가', '거래량', '거래대금']
-        for col in cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col])
-            
-        # 날짜 인덱스 설정
-        df['날짜'] = pd.to_datetime(df['날짜'])
-        df = df.set_index('날짜').sort_index()
 
-        # 등락률 계산 (API에서 제공하지 않을 경우)
-        if '등락률' not in df.columns:
-            df['등락률'] = df['종가'].pct_change() * 100
-            df['등락률'] = df['등락률'].fillna(0)
+        with span("fetch.build_frame", ticker=ticker, rows=len(chart_data)):
+            return self._build_dataframe(chart_data, investor_data, period), None
+
+    def _get_chart_pages(self, ticker: str, fetch_start: int, end_str: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        [fetch_start, end_str] 일봉 전체 조회 (1회 최대 CHART_MAX_ROWS봉이므로 필요하면 과거 쪽으로 나눠 요청)
+
+        한 페이지라도 실패하면 None (일부만 받은 구간을 '빠짐없이 받음'으로 저장하지 않도록)
+        """
+        rows: List[Dict[str, Any]] = []
+        page_end: Optional[str] = end_str
+        while page_end is not None:
+            page = self.client.get_chart_price(ticker, str(fetch_start), page_end, period="D")
+            if page is None:
+                return None
+            rows.extend(page)
+            page_end = _older_page_end(page, fetch_start)
+        return rows
+
+    async def _get_chart_pages_async(self, ticker: str, fetch_start: int, end_str: str) -> Optional[List[Dict[str, Any]]]:
+        """_get_chart_pages의 asyncio 버전"""
+        rows: List[Dict[str, Any]] = []
+        page_end: Optional[str] = end_str
+        while page_end is not None:
+            page = await self.async_client.get_chart_price(ticker, str(fetch_start), page_end, period="D")
+            if page is None:
+                return None
+            rows.extend(page)
+            page_end = _older_page_end(page, fetch_start)
+        return rows
+
+    async def get_stock_data_async(self, ticker: str, days: int = 100, end_date: Optional[datetime] = None, period: str = "D",
+                                   sessions: Optional[int] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        get_stock_data의 asyncio 버전 (인자/반환 형식 동일)
+
+        학습 포인트:
+        - asyncio.gather로 차트/투자자 요청을 '동시에' 보내 종목당 대기 시간을 줄임
+        """
+        with span("fetch.get_stock_data", ticker=ticker):
+            start_str, end_str = self._resolve_range(days, end_date, period, sessions)
+            df, error = await self._fetch_range_async(ticker, start_str, end_str, period)
+            return self._trim_sessions(ticker, df, sessions), error
+
+    async def _fetch_range_async(self, ticker: str, start_str: str, end_str: str, period: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """_fetch_range의 asyncio 버전"""
+        client = self.async_client
+
+        if self.store is not None and period == "D":
+            start, end = int(start_str), int(end_str)
+            fetch_start = self._plan_fetch(ticker, start, end)
+            chart_data = investor_data = None
+            if fetch_start is not None:
+                chart_data, investor_data = await asyncio.gather(
+                    self._get_chart_pages_async(ticker, fetch_start, end_str),
+                    client.get_investor_trend(ticker),
+                )
+            return self._merge_fetched(ticker, start, end, fetch_start, chart_data, investor_data)
+
+        if period == "D":
+            chart_data, investor_data = await asyncio.gather(
+                client.get_chart_price(ticker, start_str, end_str, period=period),
+                client.get_investor_trend(ticker),
+            )
+        else:
+            chart_data = await client.get_chart_price(ticker, start_str, end_str, period=period)
+            investor_data = None
+
+        if not chart_data:
+            return None, "차트 데이터 조회 실패"
+
+        with span("fetch.build_frame", ticker=ticker, rows=len(chart_data)):
+            return self._build_dataframe(chart_data, investor_data, period), None
+
+    def _build_dataframe(self, chart_data: List[Dict[str, Any]], investor_data: Optional[List[Dict[str, Any]]], period: str = "D",
+                         fill_missing: bool = True) -> pd.DataFrame:
+        """
+        KIS 응답(차트 + 투자자 동향)을 내부 표준 컬럼의 DataFrame으로 변환 및 병합
+
+        - 응답 행(문자열 dict)을 컬럼별로 미리 크기를 정한 정수 배열에 바로 파싱
+          (날짜 int32, 가격/거래량 int64, 투자자 금액은 원 단위 int64)
+        - 투자자 동향은 날짜 이진 탐색으로 차트 날짜에 맞춰 배치하고, DataFrame은 마지막에 한 번만 만듦
+        - 표준 컬럼 외의 응답 필드(문자열)는 싣지 않음
+
+        Args:
+            fill_missing: 투자자 데이터가 없는 날짜를 0으로 채울지 여부
+                (저장소 병합 시에는 NaN으로 남겨, 이미 저장된 값을 0으로 덮어쓰지 않게 함)
+
+        학습 포인트:
+        - pd.DataFrame(행 dict 리스트)는 모든 필드를 object(문자열) 컬럼으로 만든 뒤 다시 변환하므로,
+          필요한 필드만 np.fromiter로 바로 정수 배열에 담는 것이 훨씬 적은 복사와 메모리로 끝남
+        """
+        dates, values = _decode_rows(chart_data, CHART_FIELDS)
+        # API는 최신 날짜부터 주므로 오름차순으로 정렬
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+        data: Dict[str, np.ndarray] = {column: values[column][order] for column in CHART_FIELDS.values()}
+
+        # 등락률 (조회 구간 안에서 전일 대비, 첫 봉은 0)
+        close = data['종가']
+        rate = np.zeros(len(close))
+        if len(close) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rate[1:] = (close[1:] / close[:-1] - 1) * 100
+            rate[~np.isfinite(rate)] = 0
+        data['등락률'] = rate
 
         # 투자자 데이터 병합 (날짜 기준, 일봉일 때만)
         if investor_data and period == "D":
-            df_inv = pd.DataFrame(investor_data)
-            
-            # 컬럼 매핑
-            df_inv = df_inv.rename(columns={
-                'stck_bsop_date': '날짜',
-                'prsn_ntby_qty': '개인_순매수', 
-                'frgn_ntby_qty': '외국인_순매수',
-                'orgn_ntby_qty': '기관_순매수',
-                'prsn_ntby_tr_pbmn': '개인_순매수금액',
-                'frgn_ntby_tr_pbmn': '외국인_순매수금액',
-                'orgn_ntby_tr_pbmn': '기관_순매수금액'
-            })
-            df_inv['날짜'] = pd.to_datetime(df_inv['날짜'])
-            df_inv = df_inv.set_index('날짜')
-            
-            # 필요한 컬럼만 숫자형 변환
-            inv_cols = ['개인_순매수', '외국인_순매수', '기관_순매수', '개인_순매수금액', '외국인_순매수금액', '기관_순매수금액']
-            for col in inv_cols:
-                if col in df_inv.columns:
-                    df_inv[col] = pd.to_numeric(df_inv[col])
-            
-            # 금액 컬럼 단위 보정 (백만원 -> 원)
-            amt_cols = ['개인_순매수금액', '외국인_순매수금액', '기관_순매수금액']
-            for col in amt_cols:
-                if col in df_inv.columns:
-                    df_inv[col] = df_inv[col] * 1000000
-                
-            # 병합
-            df = df.join(df_inv[inv_cols], how='left').fillna(0)
+            inv_dates, inv_values = _decode_rows(investor_data, INVESTOR_FIELDS)
+            # 차트 날짜에서 투자자 날짜의 위치를 찾음 (차트에 없는 날짜는 버림)
+            pos = np.searchsorted(dates, inv_dates)
+            pos_clipped = np.minimum(pos, max(len(dates) - 1, 0))
+            matched = (pos < len(dates)) & (dates[pos_clipped] == inv_dates) if len(dates) else np.zeros(len(inv_dates), dtype=bool)
+            target = pos[matched]
+            covered = np.zeros(len(dates), dtype=bool)
+            covered[target] = True
+            complete = fill_missing or covered.all()
+            for column in INVESTOR_FIELDS.values():
+                column_values = inv_values[column][matched]
+                if column in INVESTOR_AMOUNT_COLUMNS:
+                    # 금액 컬럼 단위 보정 (백만원 -> 원)
+                    column_values = column_values * AMOUNT_UNIT
+                if complete:
+                    out = np.zeros(len(dates), dtype=np.int64)
+                else:
+                    out = np.full(len(dates), np.nan)
+                out[target] = column_values
+                data[column] = out
 
-        return df, None
+        return pd.DataFrame(data, index=dates_to_index(dates))
 
     def get_current_price(self, ticker: str) -> Optional[Dict[str, Any]]:
         return self.client.get_current_price(ticker)
+
+    def get_quotes(self, tickers: List[str]) -> pd.DataFrame:
+        """여러 종목의 현재가 스냅샷 (30종목 단위 묶음 조회, KisClient.get_quotes 참고)"""
+        return self.client.get_quotes(tickers)
@@ -1,20 +1,503 @@
+import json
+import math
+import os
+import threading
+from collections import deque, OrderedDict
+from typing import Dict, Any, Optional, Iterable, Tuple, Callable, List, Set
+
+import numpy as np
 import pandas as pd
 
+from stock_v2.config import get_data_dir
+from stock_v2.core.bar_store import date_to_int
+
+# 이동평균 기간 / MACD (단기, 장기, 시그널) 기간
+MA_WINDOWS = (5, 20, 60)
+MACD_SPANS = (12, 26, 9)
+
+INDICATOR_STATE_FILE = "indicator_state.json"
+
+
+class IndicatorNode:
+    """
+    지표 그래프의 노드 하나
+
+    - inputs: 입력 이름 (원본 컬럼 '종가' 또는 다른 지표 이름)
+    - func: 입력 Series들을 받아 결과 Series를 돌려주는 함수
+    - kind/param: 증분 엔진이 상태를 만들 때 쓰는 정보 (예: kind='ma', param=20)
+    """
+
+    def __init__(self, name: str, inputs: Tuple[str, ...], func: Callable[..., pd.Series],
+                 kind: str = 'derived', param: Optional[int] = None):
+        self.name = name
+        self.inputs = inputs
+        self.func = func
+        self.kind = kind
+        self.param = param
+
+
+# 등록된 지표 (이름 → 노드)
+INDICATORS: Dict[str, IndicatorNode] = {}
+
+
+def register_indicator(name: str, inputs: Tuple[str, ...], kind: str = 'derived', param: Optional[int] = None):
+    """
+    지표 등록 데코레이터
+
+    사용법:
+        @register_indicator('MA120', ('종가',), kind='ma', param=120)
+        def _ma120(close):
+            return close.rolling(window=120).mean()
+    """
+    def decorator(func: Callable[..., pd.Series]) -> Callable[..., pd.Series]:
+        INDICATORS[name] = IndicatorNode(name, tuple(inputs), func, kind, param)
+        return func
+    return decorator
+
+
+def _register_ma(window: int) -> None:
+    register_indicator(f"MA{window}", ('종가',), kind='ma', param=window)(
+        lambda close: close.rolling(window=window).mean())
+
+
+def _register_ema(span: int) -> None:
+    register_indicator(f"EMA{span}", ('종가',), kind='ema', param=span)(
+        lambda close: close.ewm(span=span, adjust=False).mean())
+
+
+for _window in MA_WINDOWS:
+    _register_ma(_window)
+for _span in MACD_SPANS[:2]:
+    _register_ema(_span)
+
+
+@register_indicator('MACD', ('EMA12', 'EMA26'))
+def _macd(ema12: pd.Series, ema26: pd.Series) -> pd.Series:
+    return ema12 - ema26
+
+
+@register_indicator('Signal', ('MACD',), kind='signal', param=MACD_SPANS[2])
+def _signal(macd: pd.Series) -> pd.Series:
+    return macd.ewm(span=MACD_SPANS[2], adjust=False).mean()
+
+
+@register_indicator('MACD_Oscillator', ('MACD', 'Signal'))
+def _macd_oscillator(macd: pd.Series, signal: pd.Series) -> pd.Series:
+    return macd - signal
+
+
+# calculate_indicators가 기본으로 붙이는 지표
+DEFAULT_INDICATORS = ('MA5', 'MA20', 'MA60', 'MACD', 'Signal', 'MACD_Oscillator')
+
+
+def resolve_indicators(names: Iterable[str]) -> List[IndicatorNode]:
+    """
+    요청한 지표와 그 입력 지표들을 계산 순서(위상 정렬)대로 반환
+
+    예: ['MACD_Oscillator'] → [EMA12, EMA26, MACD, Signal, MACD_Oscillator]
+    """
+    order: List[IndicatorNode] = []
+    visited: Set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        node = INDICATORS.get(name)
+        if node is None:
+            raise ValueError(f"등록되지 않은 지표입니다: {name}")
+        visited.add(name)
+        for source in node.inputs:
+            # 등록된 지표가 아닌 입력은 원본 컬럼(종가 등)
+            if source in INDICATORS:
+                visit(source)
+        order.append(node)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+class IndicatorCache:
+    """
+    종목/구간별 지표 계산 결과 캐시 (같은 데이터로 여러 번 분석할 때 재계산 방지)
+
+    키: (종목코드, 봉 수, 첫 날짜, 마지막 날짜, 마지막 종가)
+    - 마지막 종가를 키에 넣어, 장중 재조회로 당일 봉이 바뀌면 자동으로 새로 계산됨
+    - 오래된 항목부터 버리는 LRU 방식으로 최대 max_entries 구간만 보관
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Dict[str, pd.Series]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(ticker: str, df: pd.DataFrame) -> Tuple:
+        return (ticker, len(df), df.index[0], df.index[-1], float(df['종가'].iloc[-1]))
+
+    def get(self, key: Tuple) -> Dict[str, pd.Series]:
+        """캐시된 지표 dict (없으면 새로 만든 빈 dict를 등록해서 반환)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = {}
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+
+def indicator_series(df: pd.DataFrame, names: Iterable[str], cache: Optional[IndicatorCache] = None,
+                     ticker: Optional[str] = None) -> Dict[str, pd.Series]:
+    """
+    요청한 지표(필요한 입력 지표 포함)를 계산해 이름 → Series로 반환 (df는 바꾸지 않음)
+
+    Args:
+        df: 일봉 DataFrame ('종가' 컬럼 필요)
+        names: 필요한 지표 이름 (예: StockStrategy.REQUIRED_INDICATORS)
+        cache: 지표 캐시 (ticker와 함께 주면 같은 구간은 다시 계산하지 않음)
+        ticker: 종목 코드 (캐시 키)
+
+    학습 포인트:
+    - EMA12/EMA26 같은 중간 결과는 그래프의 노드로 한 번만 계산되고,
+      MACD/Signal/MACD_Oscillator가 공유함
+    """
+    values: Dict[str, pd.Series] = {}
+    if cache is not None and ticker is not None and not df.empty:
+        values = cache.get(IndicatorCache.key(ticker, df))
+
+    for node in resolve_indicators(names):
+        if node.name in values:
+            continue
+        args = [values[source] if source in INDICATORS else df[source] for source in node.inputs]
+        values[node.name] = node.func(*args)
+    return values
+
+
+def compute_indicators(df: pd.DataFrame, names: Iterable[str], cache: Optional[IndicatorCache] = None,
+                       ticker: Optional[str] = None) -> pd.DataFrame:
+    """
+    요청한 지표만(필요한 입력 지표 포함) 계산하여 df에 컬럼으로 추가 (인자는 indicator_series와 같음)
+    """
+    names = list(names)
+    values = indicator_series(df, names, cache, ticker)
+    for name in names:
+        df[name] = values[name]
+    return df
+
+
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     이동평균선 및 보조지표(MACD) 계산
+    - 기본 지표 전체(DEFAULT_INDICATORS)를 계산. 일부만 필요하면 compute_indicators 사용
     """
-    # 이동평균선 계산
-    df['MA5'] = df['종가'].rolling(window=5).mean()
-    df['MA20'] = df['종가'].rolling(window=20).mean()
-    df['MA60'] = df['종가'].rolling(window=60).mean()
-
-    # MACD 계산 (12, 26, 9)
-    ema12 = df['종가'].ewm(span=12, adjust=False).mean()
-    ema26 = df['종가'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = ema12 - ema26
-    df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    df['MACD_Oscillator'] = df['MACD'] - df['Signal']
-    
-    return df
+    return compute_indicators(df, DEFAULT_INDICATORS)
+
+
+def _ema_step(prev: Optional[float], value: float, span: int) -> float:
+    """ewm(span, adjust=False)의 한 단계: 첫 값은 그대로, 이후는 α*x + (1-α)*직전값"""
+    if prev is None:
+        return value
+    alpha = 2.0 / (span + 1)
+    return alpha * value + (1 - alpha) * prev
+
+
+class IndicatorState:
+    """
+    종목 하나의 증분 지표 상태
+
+    - closes: 최근 종가 (가장 긴 이동평균 + 1개까지만 보관 → 마지막 봉 교체 시 밀려난 값 복원용)
+    - sums: 이동평균 기간별 최근 종가 합계 (새 봉마다 더하고 빠지는 값만 빼는 O(1) 갱신)
+    - ema: 마지막 봉까지 반영한 EMA12/EMA26/Signal (MACD 계열이 필요할 때만)
+    - prev_ema: 마지막 봉 '직전'까지의 EMA 값 (장중 갱신으로 마지막 봉이 바뀌면 여기서 다시 계산)
+    """
+
+    def __init__(self, windows: Iterable[int] = MA_WINDOWS, track_macd: bool = True):
+        """
+        Args:
+            windows: 유지할 이동평균 기간
+            track_macd: EMA12/EMA26/Signal 상태 유지 여부
+        """
+        self.windows = tuple(sorted(set(windows)))
+        self.track_macd = track_macd
+        self.date: Optional[int] = None
+        self.count = 0
+        self.closes: deque = deque(maxlen=max(self.windows, default=0) + 1)
+        self.sums: Dict[int, float] = {w: 0.0 for w in self.windows}
+        self.ema: Tuple[Optional[float], Optional[float], Optional[float]] = (None, None, None)
+        self.prev_ema: Tuple[Optional[float], Optional[float], Optional[float]] = (None, None, None)
+
+    @staticmethod
+    def _advance(ema: Tuple[Optional[float], Optional[float], Optional[float]], close: float):
+        fast_span, slow_span, signal_span = MACD_SPANS
+        fast = _ema_step(ema[0], close, fast_span)
+        slow = _ema_step(ema[1], close, slow_span)
+        signal = _ema_step(ema[2], fast - slow, signal_span)
+        return fast, slow, signal
+
+    def append(self, date: int, close: float) -> None:
+        """새 봉 추가 - O(1)"""
+        close = float(close)
+        self.closes.append(close)
+        self.count += 1
+        for w in self.windows:
+            self.sums[w] += close
+            if len(self.closes) > w:
+                # 창에서 빠지는 값 (closes[-w-1])을 뺌
+                self.sums[w] -= self.closes[-w - 1]
+        if self.track_macd:
+            self.prev_ema = self.ema
+            self.ema = self._advance(self.ema, close)
+        self.date = date
+
+    def replace_last(self, close: float) -> None:
+        """마지막 봉의 종가 교체 (장중 재조회 / 당일 봉 확정) - O(1)"""
+        close = float(close)
+        old = self.closes[-1]
+        self.closes[-1] = close
+        for w in self.windows:
+            self.sums[w] += close - old
+        if self.track_macd:
+            self.ema = self._advance(self.prev_ema, close)
+
+    def values(self) -> Dict[str, float]:
+        """현재 지표 값 (기간이 모자란 이동평균은 NaN, calculate_indicators의 마지막 행과 같은 이름)"""
+        result = {}
+        for w in self.windows:
+            result[f"MA{w}"] = self.sums[w] / w if self.count >= w else math.nan
+        if self.track_macd:
+            fast, slow, signal = self.ema
+            if fast is None:
+                result.update(EMA12=math.nan, EMA26=math.nan, MACD=math.nan, Signal=math.nan, MACD_Oscillator=math.nan)
+            else:
+                macd = fast - slow
+                result.update(EMA12=fast, EMA26=slow, MACD=macd, Signal=signal, MACD_Oscillator=macd - signal)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'date': self.date,
+            'count': self.count,
+            'closes': list(self.closes),
+            'ema': list(self.ema),
+            'prev_ema': list(self.prev_ema),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], windows: Iterable[int] = MA_WINDOWS,
+                  track_macd: bool = True) -> Optional["IndicatorState"]:
+        """
+        저장된 상태 복원 (지금 필요한 지표를 이어서 계산할 수 없는 상태면 None)
+
+        예: MA20만 쓰던 때 저장한 상태(종가 21개)로는 MA60을 이어갈 수 없으므로 다시 쌓아야 함
+        """
+        state = cls(windows, track_macd)
+        state.date = data['date']
+        state.count = int(data['count'])
+        closes = [float(c) for c in data['closes']]
+        if len(closes) < min(state.count, state.closes.maxlen):
+            return None
+        if track_macd and state.count > 0 and data['ema'][0] is None:
+            return None
+        state.closes.extend(closes)
+        # 합계는 저장하지 않고 종가에서 다시 계산 (누적 오차도 함께 초기화됨)
+        closes = list(state.closes)
+        for w in state.windows:
+            state.sums[w] = float(sum(closes[-w:]))
+        state.ema = tuple(data['ema'])
+        state.prev_ema = tuple(data['prev_ema'])
+        return state
+
+
+class IndicatorEngine:
+    """
+    종목별 상태를 유지하며 이동평균과 MACD 계열 지표를 증분 계산하는 엔진
+
+    - 요청한 지표(indicators)와 그 입력만 상태로 유지 (예: MA20만 필요하면 EMA 상태는 만들지 않음)
+    - 증분 계산을 지원하지 않는 지표(이동평균/EMA12·26/MACD 계열 외, 예: RSI)는 종목마다
+      지표 그래프(indicator_series)로 전체 구간을 계산하고, 결과는 공유 IndicatorCache에 보관
+      (같은 구간을 다시 분석하면 재계산 없음)
+    - 새 봉이 들어오면 종목당 O(1)로 갱신 (전체 이력 재계산 없음)
+    - 같은 날짜의 봉이 다시 들어오면(장중 재조회) 마지막 봉만 교체
+    - save()/load()로 실행 사이에 상태를 보존하므로, 매일 재스캔해도 새로 생긴 봉만 반영하면 됨
+
+    사용법:
+        engine = IndicatorEngine.load(indicators=('MA20', 'MACD'))
+        values = engine.update_frame("005930", df)   # {'MA20': ..., 'MACD': ...}
+        engine.save()
+
+    학습 포인트:
+    - 이동합(rolling sum): 창에 들어오는 값은 더하고 나가는 값은 빼면 창 길이와 무관하게 O(1)
+    - EMA는 직전 값 하나만 있으면 다음 값을 구할 수 있는 점화식이라 상태가 매우 작음
+    """
+
+    def __init__(self, path: Optional[str] = None, indicators: Iterable[str] = DEFAULT_INDICATORS,
+                 cache: Optional[IndicatorCache] = None):
+        """
+        Args:
+            path: 상태 파일 경로 (기본값: get_data_dir()/indicator_state.json)
+            indicators: 계산할 지표 이름 (등록된 지표 중 이동평균/MACD 계열은 증분, 나머지는 전체 구간 계산)
+            cache: 증분 계산이 안 되는 지표의 계산 결과 캐시 (기본값: 엔진 전용 캐시)
+        """
+        self.path = path or os.path.join(get_data_dir(), INDICATOR_STATE_FILE)
+        self.indicators = tuple(indicators)
+        self.windows: Tuple[int, ...] = ()
+        self.track_macd = False
+        # 요청한 지표 중 증분 상태로 계산할 수 없는 것 (indicator_series로 계산)
+        self.batch_indicators: Tuple[str, ...] = ()
+        for name in self.indicators:
+            if not self._is_incremental(name):
+                self.batch_indicators += (name,)
+        # 증분 지표와 그 입력만 상태로 유지
+        for node in resolve_indicators(n for n in self.indicators if n not in self.batch_indicators):
+            if node.kind == 'ma':
+                self.windows += (node.param,)
+            else:
+                self.track_macd = True
+        self.cache = cache or IndicatorCache()
+        self.states: Dict[str, IndicatorState] = {}
+
+    @staticmethod
+    def _is_incremental(name: str) -> bool:
+        """IndicatorState로 이어서 계산할 수 있는 지표인지 (등록되지 않은 이름이면 ValueError)"""
+        node = resolve_indicators([name])[-1]
+        if node.kind == 'ma':
+            return True
+        if node.kind == 'ema':
+            return node.param in MACD_SPANS[:2]
+        return node.name in ('MACD', 'Signal', 'MACD_Oscillator')
+
+    def _new_state(self) -> IndicatorState:
+        return IndicatorState(self.windows, self.track_macd)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, indicators: Iterable[str] = DEFAULT_INDICATORS,
+             cache: Optional[IndicatorCache] = None) -> "IndicatorEngine":
+        """저장된 상태로 엔진 생성 (파일이 없거나 깨졌으면 빈 엔진)"""
+        engine = cls(path, indicators, cache)
+        if not os.path.exists(engine.path):
+            return engine
+        try:
+            with open(engine.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            for ticker, data in raw.items():
+                state = IndicatorState.from_dict(data, engine.windows, engine.track_macd)
+                # 이어서 계산할 수 없는 상태는 버리고, 다음 update_frame에서 다시 쌓음
+                if state is not None:
+                    engine.states[ticker] = state
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 상태는 언제든 일봉에서 다시 만들 수 있으므로 버리고 새로 시작
+            print(f"[Indicators] 상태 파일 로드 실패, 새로 계산합니다: {e}")
+            engine.states = {}
+        return engine
+
+    def save(self) -> None:
+        """상태 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({ticker: state.to_dict() for ticker, state in self.states.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def update(self, ticker: str, date: int, close: float) -> Dict[str, float]:
+        """
+        봉 하나 반영 후 현재 지표 값 반환
+
+        Args:
+            date: 봉 날짜 (YYYYMMDD 정수). 마지막 봉과 같으면 교체, 더 늦으면 추가
+        """
+        state = self.states.get(ticker)
+        if state is None:
+            state = self.states[ticker] = self._new_state()
+        if state.date is not None and date == state.date:
+            state.replace_last(close)
+        elif state.date is None or date > state.date:
+            state.append(date, close)
+        else:
+            raise ValueError(f"{ticker}: {date}는 마지막 반영 봉({state.date})보다 과거입니다.")
+        return self._pick(state.values())
+
+    def update_frame(self, ticker: str, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        일봉 DataFrame(날짜 오름차순)에서 아직 반영하지 않은 봉만 반영하고 마지막 봉 기준 지표 반환
+
+        - 상태의 마지막 날짜가 df 안에 있으면: 그 봉(재조회로 바뀌었을 수 있음) 교체 + 이후 봉만 추가
+        - 상태가 없거나 df와 이어지지 않으면: df 전체로 새로 쌓음 (최초 1회 O(n))
+        - 상태가 보관한 과거 종가가 df와 다르면(액면분할 등 수정주가 반영): df 전체로 새로 쌓음
+        - df가 상태보다 과거 구간이면(과거 기준일 스캔): 저장된 상태는 건드리지 않고 df만으로 계산
+        - 증분 계산이 안 되는 지표(batch_indicators)는 df 전체로 계산 (캐시에 있으면 재사용)
+        """
+        if df is None or df.empty:
+            return self._pick(self._new_state().values())
+        dates = [date_to_int(d) for d in df.index]
+        closes = df['종가'].to_numpy(dtype=float)
+        batch = self._batch_values(ticker, df)
+
+        state = self.states.get(ticker)
+        if state is not None and state.date is not None:
+            if dates[-1] < state.date:
+                return self._pick(self._compute(dates, closes).values(), batch)
+            if state.date in dates and self._history_matches(state, closes, dates.index(state.date)):
+                start = dates.index(state.date)
+                state.replace_last(closes[start])
+                for date, close in zip(dates[start + 1:], closes[start + 1:]):
+                    state.append(date, close)
+                return self._pick(state.values(), batch)
+
+        state = self._compute(dates, closes)
+        self.states[ticker] = state
+        return self._pick(state.values(), batch)
+
+    @staticmethod
+    def _history_matches(state: IndicatorState, closes: np.ndarray, start: int) -> bool:
+        """
+        상태가 보관한 종가(마지막 봉 제외)와 df의 같은 구간 종가가 일치하는지 확인
+
+        마지막 봉은 장중 재조회로 바뀌는 것이 정상이므로 비교하지 않음.
+        그 이전 종가가 다르면 과거 가격이 수정된 것이므로, 이어서 계산하면 이동평균/EMA에
+        수정 전후 가격이 섞임
+        """
+        retained = list(state.closes)[:-1]
+        overlap = min(len(retained), start)
+        if overlap == 0:
+            return True
+        return bool(np.allclose(retained[-overlap:], closes[start - overlap:start], rtol=1e-9, atol=0.0))
+
+    def _batch_values(self, ticker: str, df: pd.DataFrame) -> Dict[str, float]:
+        """증분 계산이 안 되는 지표의 마지막 봉 값 (지표 그래프로 df 전체 계산)"""
+        if not self.batch_indicators:
+            return {}
+        series = indicator_series(df, self.batch_indicators, self.cache, ticker)
+        return {name: float(series[name].iloc[-1]) for name in self.batch_indicators}
+
+    def _pick(self, values: Dict[str, float], batch: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        상태 값 중 요청한 지표만 반환
+
+        batch에 없는 비증분 지표(봉 하나만 반영하는 update 등 전체 구간이 없는 경우)는 NaN
+        """
+        batch = batch or {}
+        return {
+            name: batch.get(name, math.nan) if name in self.batch_indicators else values[name]
+            for name in self.indicators
+        }
+
+    def _compute(self, dates: Iterable[int], closes: Iterable[float]) -> IndicatorState:
+        state = self._new_state()
+        for date, close in zip(dates, closes):
+            state.append(date, close)
+        return state
+
+    def values(self, ticker: str) -> Optional[Dict[str, float]]:
+        """저장된 상태 기준 지표 값 (상태가 없으면 None)"""
+        state = self.states.get(ticker)
+        return self._pick(state.values()) if state is not None else None
 
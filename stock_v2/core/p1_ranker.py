@@ -0,0 +1,134 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+
+from stock_v2.core.concurrency import AdaptiveConcurrency
+
+# KRX 일일 가격제한폭 (±30%)
+# 등락률은 % 단위이므로, 한 종목이 낼 수 있는 최대 기여도는 cap * 30
+PRICE_LIMIT_RATE = 30.0
+
+# P1은 지수 기여도 상위 5종목만 선정
+P1_TOP_K = 5
+
+
+class P1Ranker:
+    """
+    P1(지수 기여도 = 시가총액 * 등락률) 상위 k종목을 분기 한정(branch-and-bound)으로 찾는 랭커
+
+    동작:
+    1. 시가총액 내림차순으로 종목을 방문하며 기여도를 계산
+    2. 지금까지의 상위 k개를 최소 힙으로 유지 (힙의 맨 위 = 현재 k등 기여도)
+    3. 다음 종목의 상한(cap * 30)이 k등 기여도 이하이면, 그 뒤 종목들은 시총이 더 작으므로
+       어떤 등락률이 나와도 상위 k에 들 수 없음 → 더 조회하지 않고 종료
+
+    보통 대형주 몇 개의 기여도가 k등 기준을 높여 두므로, 전체 유니버스의 일부만 조회하고 끝남
+
+    학습 포인트:
+    - heapq는 최소 힙이므로, '상위 k개' 유지에 쓰면 가장 작은 값(탈락 후보)을 O(1)에 확인하고
+      O(log k)에 교체할 수 있음
+    - 정렬 + 상한(bound)으로 탐색을 잘라내는 것이 분기 한정법의 핵심
+    """
+
+    def __init__(self, k: int = P1_TOP_K, price_limit: float = PRICE_LIMIT_RATE):
+        """
+        Args:
+            k: 선정할 종목 수
+            price_limit: 일일 가격제한폭(%) - 상한 계산에 사용
+        """
+        self.k = k
+        self.price_limit = price_limit
+        # 직전 rank() 결과 통계 (로그/UI 표시용)
+        self.last_stats: Dict[str, Any] = {}
+
+    def rank(self, candidates: pd.DataFrame, evaluate: Callable[[pd.Series], Optional[Dict[str, Any]]],
+             max_workers: int = 1, controller: Optional[AdaptiveConcurrency] = None,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
+        """
+        상위 k종목 탐색
+
+        Args:
+            candidates: code, name, cap 컬럼을 가진 종목 리스트
+            evaluate: 종목 행(row)을 받아 'contribution' 키를 포함한 결과 dict를 반환하는 함수
+                (조회 실패 시 None). 여러 스레드에서 동시에 호출될 수 있음
+            max_workers: 동시에 조회할 최대 종목 수
+            controller: 적응형 동시성 제어기. 주어지면 각 조회를 slot() 안에서 실행하고,
+                동시에 띄워 두는 조회 수도 제어기의 현재 한도로 맞춤
+            progress_callback: (조회 완료 수, 전체 종목 수)를 받는 진행률 콜백
+
+        Returns:
+            기여도 내림차순 상위 k개 결과 (기여도가 양수인 종목만)
+
+        참고:
+        - 동시에 여러 종목을 조회하므로, 상한에 걸리는 순간 이미 출발한 조회 몇 건은 버려질 수 있음
+          (결과의 정확성에는 영향 없음)
+        """
+        ordered = candidates.sort_values(by='cap', ascending=False)
+        rows = [row for _, row in ordered.iterrows()]
+        total = len(rows)
+
+        # (기여도, 방문 순서, 결과) 최소 힙. 방문 순서는 기여도가 같을 때 dict 비교를 피하기 위함
+        heap: List[Tuple[float, int, Dict[str, Any]]] = []
+
+        def bound_reached(cap: float) -> bool:
+            return len(heap) >= self.k and cap * self.price_limit <= heap[0][0]
+
+        def run(row: pd.Series) -> Optional[Dict[str, Any]]:
+            if controller is None:
+                return evaluate(row)
+            with controller.slot():
+                return evaluate(row)
+
+        def window() -> int:
+            if controller is None:
+                return max_workers
+            return max(1, min(max_workers, controller.limit))
+
+        visited = 0
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            pending: Dict[Any, int] = {}
+            while True:
+                # 상한에 걸리지 않는 동안, 시총 순서대로 동시 조회 창을 채움
+                while visited < total and len(pending) < window():
+                    cap = float(rows[visited].get('cap', 0))
+                    if bound_reached(cap):
+                        # 힙은 커지기만 하므로 한 번 걸린 상한은 이후에도 계속 유지됨
+                        break
+                    pending[executor.submit(run, rows[visited])] = visited
+                    visited += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    order = pending.pop(future)
+                    completed += 1
+                    result = future.result()
+                    if progress_callback:
+                        progress_callback(completed, total)
+                    if not result or result.get('contribution', 0) <= 0:
+                        continue
+                    item = (float(result['contribution']), -order, result)
+                    if len(heap) < self.k:
+                        heapq.heappush(heap, item)
+                    elif item[0] > heap[0][0]:
+                        heapq.heapreplace(heap, item)
+
+        leaders = [result for _, _, result in sorted(heap, reverse=True)]
+        self.last_stats = {
+            'total': total,
+            'visited': visited,
+            'pruned': total - visited,
+            'kth_contribution': heap[0][0] if len(heap) >= self.k else None,
+        }
+        return leaders
+
+    def summary(self) -> str:
+        """직전 탐색 결과 요약 문자열"""
+        s = self.last_stats
+        if not s:
+            return "P1 탐색 미실행"
+        return f"P1 분기한정: {s['total']}종목 중 {s['visited']}종목 조회 ({s['pruned']}종목 생략)"
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Sequence
+
+from stock_v2.core.strategy import StrategyParams, DEFAULT_PARAMS
+
+# 패널에 싣는 컬럼 (get_stock_data 결과의 컬럼명 그대로)
+PANEL_COLUMNS = ('종가', '시가', '등락률', '외국인_순매수금액', '기관_순매수금액', '개인_순매수금액')
+
+# StockStrategy.analyze와 같은 판정 기준 (조정 가능한 기준값은 StrategyParams)
+P3_MIN_ROWS = 20           # P3 판정에 필요한 최소 봉 수 (MA20)
+MA_WINDOW = 20             # 이격도 기준 이동평균
+
+
+def trailing_run(mask: np.ndarray) -> np.ndarray:
+    """
+    각 행(종목)의 '마지막 칸부터 연속으로 True인 칸 수'
+
+    예: [F, T, F, T, T] → 2
+
+    학습 포인트:
+    - 뒤집은 배열에서 첫 False의 위치(argmax)가 곧 연속 길이
+    - 모두 True인 행은 argmax가 0을 돌려주므로 따로 처리해야 함
+    """
+    if mask.shape[1] == 0:
+        return np.zeros(mask.shape[0], dtype=np.int64)
+    broken = ~mask[:, ::-1]
+    return np.where(broken.any(axis=1), broken.argmax(axis=1), mask.shape[1]).astype(np.int64)
+
+
+class Panel:
+    """
+    여러 종목의 일봉을 '종목 × 일' 2차원 NumPy 배열로 모은 패널
+
+    - 종목마다 상장일/거래정지로 봉 수가 다르므로, 마지막 봉을 기준으로 오른쪽 정렬하고
+      앞쪽 빈 칸은 NaN으로 채움 (종목별 DataFrame을 뒤에서부터 읽던 기존 로직과 같은 기준)
+    - lengths: 종목별 실제 봉 수
+    - present: 종목별 컬럼 존재 여부 (투자자 데이터가 없는 종목 구분용)
+
+    학습 포인트:
+    - 종목별 파이썬 루프 대신 배열 연산 한 번으로 모든 종목을 계산하면,
+      실제 계산은 NumPy의 C 코드에서 GIL 없이 수행되어 조회 스레드를 막지 않음
+    """
+
+    def __init__(self, tickers: List[str], data: Dict[str, np.ndarray], lengths: np.ndarray,
+                 present: Dict[str, np.ndarray]):
+        self.tickers = tickers
+        self.data = data
+        self.lengths = lengths
+        self.present = present
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], columns: Sequence[str] = PANEL_COLUMNS) -> "Panel":
+        """
+        종목별 DataFrame({종목코드: df})으로 패널 생성
+
+        Args:
+            frames: get_stock_data 결과 DataFrame 모음 (날짜 오름차순)
+            columns: 패널에 실을 컬럼
+        """
+        tickers = list(frames.keys())
+        lengths = np.array([len(frames[t]) for t in tickers], dtype=np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        data: Dict[str, np.ndarray] = {}
+        present: Dict[str, np.ndarray] = {}
+        for column in columns:
+            values = np.full((len(tickers), width), np.nan)
+            has = np.zeros(len(tickers), dtype=bool)
+            for i, ticker in enumerate(tickers):
+                df = frames[ticker]
+                if column in df.columns and len(df):
+                    values[i, width - len(df):] = df[column].to_numpy(dtype=np.float64)
+                    has[i] = True
+            data[column] = values
+            present[column] = has
+        return cls(tickers, data, lengths, present)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def column(self, name: str) -> np.ndarray:
+        """종목 × 일 배열 (없는 컬럼은 NaN 배열)"""
+        if name in self.data:
+            return self.data[name]
+        width = int(self.lengths.max()) if len(self.lengths) else 0
+        return np.full((len(self.tickers), width), np.nan)
+
+    def last(self, name: str) -> np.ndarray:
+        """종목별 마지막 봉 값 (봉이 없으면 NaN)"""
+        values = self.column(name)
+        if values.shape[1] == 0:
+            return np.full(len(self.tickers), np.nan)
+        return values[:, -1]
+
+    def has(self, name: str) -> np.ndarray:
+        """종목별 컬럼 존재 여부"""
+        return self.present.get(name, np.zeros(len(self.tickers), dtype=bool))
+
+    def moving_average(self, name: str, window: int) -> np.ndarray:
+        """종목별 마지막 봉 기준 window일 단순 이동평균 (봉이 부족하면 NaN)"""
+        values = self.column(name)
+        if values.shape[1] < window:
+            return np.full(len(self.tickers), np.nan)
+        # 봉이 부족한 종목은 창 안에 NaN이 섞이므로 결과도 NaN (rolling(window).mean()과 같음)
+        return values[:, -window:].mean(axis=1)
+
+
+def evaluate_panel(panel: Panel, caps: Sequence[float], ma20: Optional[Sequence[float]] = None,
+                   params: Optional[StrategyParams] = None) -> Dict[str, np.ndarray]:
+    """
+    패널 전체에 P1/P2/P3 조건을 한 번에 계산
+
+    Args:
+        panel: 종목 × 일 패널
+        caps: panel.tickers 순서의 시가총액(원)
+        ma20: 이미 계산된 종목별 20일 이동평균 (IndicatorEngine 등). 없으면 패널에서 계산
+        params: 판정 기준값 (기본값: DEFAULT_PARAMS)
+
+    Returns:
+        지표 이름 → 종목별 배열 dict
+        (contribution, is_p1, consecutive_days, is_p2, consecutive_personal_sell_days,
+         disparity, is_p3, score, priority, enough_data)
+    """
+    params = params or DEFAULT_PARAMS
+    caps = np.asarray(caps, dtype=np.float64)
+    enough = panel.lengths >= params.min_rows
+
+    # P1: 지수 기여도 = 시가총액 * 등락률 (양수일 때만 인정)
+    contribution = caps * np.nan_to_num(panel.last('등락률'), nan=0.0)
+    is_p1 = contribution > 0
+    contribution = np.where(is_p1, contribution, 0.0)
+
+    # P2: 외국인 연속 순매수 일수 (NaN 비교는 False이므로 앞쪽 빈 칸에서 자연히 끊김)
+    has_foreign = panel.has('외국인_순매수금액')
+    foreign_run = np.where(has_foreign, trailing_run(panel.column('외국인_순매수금액') > 0), 0)
+    is_p2 = foreign_run > 0
+
+    # 개인 연속 순매도 일수
+    personal_run = np.where(panel.has('개인_순매수금액'),
+                            trailing_run(panel.column('개인_순매수금액') < 0), 0)
+
+    # P3: 양봉 + 이격도 98% 이하 + 외국인 2일 이상 연속 순매수 (기본값 기준)
+    close = panel.last('종가')
+    open_price = panel.last('시가')
+    if ma20 is None:
+        ma20 = panel.moving_average('종가', MA_WINDOW)
+    ma20 = np.asarray(ma20, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        disparity = np.where(ma20 > 0, close / ma20 * 100, 0.0)
+    is_p3 = ((panel.lengths >= P3_MIN_ROWS) & (close > open_price)
+             & (disparity <= params.p3_max_disparity) & (foreign_run >= params.p3_min_foreign_days))
+
+    # 데이터가 부족한 종목은 analyze와 같게 모든 판정을 끔
+    is_p1 &= enough
+    is_p2 &= enough
+    is_p3 &= enough
+
+    # 점수/우선순위: P1(100, 1) > P2(80, 2) > P3(40, 3)
+    score = np.select([is_p1, is_p2, is_p3], [100, 80, 40], default=0)
+    priority = np.select([is_p1, is_p2, is_p3], [1, 2, 3], default=99)
+
+    return {
+        'contribution': contribution,
+        'is_p1': is_p1,
+        'consecutive_days': foreign_run,
+        'is_p2': is_p2,
+        'consecutive_personal_sell_days': personal_run,
+        'disparity': disparity,
+        'is_p3': is_p3,
+        'score': score,
+        'priority': priority,
+        'enough_data': enough,
+    }
+
+
+def analyze_panel(panel: Panel, caps: Sequence[float],
+                  flags: Optional[Dict[str, np.ndarray]] = None) -> List[Dict[str, Any]]:
+    """
+    StockStrategy.analyze와 같은 형식의 결과 dict를 종목별로 반환 (panel.tickers 순서)
+
+    계산은 evaluate_panel에서 한 번에 끝나고, 여기서는 사유 문자열만 조립함
+
+    Args:
+        flags: 이미 계산한 evaluate_panel 결과 (없으면 새로 계산)
+    """
+    if flags is None:
+        flags = evaluate_panel(panel, caps)
+    results: List[Dict[str, Any]] = []
+    for i in range(len(panel)):
+        if not flags['enough_data'][i]:
+            results.append({"score": 0, "priority": None, "reasons": "데이터 부족", "contribution": 0})
+            continue
+
+        is_p1 = bool(flags['is_p1'][i])
+        is_p2 = bool(flags['is_p2'][i])
+        is_p3 = bool(flags['is_p3'][i])
+        contribution = float(flags['contribution'][i])
+        consec_days = int(flags['consecutive_days'][i])
+
+        reasons = []
+        if is_p1:
+            reasons.append(f"[P1] 지수기여:{contribution:.0f}")
+        if is_p2:
+            reasons.append(f"[P2] 외인연속:{consec_days}일")
+        if is_p3:
+            reasons.append(f"[P3] 바닥반등(이격{flags['disparity'][i]:.0f}%)")
+
+        score = int(flags['score'][i])
+        results.append({
+            "score": score,
+            "priority": int(flags['priority'][i]) if score > 0 else None,
+            "reasons": ", ".join(reasons) if reasons else "-",
+            "contribution": contribution,
+            "consecutive_days": consec_days if is_p2 else 0,
+            "consecutive_personal_sell_days": int(flags['consecutive_personal_sell_days'][i]),
+            "is_p1": is_p1,
+            "is_p2": is_p2,
+            "is_p3": is_p3
+        })
+    return results
@@ -1,48 +1,80 @@
+import asyncio
+import queue
+import threading
 import time
 import pandas as pd
+from datetime import datetime
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from stock_v2.core.data_fetcher import DataFetcher
 from stock_v2.core.strategy import StockStrategy
-from stock_v2.core.indicators import calculate_indicators
-import json
-import os
+from stock_v2.core.panel import Panel, evaluate_panel, analyze_panel
+from stock_v2.core.indicators import IndicatorEngine
+from stock_v2.core.concurrency import AdaptiveConcurrency
+from stock_v2.core.p1_ranker import P1Ranker
+from stock_v2.core.streaming import ScanUpdate, ScanView
+from stock_v2.core.checkpoint import ScanCheckpoint, strategy_version
+from stock_v2.core.universe import get_universe
+from stock_v2.tracing import span, traced, get_tracer
+from stock_v2.core.stages import StageMetrics, FETCH_QUEUE_SIZE, ANALYSIS_BATCH_SIZE, put_until, get_batch
+
+# 종목당 조회할 거래일 수
+# - analyze()는 최소 60봉(MA60)이 필요하고, P3는 20봉(MA20)이 필요함
+# - 예전 '120 달력일' 조회가 실제로 주던 약 80봉과 같은 분량을 거래일 달력으로 정확히 요청
+SCAN_SESSIONS = 80
+
+# P1 모드에서 종목당 조회할 거래일 수 (기준일 등락률 계산에는 기준일 + 직전 거래일이면 충분)
+P1_SESSIONS = 2
+
+# 결과 표시(이격도 컬럼)에 쓰는 지표 - 전략이 요구하는 지표와 합쳐서 계산
+DISPLAY_INDICATORS = ('MA20',)
+
+# 비동기 스캔에서 동시에 진행할 종목 수 (초당 요청 수는 토큰 버킷이 별도로 제한)
+DEFAULT_ASYNC_CONCURRENCY = 50
 
 class MarketScanner:
-    def __init__(self):
+    def __init__(self, params=None, universe=None):
+        """
+        Args:
+            params: 전략 판정 기준값 (StrategyParams, 기본값: DEFAULT_PARAMS)
+            universe: 스캔 대상 종목 유니버스 (TickerUniverse, 기본값: get_universe())
+        """
+        self.universe = universe
         self.data_fetcher = DataFetcher()
-        self.strategy = StockStrategy()
+        self.strategy = StockStrategy(params)
+        # 직전 스캔에서 수렴한 동시성 (다음 스캔의 시작값으로 이어받음)
+        self.last_concurrency = None
+        # 직전 스캔의 단계별(조회/분석) 처리 통계
+        self.last_stage_metrics = {}
+        # 스캔이 끝날 때마다 KIS 요청 지표를 저장할 경로 (.prom이면 Prometheus 텍스트, 그 외 JSON)
+        self.metrics_path = None
+        # 종목별 지표 증분 상태 (실행 사이에 보존되어 새 봉만 반영)
+        # 전략과 결과 표시에 실제로 쓰는 지표만 계산함
+        self.indicator_engine = IndicatorEngine.load(indicators=self.required_indicators())
+
+    def required_indicators(self):
+        """이번 스캔에 필요한 지표 목록 (전략 요구 + 결과 표시용, 중복 제거)"""
+        needed = list(getattr(self.strategy, 'REQUIRED_INDICATORS', ())) + list(DISPLAY_INDICATORS)
+        return tuple(dict.fromkeys(needed))
 
     def _load_tickers(self, market_type="KOSPI", top_n=100):
         """
         로컬 파일(tickers.json)에서 시가총액 상위 종목 로드
+        - 공유 종목 유니버스(get_universe)가 파일을 한 번만 읽어 시장별로 정렬해 두므로,
+          스캔마다 파일을 다시 파싱하지 않음 (파일이 바뀌면 자동으로 다시 읽음)
         """
-        # stock_v2/tickers.json 경로 찾기 (pipeline.py는 stock_v2/core/에 위치)
-        # __file__ = .../stock_v2/core/pipeline.py
-        # dirname(__file__) = .../stock_v2/core
-        # dirname(...) = .../stock_v2
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        file_path = os.path.join(base_dir, 'tickers.json')
-        
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                df_all = pd.DataFrame(data)
-                # 시장 필터링
-                df_market = df_all[df_all['market'] == market_type]
-                # 시가총액 상위 N개
-                return df_market.head(top_n).copy()
-        else:
-            print(f"로컬 파일도 찾을 수 없습니다: {file_path}")
-            return pd.DataFrame()
+        return (self.universe or get_universe()).top(market_type, top_n)
 
+    @traced("scan.filter_p2")
     def filter_p2_stocks(self, df_results):
         """
         P2 (수급 주도주) 필터링 로직
         - Group A: 코스피 외인 순매수 Top 50 ∩ 기관 순매수 Top 50
         - Group B: 코스닥 외인 순매수 Top 50 ∩ 기관 순매수 Top 50
         - Final: Group A + Group B -> 외국인 연속 매수 일수 정렬
+        (Top N/일수/이격도 기준은 self.strategy.params 값을 사용, 기본값은 위 수치)
         """
+        params = self.strategy.params
         if df_results.empty:
             return pd.DataFrame()
             
@@ -57,11 +89,11 @@ class MarketScanner:
             return pd.DataFrame()
         
         # 1. 외인 순매수 Top 50 (양수 중에서)
-        top50_foreign = df_positive.sort_values(by='외국인순매수', ascending=False).head(50)
+        top50_foreign = df_positive.sort_values(by='외국인순매수', ascending=False).head(params.p2_top_n)
         codes_foreign = set(top50_foreign['code'])
         
         # 2. 기관 순매수 Top 50 (양수 중에서)
-        top50_inst = df_positive.sort_values(by='기관순매수', ascending=False).head(50)
+        top50_inst = df_positive.sort_values(by='기관순매수', ascending=False).head(params.p2_top_n)
         codes_inst = set(top50_inst['code'])
         
         # 3. 교집합
@@ -72,11 +104,11 @@ class MarketScanner:
         
         # [필터] 외국인 2일 이상 연속 매수 종목만 유지
         if not p2_final.empty:
-            p2_final = p2_final[p2_final['consecutive_days'] >= 2]
+            p2_final = p2_final[p2_final['consecutive_days'] >= params.p2_min_foreign_days]
             
         # [필터] 개인 2일 이상 연속 순매도 종목만 유지 (손바뀜 확인)
         if not p2_final.empty and 'consecutive_personal_sell_days' in p2_final.columns:
-            p2_final = p2_final[p2_final['consecutive_personal_sell_days'] >= 2]
+            p2_final = p2_final[p2_final['consecutive_personal_sell_days'] >= params.p2_min_personal_sell_days]
 
         # P2 단계 분류 (Stage Classification)
         def classify_stage(row):
@@ -86,7 +118,8 @@ class MarketScanner:
             # [수정] 오직 '초기 포착' 단계만 식별
             # 외국인 연속 순매수 2~4일 AND 이격도 105% 이하
             # (나머지 과열/추세확정은 모두 제외대상 처리)
-            if 2 <= days <= 4 and disp <= 105:
+            if (params.p2_min_foreign_days <= days <= params.p2_max_foreign_days
+                    and disp <= params.p2_max_disparity):
                 return "🌱초기포착"
                 
             return "👀관망/기타"
@@ -104,6 +137,7 @@ class MarketScanner:
             
         return p2_final
 
+    @traced("scan.filter_p3")
     def filter_p3_stocks(self, df_results):
         """
         P3 (바닥 반등주) 필터링 로직
@@ -126,87 +160,94 @@ class MarketScanner:
                 
         return p3_final
 
-    def run_scan(self, market_type="KOSPI", top_n=100, target_date=None, progress_callback=None):
+    def _apply_prefilter(self, tickers_df, target_date, prefilter):
         """
-        KIS API 기반 순수 스캔 실행
-        1. 로컬 파일에서 시가총액 상위 종목 로드
-        2. KIS API로 각 종목의 상세 데이터 조회 및 분석
+        1단계: 시장 스냅샷(멀티종목 시세)으로 후보를 줄임
+        - 스냅샷은 '지금' 시세이므로, 과거 날짜 스캔에는 적용하지 않음
         """
-        print(f"[{market_type}] 스캔 시작 (Pure KIS Mode)...")
-        
-        tickers_df = self._load_tickers(market_type, top_n)
-        
-        if tickers_df.empty:
-            print("종목 리스트를 가져오지 못했습니다.")
-            return pd.DataFrame()
-            
-        print(f"분석 대상: {len(tickers_df)}개 종목 (시가총액 상위)")
-        
+        if prefilter is None or tickers_df.empty:
+            return tickers_df
+        if target_date is not None and target_date.date() < datetime.now().date():
+            print("사전 필터 건너뜀: 과거 기준일에는 현재 시세 스냅샷을 적용할 수 없습니다.")
+            return tickers_df
+
+        snapshot = self.data_fetcher.get_quotes(tickers_df['code'].astype(str).tolist())
+        if snapshot.empty:
+            # 멀티종목 시세 실패(모의투자 미지원 등) 시에는 시총 필터만 적용됨
+            print("시세 스냅샷을 가져오지 못해 시가총액 조건만 적용합니다.")
+        survivors = prefilter.apply(tickers_df, snapshot)
+        print(prefilter.summary())
+        return survivors
+
+    def _analyze_batch(self, fetched, save_state=True):
+        """
+        조회된 종목들의 일봉을 패널로 묶어 한 번에 분석 (조건을 만족한 종목의 결과 dict 리스트 반환)
+        - 동기(run_scan)/비동기(run_scan_async) 경로가 같은 분석 로직을 공유
+        - 종목별 파이썬 루프 대신 evaluate_panel의 배열 연산으로 P1/P2/P3를 한 번에 판정
+
+        Args:
+            fetched: (종목 행, 일봉 DataFrame) 튜플 리스트
+            save_state: 지표 상태를 바로 저장할지 여부 (종목 단위로 자주 부를 때는 False 후 한 번에 저장)
+        """
+        if not fetched:
+            return []
+        frames = {}
+        rows = {}
+        for row, df in fetched:
+            frames[row['code']] = df
+            rows[row['code']] = row
+
+        with span("scan.panel", tickers=len(frames)):
+            panel = Panel.from_frames(frames)
+        caps = [rows[code].get('cap', 0) for code in panel.tickers]
+        # 20일선은 증분 지표 엔진에서 가져옴 (종목당 새로 생긴 봉만 O(1)로 반영)
+        with span("scan.indicators", tickers=len(frames)):
+            indicators = [self.indicator_engine.update_frame(code, frames[code]) for code in panel.tickers]
+        if save_state:
+            self._save_indicator_state()
+        with span("scan.evaluate", tickers=len(frames)):
+            flags = evaluate_panel(panel, caps, ma20=[values['MA20'] for values in indicators],
+                                   params=self.strategy.params)
+            analyses = analyze_panel(panel, caps, flags)
+
+        # 결과 표시용 마지막 봉 값과 이격도(20일선 기준)
+        close = panel.last('종가')
+        rate = panel.last('등락률')
+        foreign = panel.last('외국인_순매수금액')
+        inst = panel.last('기관_순매수금액')
+        personal = panel.last('개인_순매수금액')
+        disparity = flags['disparity']
+
         results = []
-        
-        # Analyze using KIS API
-        # tqdm으로 진행상황 표시
-        
-        def process_stock(row):
-            ticker = row['code']
-            name = row['name']
-            
-            # KIS API로 데이터 조회 (120일치 일봉으로 복귀)
-            # P3 전략의 120일선 조건이 삭제되었으므로, 불필요한 데이터 요청을 줄임
-            df, error = self.data_fetcher.get_stock_data(ticker, days=120, end_date=target_date)
-            
-            if error:
-                return None
-                
-            # 지표 계산
-            df = calculate_indicators(df)
-            
-            # 이격도 계산 (20일선 기준)
-            current_close = df.iloc[-1]['종가']
-            ma20 = df.iloc[-1].get('MA20', 0)
-            disparity = (current_close / ma20 * 100) if ma20 > 0 else 0
-            
-            # 전략 분석 (시가총액 전달)
-            cap = row.get('cap', 0)
-            analysis_result = self.strategy.analyze(df, cap=cap)
-            
-            # 외국인 순매수 정보 업데이트 (KIS 데이터 사용)
-            current_foreign_buy = df.iloc[-1].get('외국인_순매수금액', 0)
-            current_inst_buy = df.iloc[-1].get('기관_순매수금액', 0)
-            current_personal_buy = df.iloc[-1].get('개인_순매수금액', 0)
-            
-            if analysis_result['score'] > 0:
-                return {
-                    'code': ticker,
-                    'name': name,
-                    '현재가': int(current_close),
-                    '등락률': float(df.iloc[-1]['등락률']),
-                    '외국인순매수': current_foreign_buy,
-                    '기관순매수': current_inst_buy,
-                    '개인순매수': current_personal_buy,
-                    '시가총액': cap,
-                    '이격도': disparity,
-                    **analysis_result
-                }
-            return None
-
-        max_workers = 5
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(process_stock, row) for _, row in tickers_df.iterrows()]
-            
-            total_futures = len(futures)
-            for i, future in enumerate(tqdm(as_completed(futures), total=total_futures)):
-                res = future.result()
-                if res:
-                    results.append(res)
-                
-                # UI 진행률 업데이트 콜백
-                if progress_callback:
-                    # 0.0 ~ 1.0 사이 값 전달
-                    progress = (i + 1) / total_futures
-                    progress_callback(progress, f"[{market_type}] {i + 1}/{total_futures} 분석 중...")
-            
-        # 결과 정리
+        for i, code in enumerate(panel.tickers):
+            analysis_result = analyses[i]
+            if analysis_result['score'] <= 0:
+                continue
+            row = rows[code]
+            results.append({
+                'code': code,
+                'name': row['name'],
+                '현재가': int(close[i]),
+                '등락률': float(rate[i]),
+                '외국인순매수': foreign[i] if panel.has('외국인_순매수금액')[i] else 0,
+                '기관순매수': inst[i] if panel.has('기관_순매수금액')[i] else 0,
+                '개인순매수': personal[i] if panel.has('개인_순매수금액')[i] else 0,
+                '시가총액': caps[i],
+                '이격도': float(disparity[i]),
+                **analysis_result
+            })
+        return results
+
+    def _save_indicator_state(self):
+        """지표 상태 저장 (실패해도 다음 실행에서 다시 계산하면 되므로 스캔은 계속)"""
+        try:
+            self.indicator_engine.save()
+        except OSError as e:
+            print(f"[Indicators] 상태 저장 실패: {e}")
+
+    @traced("scan.finalize")
+    def _finalize_results(self, results):
+        """종목별 분석 결과 리스트를 최종 정렬된 DataFrame으로 변환"""
         if results:
             result_df = pd.DataFrame(results)
             
@@ -225,3 +266,420 @@ class MarketScanner:
             return result_df
         else:
             return pd.DataFrame()
+
+    def run_scan(self, market_type="KOSPI", top_n=100, target_date=None, progress_callback=None, prefilter=None,
+                 checkpoint=False):
+        """
+        KIS API 기반 순수 스캔 실행
+        1. 로컬 파일에서 시가총액 상위 종목 로드
+        2. (선택) 시세 스냅샷으로 조건 불가 종목 사전 제외 (prefilter: SnapshotPrefilter)
+        3. KIS API로 남은 종목의 상세 데이터 조회 및 분석
+        (한 시장만 run_multi_scan으로 실행한 것과 같음)
+        """
+        results = self.run_multi_scan([market_type], top_n=top_n, target_date=target_date,
+                                      progress_callback=progress_callback, prefilter=prefilter,
+                                      checkpoint=checkpoint)
+        return results[market_type]
+
+    def run_multi_scan(self, markets=("KOSPI", "KOSDAQ"), top_n=100, target_date=None, target_dates=None,
+                       progress_callback=None, prefilter=None, checkpoint=False):
+        """
+        여러 시장(과 여러 기준일)을 하나의 작업 큐로 묶어 한 번에 스캔
+        - 시장별로 run_scan을 차례로 부르면 앞 시장의 마지막 몇 종목(꼬리 지연)이 끝날 때까지
+          다음 시장의 요청이 시작되지 않음
+        - 여기서는 모든 (기준일, 시장, 종목) 작업을 우선순위 순서로 한 스레드 풀/한 동시성 제어기에 올려,
+          한 시장의 꼬리 구간에도 다른 시장의 요청이 계속 채워지도록 함
+        - 우선순위: 기준일 순서 → 시장 내 시가총액 순위 → 시장 순서
+          (시장들을 번갈아 처리하므로 모든 시장이 비슷한 시점에 끝남)
+        - 조회(I/O)와 분석(CPU)은 크기가 정해진 큐로 연결된 별도 단계 (_iter_fetch / _iter_results)
+          단계별 통계는 self.last_stage_metrics에 남음
+
+        Args:
+            markets: 스캔할 시장 목록
+            target_date: 기준일 (None이면 오늘)
+            target_dates: 여러 기준일을 한 번에 스캔할 때의 기준일 목록 (주어지면 target_date 무시)
+            checkpoint: True면 종목별 결과를 (시장, 기준일, 전략 버전)별 체크포인트에 바로 기록하고,
+                이전 실행이 중간에 끊겼다면 이미 끝난 종목은 조회하지 않고 이어서 스캔
+
+        Returns:
+            target_dates가 없으면 {시장: 결과 DataFrame},
+            있으면 {기준일: {시장: 결과 DataFrame}}
+            (결과 DataFrame은 run_scan과 같은 형식이므로 filter_p2_stocks를 시장별로 그대로 적용)
+        """
+        dates = list(target_dates) if target_dates is not None else [target_date]
+        label = "+".join(markets)
+        print(f"[{label}] 통합 스캔 시작 (Pure KIS Mode, 기준일 {len(dates)}개)...")
+        trace_mark = get_tracer().mark()
+
+        # 1. (기준일, 시장)별 종목 리스트 → 우선순위 순서의 작업 목록 → 조회
+        jobs = self._build_jobs(markets, dates, top_n, prefilter)
+        total = len(jobs)
+
+        def report(i):
+            # UI 진행률 업데이트 콜백 (0.0 ~ 1.0 사이 값 전달)
+            if progress_callback:
+                progress_callback((i + 1) / total, f"[{label}] {i + 1}/{total} 분석 중...")
+
+        # 2. 조회 단계와 분석 단계를 큐로 연결해, 조회가 진행되는 동안 끝난 종목부터 패널로 분석
+        analyzed = {(d, market): [] for d in range(len(dates)) for market in markets}
+        checkpoints = self._open_checkpoints(markets, dates) if checkpoint else {}
+        for i, (key, _, result) in enumerate(self._iter_results(jobs, dates, label, checkpoints)):
+            if result:
+                analyzed[key].append(result)
+            report(i)
+
+        results = {}
+        for d, date in enumerate(dates):
+            results[date] = {market: self._finalize_results(analyzed[(d, market)]) for market in markets}
+        self._print_trace_summary(label, trace_mark)
+        if target_dates is None:
+            return results[target_date]
+        return results
+
+    def _build_jobs(self, markets, dates, top_n, prefilter):
+        """
+        (기준일, 시장)별 종목 리스트를 우선순위 순서의 조회 작업 목록으로 변환
+        - 작업: (우선순위, 기준일 번호, 시장, 종목 행)
+        - 우선순위: 기준일 순서 → 시장 내 시가총액 순위 → 시장 순서
+        """
+        jobs = []
+        for d, date in enumerate(dates):
+            for m, market in enumerate(markets):
+                tickers_df = self._load_tickers(market, top_n)
+                tickers_df = self._apply_prefilter(tickers_df, date, prefilter)
+                for rank, (_, row) in enumerate(tickers_df.iterrows()):
+                    jobs.append(((d, rank, m), d, market, row))
+        jobs.sort(key=lambda job: job[0])
+
+        if not jobs:
+            print("종목 리스트를 가져오지 못했습니다.")
+        else:
+            print(f"분석 대상: {len(jobs)}개 작업 (시장 {len(markets)}개 × 기준일 {len(dates)}개, 시가총액 상위)")
+        return jobs
+
+    def _iter_fetch(self, jobs, dates, label, metrics, batch_size=ANALYSIS_BATCH_SIZE):
+        """
+        조회 단계: 작업 목록을 한 스레드 풀/한 동시성 제어기로 조회해 크기가 정해진 큐에 넣고,
+        소비하는 쪽(분석 단계)에는 큐에 쌓인 결과를 batch_size개까지 묶어 내보내는 제너레이터
+
+        - 내보내는 값: [(키, 종목 행, 일봉 DataFrame 또는 None(조회 실패)), ...]
+          키: (기준일 번호, 시장)
+        - 분석이 밀려 큐가 가득 차면 조회 스레드가 넣지 못하고 기다리므로 새 API 요청도 멈춤 (배압)
+        - 소비하는 쪽이 중간에 멈추면(break/close) 대기 중인 스레드를 깨우고 시작 전 조회는 취소됨
+
+        Args:
+            metrics: 단계 이름('fetch', 'analyze') → StageMetrics
+                (fetch: 조회 시간 / 큐가 가득 차 기다린 시간 / 동시성 슬롯 대기 시간,
+                 analyze: 큐가 비어 기다린 시간)
+        """
+        if not jobs:
+            return
+
+        client = self.data_fetcher.client
+        # 적응형 동시성 제어기: KIS 응답 상태를 보고 동시 요청 수를 자동 조절 (모든 시장이 공유)
+        controller = AdaptiveConcurrency.for_account(client.mock, initial=self.last_concurrency)
+        fetch_metrics = metrics['fetch']
+        out = queue.Queue(maxsize=FETCH_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def process_stock(job):
+            _, d, market, row = job
+            if stop.is_set():
+                return
+            df = None
+            queued = started = time.perf_counter()
+            with span("scan.process_stock", ticker=row['code'], market=market) as stock_span:
+                try:
+                    # 제어기가 허용하는 만큼만 동시에 실행 (나머지 스레드는 슬롯이 빌 때까지 대기)
+                    with span("scan.slot_wait", ticker=row['code']):
+                        controller.acquire()
+                    # 작업 시간은 슬롯을 얻은 뒤부터 (슬롯 대기는 throttled로 따로 집계)
+                    started = time.perf_counter()
+                    try:
+                        # KIS API로 데이터 조회 (정확히 SCAN_SESSIONS 거래일)
+                        df, error = self.data_fetcher.get_stock_data(row['code'], end_date=dates[d], sessions=SCAN_SESSIONS)
+                    finally:
+                        controller.release()
+                    if error:
+                        df = None
+                except Exception as e:
+                    # 한 종목의 예외로 스캔 전체가 죽지 않도록 실패로 처리 (체크포인트 사용 시 재실행에서 다시 조회)
+                    print(f"[{row['code']}] 조회 중 예외: {e}")
+                stock_span.set(ok=df is not None)
+                fetch_metrics.add(items=1, busy=time.perf_counter() - started, throttled=started - queued)
+                # 분석은 다음 단계에서 수행 (스레드는 조회만 담당)
+                with span("scan.queue_put", ticker=row['code']):
+                    put_until(out, ((d, market), row, df), stop, fetch_metrics)
+
+        # 스레드 풀은 제어기의 최대치만큼 만들고, 실제 동시 실행 수는 제어기가 결정
+        # 작업은 우선순위 순서로 제출되므로 풀의 대기열이 곧 우선순위 큐 역할을 함
+        max_workers = controller.max_limit
+        client.add_listener(controller.on_request)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(process_stock, job) for job in jobs]
+                try:
+                    received = 0
+                    with tqdm(total=len(jobs)) as bar:
+                        while received < len(jobs):
+                            batch = get_batch(out, min(batch_size, len(jobs) - received), metrics['analyze'])
+                            received += len(batch)
+                            bar.update(len(batch))
+                            yield batch
+                finally:
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+        finally:
+            client.remove_listener(controller.on_request)
+            self.last_concurrency = controller.limit
+            print(f"[{label}] {controller.summary()}")
+
+    def _open_checkpoints(self, markets, dates):
+        """(기준일 번호, 시장) → 체크포인트 (전략 버전은 현재 기준값으로 계산)"""
+        version = strategy_version(self.strategy.params)
+        return {(d, market): ScanCheckpoint(market, date, version)
+                for d, date in enumerate(dates) for market in markets}
+
+    def _iter_results(self, jobs, dates, label, checkpoints):
+        """
+        종목별 (키, 종목코드, 분석 결과)를 끝나는 대로 내보내는 제너레이터
+        - 키: (기준일 번호, 시장), 결과: 조건을 만족하지 않았거나 조회에 실패하면 None
+        - 체크포인트에 이미 기록된 종목은 조회 없이 먼저 내보냄
+        - 새로 조회한 종목은 조회 단계의 큐에서 꺼낸 묶음 단위로 패널 분석(분석 단계)한 뒤
+          체크포인트에 기록 (checkpoints가 비어 있으면 기록 안 함)
+        - 지표 상태는 끝날 때(또는 중단될 때) 한 번만 저장
+        - 모든 종목을 한 바퀴 처리하면 실패 수와 관계없이 체크포인트를 지움
+          (실패 종목은 retry로만 기록되므로, 중간에 끊긴 경우에도 재실행 시 다시 조회됨)
+        """
+        finished = {key: ckpt.load() for key, ckpt in checkpoints.items()}
+        remaining = []
+        resumed = []
+        for job in jobs:
+            _, d, market, row = job
+            done = finished.get((d, market), {})
+            if row['code'] in done:
+                resumed.append(((d, market), row['code'], done[row['code']]))
+            else:
+                remaining.append(job)
+        if resumed:
+            print(f"[{label}] 체크포인트에서 {len(resumed)}개 종목 이어받음 (남은 조회 {len(remaining)}개)")
+        yield from resumed
+
+        metrics = {'fetch': StageMetrics('fetch'), 'analyze': StageMetrics('analyze')}
+        self.last_stage_metrics = metrics
+        request_metrics = self.data_fetcher.client.metrics
+        requests_before = request_metrics.totals()
+        failed = 0
+        try:
+            for batch in self._iter_fetch(remaining, dates, label, metrics):
+                started = time.perf_counter()
+                # 같은 (기준일, 시장) 종목끼리 패널로 묶어 한 번에 분석
+                groups = {}
+                for key, row, df in batch:
+                    if df is not None:
+                        groups.setdefault(key, []).append((row, df))
+                by_code = {}
+                with span("scan.analyze_batch", items=len(batch)):
+                    for key, items in groups.items():
+                        for result in self._analyze_batch(items, save_state=False):
+                            by_code[(key, result['code'])] = result
+                metrics['analyze'].add(items=len(batch), busy=time.perf_counter() - started)
+
+                for key, row, df in batch:
+                    code = row['code']
+                    if df is None:
+                        failed += 1
+                        if key in checkpoints:
+                            checkpoints[key].record_failure(code)
+                        yield key, code, None
+                        continue
+                    result = by_code.get((key, code))
+                    if key in checkpoints:
+                        checkpoints[key].record(code, result)
+                    yield key, code, result
+        finally:
+            self._save_indicator_state()
+
+        print(f"[{label}] 단계별 통계 - " + " | ".join(m.summary() for m in metrics.values()))
+        self._report_request_metrics(label, requests_before)
+        if failed:
+            print(f"[{label}] {failed}개 종목 조회 실패")
+        for ckpt in checkpoints.values():
+            ckpt.clear()
+
+    def stream_scan(self, markets=("KOSPI", "KOSDAQ"), top_n=100, target_date=None, prefilter=None,
+                    checkpoint=False):
+        """
+        run_multi_scan의 스트리밍 버전: 종목 하나가 분석될 때마다 ScanUpdate를 바로 내보내는 제너레이터
+        - 전체 스캔이 끝나기를 기다리지 않고, 조건을 만족한 종목을 몇 초 안에 화면에 표시할 수 있음
+        - update.view에서 지금까지의 P1 Top k / P2 / P3 결과를 언제든 조회 가능
+          (마지막 update의 view는 run_multi_scan 결과로 만든 P1/P2/P3와 같음)
+
+        사용법:
+            for update in scanner.stream_scan(["KOSPI", "KOSDAQ"], top_n=100):
+                if update.result:
+                    print(update.result['name'], update.result['reasons'])
+            p1 = update.view.p1()
+
+        참고:
+        - checkpoint=True면 run_multi_scan과 같이 종목별 결과를 기록하고, 끊긴 스캔을 이어서 진행
+          (이어받은 종목도 update로 먼저 내보내므로 view는 항상 전체 결과 기준)
+        """
+        label = "+".join(markets)
+        print(f"[{label}] 스트리밍 스캔 시작 (Pure KIS Mode)...")
+        trace_mark = get_tracer().mark()
+        jobs = self._build_jobs(markets, [target_date], top_n, prefilter)
+        checkpoints = self._open_checkpoints(markets, [target_date]) if checkpoint else {}
+        view = ScanView(self, markets)
+        total = len(jobs)
+        for i, ((_, market), code, result) in enumerate(self._iter_results(jobs, [target_date], label, checkpoints)):
+            if result:
+                view.add(market, result)
+            yield ScanUpdate(market=market, code=code, result=result, done=i + 1, total=total, view=view)
+        self._print_trace_summary(label, trace_mark)
+
+    def _report_request_metrics(self, label, before):
+        """이번 스캔의 KIS 요청 지표 (스캔 전 누적값과의 차이) 출력, metrics_path가 있으면 누적 지표 저장"""
+        request_metrics = self.data_fetcher.client.metrics
+        after = request_metrics.totals()
+        delta = {key: after.get(key, 0) - before.get(key, 0) for key in after}
+        if delta.get('requests'):
+            print(f"[{label}] API 요청 {delta['requests']:.0f}회 (재시도 {delta['retries']:.0f}, "
+                  f"한도초과 {delta['rate_limited']:.0f}, 5xx {delta['server_error']:.0f}), "
+                  f"속도제한 대기 {delta['limiter_wait_seconds']:.1f}s, 백오프 {delta['backoff_sleep_seconds']:.1f}s, "
+                  f"수신 {delta['bytes'] / 2 ** 20:.1f}MB")
+        if self.metrics_path:
+            try:
+                request_metrics.dump(self.metrics_path)
+            except OSError as e:
+                print(f"[Metrics] 저장 실패: {e}")
+
+    @staticmethod
+    def _print_trace_summary(label, since):
+        """추적이 켜져 있으면 이번 스캔에서 기록된 구간만 요약 출력 (구간은 중첩되므로 합계는 겹쳐 셈)"""
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return
+        print(f"[{label}] 구간별 소요 시간 (추적)")
+        print(tracer.summary(since=since).to_string(index=False))
+
+    def run_p1_scan(self, market_type="KOSPI", top_n=100, target_date=None, progress_callback=None, k=None):
+        """
+        P1(지수 기여도) 전용 스캔 - 상위 k종목만 필요하므로 분기 한정으로 조회를 조기 종료
+        - 시가총액 내림차순으로 조회하다가, 남은 종목의 최대 기여도(cap * 30)가
+          현재 k등 기여도에 못 미치면 나머지 종목은 조회하지 않음
+        - 반환: 기여도 내림차순 상위 k종목 DataFrame (run_scan 결과의 P1 컬럼과 동일한 이름)
+        - k를 생략하면 self.strategy.params.p1_top_k 사용
+        """
+        print(f"[{market_type}] P1 스캔 시작 (분기 한정)...")
+
+        tickers_df = self._load_tickers(market_type, top_n)
+        if tickers_df.empty:
+            print("종목 리스트를 가져오지 못했습니다.")
+            return pd.DataFrame()
+
+        client = self.data_fetcher.client
+        controller = AdaptiveConcurrency.for_account(client.mock, initial=self.last_concurrency)
+
+        def evaluate(row):
+            df, error = self.data_fetcher.get_stock_data(row['code'], end_date=target_date, sessions=P1_SESSIONS)
+            if error or df is None or df.empty:
+                return None
+            cap = row.get('cap', 0)
+            is_p1, reason, contribution = self.strategy.check_p1_leader(df, cap)
+            current = df.iloc[-1]
+            return {
+                'code': row['code'],
+                'name': row['name'],
+                '현재가': int(current['종가']),
+                '등락률': float(current['등락률']),
+                '외국인순매수': current.get('외국인_순매수금액', 0),
+                '기관순매수': current.get('기관_순매수금액', 0),
+                '개인순매수': current.get('개인_순매수금액', 0),
+                '시가총액': cap,
+                'contribution': contribution,
+                'reasons': f"[P1] {reason}" if is_p1 else "-",
+                'is_p1': is_p1,
+            }
+
+        def on_progress(done, total):
+            if progress_callback:
+                progress_callback(done / total, f"[{market_type}] P1 {done}/{total} 조회 중...")
+
+        ranker = P1Ranker(k=k or self.strategy.params.p1_top_k)
+        client.add_listener(controller.on_request)
+        try:
+            leaders = ranker.rank(tickers_df, evaluate, max_workers=controller.max_limit,
+                                  controller=controller, progress_callback=on_progress)
+        finally:
+            client.remove_listener(controller.on_request)
+
+        self.last_concurrency = controller.limit
+        print(f"[{market_type}] {ranker.summary()}")
+        if progress_callback:
+            # 조기 종료 시 조회하지 않은 종목이 있으므로 마지막에 완료로 표시
+            progress_callback(1.0, f"[{market_type}] P1 완료 ({ranker.summary()})")
+        return pd.DataFrame(leaders)
+
+    async def run_scan_async(self, market_type="KOSPI", top_n=100, target_date=None, progress_callback=None,
+                             max_concurrency=DEFAULT_ASYNC_CONCURRENCY, prefilter=None):
+        """
+        run_scan의 asyncio 버전 (반환 형식 동일)
+        - 스레드 풀 대신 asyncio.Semaphore로 동시에 진행 중인 종목 수를 제한
+        - 실제 초당 요청 수는 KisClient의 토큰 버킷이 계속 제어하므로,
+          세마포어는 '대기열에 올려둘 수 있는 요청 수'의 상한 역할을 함
+
+        사용법 (동기 코드에서):
+            result_df = asyncio.run(scanner.run_scan_async("KOSPI", top_n=100))
+
+        학습 포인트:
+        - asyncio.as_completed: 먼저 끝난 코루틴부터 결과를 받아 진행률을 갱신
+        """
+        print(f"[{market_type}] 비동기 스캔 시작 (Pure KIS Mode)...")
+        trace_mark = get_tracer().mark()
+        
+        tickers_df = self._load_tickers(market_type, top_n)
+        # 스냅샷 조회는 묶음 몇 건뿐이므로 기존 동기 구현을 별도 스레드에서 실행
+        tickers_df = await asyncio.to_thread(self._apply_prefilter, tickers_df, target_date, prefilter)
+        
+        if tickers_df.empty:
+            print("종목 리스트를 가져오지 못했습니다.")
+            return pd.DataFrame()
+            
+        print(f"분석 대상: {len(tickers_df)}개 종목 (시가총액 상위, 동시 {max_concurrency})")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process_stock(row):
+            with span("scan.process_stock", ticker=row['code'], market=market_type) as stock_span:
+                with span("scan.slot_wait", ticker=row['code']):
+                    await semaphore.acquire()
+                try:
+                    df, error = await self.data_fetcher.get_stock_data_async(row['code'], end_date=target_date, sessions=SCAN_SESSIONS)
+                finally:
+                    semaphore.release()
+                stock_span.set(ok=not error)
+            if error:
+                return None
+            return row, df
+
+        fetched = []
+        tasks = [process_stock(row) for _, row in tickers_df.iterrows()]
+        total = len(tasks)
+        try:
+            for i, coro in enumerate(asyncio.as_completed(tasks)):
+                res = await coro
+                if res:
+                    fetched.append(res)
+                if progress_callback:
+                    progress_callback((i + 1) / total, f"[{market_type}] {i + 1}/{total} 분석 중...")
+        finally:
+            # 세션은 이벤트 루프에 묶여 있으므로 asyncio.run()이 끝나기 전에 닫아야 함
+            await self.data_fetcher.async_client.close()
+
+        # 패널 분석은 NumPy 연산이므로 별도 스레드에서 실행해도 이벤트 루프를 거의 막지 않음
+        analyzed = await asyncio.to_thread(self._analyze_batch, fetched)
+        result_df = self._finalize_results(analyzed)
+        self._print_trace_summary(market_type, trace_mark)
+        return result_df
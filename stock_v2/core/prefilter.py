@@ -0,0 +1,114 @@
+import pandas as pd
+from typing import Iterable, Dict, Any, Optional
+
+# specific_condition.txt의 전체 공통 필터 (Global Filters)
+# - 시가총액 1조 원 이상 (대형주 전용)
+# - 당일 등락률 +10% 이상 급등주 제외
+GLOBAL_MIN_CAP = 1_000_000_000_000
+SURGE_EXCLUDE_RATE = 10.0
+
+ALL_TARGETS = ("P1", "P2", "P3")
+
+
+class SnapshotPrefilter:
+    """
+    시장 스냅샷(현재가/등락률/시가총액)만으로 '절대 조건을 만족할 수 없는' 종목을 미리 제외하는 필터
+
+    종목별 과거 일봉 + 투자자 동향(종목당 2회 요청)을 받기 전에,
+    멀티종목 시세(30종목당 1회 요청)만 보고 걸러내어 요청 수를 줄이는 것이 목적.
+
+    판정 규칙 (스냅샷으로 확정할 수 있는 것만 사용):
+    - 전체 공통: 시가총액 < min_cap 이면 제외, 등락률 >= max_change_rate 이면 제외
+    - P1 가능: 등락률 > 0 (지수 기여도 = 시총 * 등락률 이 양수여야 함)
+    - P3 가능: 현재가 > 시가 (오늘 양봉이 트리거)
+    - P2 가능: 외국인 연속 순매수는 스냅샷에 없으므로 항상 '가능'으로 봄
+    → targets 중 하나라도 가능하면 남김. 스냅샷이 없는 종목은 판단할 수 없으므로 남김
+
+    학습 포인트:
+    - '불가능이 확실한 것만 제외'하는 보수적 필터이므로, 필터를 켜도 결과가 누락되지 않음
+      (단, 전체 공통 필터는 의도적으로 결과를 줄이는 규칙임)
+    """
+
+    def __init__(self, min_cap: Optional[float] = GLOBAL_MIN_CAP,
+                 max_change_rate: Optional[float] = SURGE_EXCLUDE_RATE,
+                 targets: Iterable[str] = ALL_TARGETS):
+        """
+        Args:
+            min_cap: 최소 시가총액(원). None이면 시총 필터 미적용
+            max_change_rate: 이 등락률(%) 이상 급등주 제외. None이면 미적용
+            targets: 찾으려는 전략 (예: ("P1", "P3")만 주면 P2 전용 종목은 제외됨)
+        """
+        self.min_cap = min_cap
+        self.max_change_rate = max_change_rate
+        self.targets = tuple(targets)
+        # 직전 apply() 결과 통계 (로그/UI 표시용)
+        self.last_stats: Dict[str, Any] = {}
+
+    def apply(self, tickers_df: pd.DataFrame, snapshot: pd.DataFrame) -> pd.DataFrame:
+        """
+        종목 리스트에서 통과한 종목만 반환
+
+        Args:
+            tickers_df: code, name, cap 컬럼을 가진 종목 리스트 (_load_tickers 결과)
+            snapshot: KisClient.get_quotes 결과 (code, 현재가, 시가, 등락률 ...)
+
+        Returns:
+            DataFrame: 통과한 종목 (원래 순서 유지)
+        """
+        total = len(tickers_df)
+        df = tickers_df.copy()
+        df['code'] = df['code'].astype(str)
+
+        # 1. 시가총액 필터 (스냅샷 없이도 가능)
+        keep = pd.Series(True, index=df.index)
+        if self.min_cap is not None and 'cap' in df.columns:
+            keep &= df['cap'] >= self.min_cap
+        dropped_cap = int((~keep).sum())
+
+        # 2. 스냅샷 기반 필터
+        if snapshot is not None and not snapshot.empty:
+            quotes = snapshot.drop_duplicates('code').set_index('code')
+            has_quote = df['code'].isin(quotes.index)
+            rate = df['code'].map(quotes['등락률'])
+            price = df['code'].map(quotes['현재가'])
+            open_price = df['code'].map(quotes['시가'])
+
+            surge = pd.Series(False, index=df.index)
+            if self.max_change_rate is not None:
+                surge = has_quote & (rate >= self.max_change_rate)
+
+            possible = pd.Series(False, index=df.index)
+            if "P1" in self.targets:
+                possible |= rate > 0
+            if "P3" in self.targets:
+                possible |= price > open_price
+            if "P2" in self.targets:
+                # P2 판정에 필요한 외국인 수급은 스냅샷에 없으므로 모두 가능으로 봄
+                possible = pd.Series(True, index=df.index)
+            # 스냅샷이 없는 종목은 판단 불가 → 남김
+            possible |= ~has_quote
+
+            keep_snapshot = ~surge & possible
+            dropped_surge = int((keep & surge).sum())
+            dropped_rule = int((keep & ~surge & ~possible).sum())
+            keep &= keep_snapshot
+        else:
+            dropped_surge = dropped_rule = 0
+
+        survivors = df[keep]
+        self.last_stats = {
+            'total': total,
+            'survivors': len(survivors),
+            'dropped_cap': dropped_cap,
+            'dropped_surge': dropped_surge,
+            'dropped_rule': dropped_rule,
+        }
+        return survivors
+
+    def summary(self) -> str:
+        """직전 필터링 결과 요약 문자열"""
+        s = self.last_stats
+        if not s:
+            return "사전 필터 미실행"
+        return (f"사전 필터: {s['total']} → {s['survivors']}종목 "
+                f"(시총미달 {s['dropped_cap']}, 급등제외 {s['dropped_surge']}, 조건불가 {s['dropped_rule']})")
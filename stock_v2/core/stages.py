@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# 조회 단계 → 분석 단계 사이 큐의 최대 길이
+# 분석이 밀리면 조회 스레드가 큐에 넣지 못하고 기다림 → 새 API 요청도 멈춤 (배압)
+FETCH_QUEUE_SIZE = 64
+
+# 분석 단계가 한 번에 꺼내 패널로 묶는 최대 종목 수
+ANALYSIS_BATCH_SIZE = 32
+
+
+class StageMetrics:
+    """
+    파이프라인 단계 하나의 처리 통계 (여러 스레드에서 동시에 기록 가능)
+
+    - items: 처리한 건수
+    - busy: 실제 작업에 쓴 시간 합계(초, 스레드별 시간을 더한 값)
+    - waited: 큐 때문에 기다린 시간 합계(초)
+      (조회 단계: 큐가 가득 차서 못 넣고 기다린 시간 = 배압,
+       분석 단계: 큐가 비어 있어 기다린 시간 = 조회가 병목)
+    - throttled: 동시성 슬롯이 빌 때까지 기다린 시간 합계(초, 조회 단계만 해당, busy에는 포함하지 않음)
+    - max_queue: 관찰된 최대 큐 길이
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.waited = 0.0
+        self.throttled = 0.0
+        self.max_queue = 0
+        self._lock = threading.Lock()
+
+    def add(self, items: int = 0, busy: float = 0.0, waited: float = 0.0, throttled: float = 0.0) -> None:
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.waited += waited
+            self.throttled += throttled
+
+    def observe_queue(self, depth: int) -> None:
+        with self._lock:
+            if depth > self.max_queue:
+                self.max_queue = depth
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'stage': self.name, 'items': self.items, 'busy': self.busy,
+                'waited': self.waited, 'throttled': self.throttled, 'max_queue': self.max_queue}
+
+    def summary(self) -> str:
+        throttled = f", 슬롯 대기 {self.throttled:.1f}s" if self.throttled else ""
+        return (f"{self.name}: {self.items}건, 작업 {self.busy:.1f}s, 대기 {self.waited:.1f}s{throttled}, "
+                f"최대 큐 {self.max_queue}")
+
+
+def put_until(q: "queue.Queue", item: Any, stop: threading.Event, metrics: Optional[StageMetrics] = None) -> bool:
+    """
+    큐에 자리가 날 때까지 기다렸다가 넣음 (stop이 켜지면 포기하고 False)
+
+    학습 포인트:
+    - 무작정 q.put()으로 막혀 있으면 소비자가 먼저 끝났을 때 스레드가 영원히 깨어나지 못함
+    - 짧은 timeout으로 나눠 기다리며 중단 신호를 확인하면 배압과 안전한 종료를 함께 얻음
+    """
+    started = time.perf_counter()
+    try:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                if metrics is not None:
+                    metrics.observe_queue(q.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+    finally:
+        if metrics is not None:
+            metrics.add(waited=time.perf_counter() - started)
+
+
+def get_batch(q: "queue.Queue", limit: int, metrics: Optional[StageMetrics] = None) -> List[Any]:
+    """첫 항목은 올 때까지 기다리고, 이미 쌓여 있는 항목은 limit개까지 함께 꺼냄"""
+    started = time.perf_counter()
+    batch = [q.get()]
+    if metrics is not None:
+        metrics.add(waited=time.perf_counter() - started)
+        metrics.observe_queue(q.qsize() + 1)
+    while len(batch) < limit:
+        try:
+            batch.append(q.get_nowait())
+        except queue.Empty:
+            break
+    return batch
@@ -1,11 +1,63 @@
 import pandas as pd
-from typing import Dict, Any, Tuple
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Tuple, Optional
+
+
+# 판정 로직 버전 - check_p1/p2/p3, analyze의 로직을 바꾸면 올림
+# (스캔 체크포인트 키에 포함되어, 로직이 바뀐 뒤에는 예전 중간 결과를 재사용하지 않음)
+STRATEGY_VERSION = 1
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    """
+    P1/P2/P3 판정 기준값 모음
+
+    - 기본값은 specific_condition.txt / 기존 코드에 고정되어 있던 값과 같음
+    - frozen=True: 만든 뒤에는 바꿀 수 없으므로, 스윕에서 여러 프로세스에 나눠 줘도 안전함
+      (값을 바꾼 새 객체는 dataclasses.replace(params, p3_max_disparity=97)로 만듦)
+    """
+    # 공통: 분석에 필요한 최소 봉 수 (MA60)
+    min_rows: int = 60
+    # P1: 지수 기여도 상위 k종목
+    p1_top_k: int = 5
+    # P2: 외국인/기관 순매수 상위 N 교집합
+    p2_top_n: int = 50
+    # P2 초기포착: 외국인 연속 순매수 일수 범위
+    p2_min_foreign_days: int = 2
+    p2_max_foreign_days: int = 4
+    # P2: 개인 연속 순매도 최소 일수 (손바뀜 확인)
+    p2_min_personal_sell_days: int = 2
+    # P2 초기포착: 이격도 상한(%)
+    p2_max_disparity: float = 105
+    # P3: 이격도 상한(%) / 외국인 연속 순매수 최소 일수
+    p3_max_disparity: float = 98
+    p3_min_foreign_days: int = 2
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+DEFAULT_PARAMS = StrategyParams()
+
 
 class StockStrategy:
     """
     P1, P2, P3 전략 정의 클래스
     """
 
+    # 전략이 읽는 지표 (indicators.py에 등록된 이름)
+    # - 스캐너는 이 목록(과 그 입력 지표)만 계산하므로, 새 규칙에서 지표를 쓰면 여기에 추가해야 함
+    # - P3: 이격도 판정에 MA20 사용
+    REQUIRED_INDICATORS = ('MA20',)
+
+    def __init__(self, params: Optional[StrategyParams] = None):
+        """
+        Args:
+            params: 판정 기준값 (기본값: DEFAULT_PARAMS)
+        """
+        self.params = params or DEFAULT_PARAMS
+
     def check_p1_leader(self, df: pd.DataFrame, cap: float = 0) -> Tuple[bool, str, float]:
         """
         [P1] 주도주 (Trend Leading) - 지수 기여도 방식
@@ -70,8 +122,8 @@ class StockStrategy:
     def check_p3_rebound(self, df: pd.DataFrame) -> Tuple[bool, str]:
         """
         [P3] 바닥 반등주 (Rebound)
-        1. 수급: 외국인 3일 연속 순매수
-        2. 상태: 이격도(20일선 기준) 98% 이하
+        1. 수급: 외국인 연속 순매수 (params.p3_min_foreign_days일 이상)
+        2. 상태: 이격도(20일선 기준) params.p3_max_disparity% 이하
         3. 트리거: 오늘 양봉
         """
         if df.empty or len(df) < 20:
@@ -88,7 +140,7 @@ class StockStrategy:
         # 2. 상태: 이격도 98% 이하 (20일선 대비)
         ma20 = current.get('MA20', 0)
         disparity = (close / ma20 * 100) if ma20 > 0 else 0
-        if disparity > 98:
+        if disparity > self.params.p3_max_disparity:
             return False, ""
             
         # 2. 수급: 외국인 2일 연속 순매수
@@ -102,7 +154,7 @@ class StockStrategy:
                     break
         
         # (루프 밖에서 체크)
-        if consecutive_days >= 2:
+        if consecutive_days >= self.params.p3_min_foreign_days:
             return True, f"바닥반등(이격{disparity:.0f}%)"
             
         return False, ""
@@ -117,7 +169,7 @@ class StockStrategy:
         contribution = 0.0
         
         # 데이터가 너무 적으면 분석 불가
-        if df is None or len(df) < 60:
+        if df is None or len(df) < self.params.min_rows:
             return {"score": 0, "priority": None, "reasons": "데이터 부족", "contribution": 0}
 
         # P1 체크 (지수 기여도)
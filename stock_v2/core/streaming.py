@@ -0,0 +1,102 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+class ScanView:
+    """
+    스트리밍 스캔 도중의 누적 결과와 P1/P2/P3 중간 결과
+
+    - P1: 지수 기여도 상위 k를 최소 힙으로 유지 (종목이 들어올 때마다 O(log k))
+    - P2: 외인/기관 Top N 교집합은 시장 전체를 봐야 하는 조건이므로, 조회할 때 지금까지의
+      시장별 결과에 filter_p2_stocks를 다시 적용 (결과가 바뀐 시장만 다시 계산)
+    - P3: 종목별 조건이므로 is_p3 종목을 바로 누적
+
+    학습 포인트:
+    - 전체 결과를 기다리지 않고 '지금까지의 정답'을 보여주려면, 종목별 조건(P3)과
+      횡단면 조건(P1 Top k, P2 Top N)을 나눠 각각에 맞는 방식으로 갱신해야 함
+    """
+
+    def __init__(self, scanner, markets: Sequence[str]):
+        """
+        Args:
+            scanner: filter_p2_stocks / filter_p3_stocks / _finalize_results를 가진 MarketScanner
+            markets: 스캔 중인 시장 목록
+        """
+        self.scanner = scanner
+        self.markets = list(markets)
+        self.k = scanner.strategy.params.p1_top_k
+        self._results: Dict[str, List[Dict[str, Any]]] = {market: [] for market in self.markets}
+        # (기여도, -도착 순서, 결과) 최소 힙
+        self._p1_heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._p2_cache: Dict[str, pd.DataFrame] = {}
+        self._p3: List[Dict[str, Any]] = []
+        self._count = 0
+
+    def add(self, market: str, result: Dict[str, Any]) -> None:
+        """분석된 종목 결과 하나 반영 (조건을 만족한 종목만 들어옴)"""
+        self._count += 1
+        self._results[market].append(result)
+        self._p2_cache.pop(market, None)
+
+        contribution = float(result.get('contribution', 0))
+        if contribution > 0:
+            item = (contribution, -self._count, result)
+            if len(self._p1_heap) < self.k:
+                heapq.heappush(self._p1_heap, item)
+            elif item[0] > self._p1_heap[0][0]:
+                heapq.heapreplace(self._p1_heap, item)
+
+        if result.get('is_p3'):
+            self._p3.append(result)
+
+    def results(self, market: Optional[str] = None) -> pd.DataFrame:
+        """지금까지의 분석 결과 (run_scan과 같은 정렬, market 생략 시 전체 시장)"""
+        if market is not None:
+            return self.scanner._finalize_results(self._results[market])
+        return self.scanner._finalize_results([r for market in self.markets for r in self._results[market]])
+
+    def p1(self) -> pd.DataFrame:
+        """지금까지의 P1 Top k (기여도 내림차순)"""
+        return pd.DataFrame([result for _, _, result in sorted(self._p1_heap, reverse=True)])
+
+    def p2(self) -> pd.DataFrame:
+        """지금까지의 P2 (시장별 filter_p2_stocks 결과를 합쳐 외인 연속일수 내림차순)"""
+        frames = []
+        for market in self.markets:
+            if market not in self._p2_cache:
+                self._p2_cache[market] = self.scanner.filter_p2_stocks(self.results(market))
+            if not self._p2_cache[market].empty:
+                frames.append(self._p2_cache[market])
+        if not frames:
+            return pd.DataFrame()
+        p2 = pd.concat(frames, ignore_index=True)
+        return p2.sort_values(by='consecutive_days', ascending=False)
+
+    def p3(self) -> pd.DataFrame:
+        """지금까지의 P3 (filter_p3_stocks와 같은 정렬)"""
+        return self.scanner.filter_p3_stocks(pd.DataFrame(self._p3))
+
+
+@dataclass
+class ScanUpdate:
+    """
+    스트리밍 스캔에서 종목 하나가 끝날 때마다 내보내는 값
+
+    - result: 조건을 만족한 종목의 분석 결과 dict (run_scan 결과의 한 행), 아니면 None
+    - code: 이번에 끝난 종목코드 (조회 실패 시 None)
+    - done / total: 진행 상황
+    - view: 지금까지의 누적 결과 (ScanView, 모든 update가 같은 객체를 공유)
+    """
+    market: str
+    code: Optional[str]
+    result: Optional[Dict[str, Any]]
+    done: int
+    total: int
+    view: ScanView
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 1.0
@@ -0,0 +1,175 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_v2.core.backtest import Backtester, BacktestResult, select_picks, eval_range, STRATEGIES
+from stock_v2.core.strategy import StrategyParams, DEFAULT_PARAMS
+
+# 공유 메모리 블록 정보: 특징 이름 → (블록 이름, 배열 모양, dtype 문자열)
+GridSpecs = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+
+def param_grid(base: StrategyParams = DEFAULT_PARAMS, **ranges: Sequence[Any]) -> List[StrategyParams]:
+    """
+    기준값 조합 목록 생성 (주어진 필드들의 데카르트 곱, 나머지는 base 값)
+
+    예: param_grid(p2_max_disparity=[100, 105, 110], p3_max_disparity=[95, 98])  → 6개 조합
+
+    Raises:
+        ValueError: StrategyParams에 없는 필드 이름
+    """
+    known = {f.name for f in fields(StrategyParams)}
+    unknown = set(ranges) - known
+    if unknown:
+        raise ValueError(f"알 수 없는 기준값입니다: {', '.join(sorted(unknown))}")
+    names = list(ranges)
+    return [replace(base, **dict(zip(names, values)))
+            for values in itertools.product(*(ranges[name] for name in names))]
+
+
+class SharedGrids:
+    """
+    특징 격자를 multiprocessing.shared_memory 블록에 올려 두고 작업 프로세스와 공유
+
+    - 부모 프로세스가 한 번 복사해 두면, 작업 프로세스는 블록 이름으로 붙기만 하고 복사하지 않음
+      (조합마다 수십 MB 격자를 pickle로 넘기지 않음)
+    - with 블록을 벗어나면 close + unlink로 블록을 해제
+
+    학습 포인트:
+    - ProcessPoolExecutor에 큰 배열을 인자로 넘기면 작업마다 직렬화/복사가 일어남
+    - 공유 메모리 위에 np.ndarray를 만들면(buffer=shm.buf) 여러 프로세스가 같은 물리 메모리를 읽음
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.specs: GridSpecs = {}
+        try:
+            for name, values in arrays.items():
+                values = np.ascontiguousarray(values)
+                # 크기 0인 블록은 만들 수 없으므로 최소 1바이트
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+                self.specs[name] = (block.name, values.shape, values.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedGrids":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def attach_grids(specs: GridSpecs) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+    """공유 메모리 블록에 붙어 배열 뷰를 만듦 (블록 핸들은 배열을 쓰는 동안 살아 있어야 함)"""
+    arrays: Dict[str, np.ndarray] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+# 작업 프로세스별 상태 (초기화 때 한 번 채우고 조합마다 재사용)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(specs: GridSpecs, context: Dict[str, Any]) -> None:
+    grid, blocks = attach_grids(specs)
+    _worker.clear()
+    _worker.update(context)
+    _worker['grid'] = grid
+    _worker['blocks'] = blocks
+
+
+def _evaluate(grid: Dict[str, np.ndarray], context: Dict[str, Any], params: StrategyParams) -> List[Dict[str, Any]]:
+    """기준값 한 조합의 전략 × 보유기간 성과 행 목록"""
+    selected = select_picks(grid, context['markets'], params)
+    eval_rows = context['eval_rows']
+    picks = {strategy: selected[strategy][eval_rows] for strategy in STRATEGIES}
+    forward = {h: grid[f'fwd_{h}'] for h in context['horizons']}
+    result = BacktestResult(context['dates'], context['codes'], context['names'], eval_rows, picks, forward)
+    settings = params.to_dict()
+    return [dict(settings, **row) for row in result.summary().to_dict('records')]
+
+
+def _evaluate_in_worker(params: StrategyParams) -> List[Dict[str, Any]]:
+    return _evaluate(_worker['grid'], _worker, params)
+
+
+class ParameterSweep:
+    """
+    StrategyParams 조합별 백테스트를 병렬로 수행하는 파라미터 스윕
+
+    - 기준값과 무관한 특징 격자는 Backtester.features()로 한 번만 계산
+    - 격자는 공유 메모리에 올리고, 프로세스 풀의 작업 프로세스가 조합마다 select_picks만 다시 계산
+    - 결과: 조합 × 전략 × 보유기간별 성과 DataFrame (기준값 필드 + BacktestResult.summary 컬럼)
+
+    사용법:
+        sweep = ParameterSweep(Backtester(panel))
+        table = sweep.run(param_grid(p2_max_disparity=[100, 105, 110]), start=20250101)
+
+    학습 포인트:
+    - 조합별 계산은 NumPy 연산이 대부분이지만 top_n_mask 정렬 등은 코어 하나를 꽉 채우므로,
+      스레드 대신 프로세스로 나눠야 코어 수만큼 빨라짐
+    """
+
+    def __init__(self, backtester: Backtester, max_workers: Optional[int] = None):
+        """
+        Args:
+            backtester: 패널과 보유 기간이 정해진 백테스터
+            max_workers: 작업 프로세스 수 (기본: CPU 수, 1 이하면 현재 프로세스에서 순서대로 실행)
+        """
+        self.backtester = backtester
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+
+    def run(self, param_sets: Sequence[StrategyParams], start: Optional[int] = None,
+            end: Optional[int] = None) -> pd.DataFrame:
+        """
+        Args:
+            param_sets: 평가할 기준값 조합 (param_grid 결과 등)
+            start, end: 평가 구간 (YYYYMMDD, 생략 시 패널 전체)
+
+        Returns:
+            param_sets 순서의 성과 DataFrame
+        """
+        panel = self.backtester.panel
+        grid = self.backtester.features()
+        context = {
+            'markets': panel.markets,
+            'dates': panel.dates,
+            'codes': panel.codes,
+            'names': panel.names,
+            'horizons': self.backtester.horizons,
+            'eval_rows': eval_range(panel.dates, start, end),
+        }
+
+        workers = min(self.max_workers, len(param_sets))
+        rows: List[Dict[str, Any]] = []
+        if workers <= 1:
+            for params in param_sets:
+                rows.extend(_evaluate(grid, context, params))
+            return pd.DataFrame(rows)
+
+        print(f"파라미터 스윕: {len(param_sets)}개 조합, 작업 프로세스 {workers}개")
+        with SharedGrids(grid) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.specs, context)) as executor:
+                for result in executor.map(_evaluate_in_worker, param_sets):
+                    rows.extend(result)
+        return pd.DataFrame(rows)
@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional, Iterable, List, Set, Tuple, Union
+
+from stock_v2.core.bar_store import BarStore
+
+# 주말(토/일)은 항상 휴장
+WEEKEND = (5, 6)
+
+DateLike = Union[date, datetime, str, int]
+
+
+def to_date(value: DateLike) -> date:
+    """datetime/Timestamp/'YYYYMMDD'/'YYYY-MM-DD'/YYYYMMDD 정수를 date로 변환"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).replace('-', '')
+    return datetime.strptime(text, "%Y%m%d").date()
+
+
+class KrxCalendar:
+    """
+    한국거래소(KRX) 거래일 달력
+
+    거래일 판정 순서:
+    1. 실제 봉이 관측된 날짜 → 거래일 (임시 개장 등 목록에 없는 예외도 자동 반영)
+    2. 휴장일 목록(krx_holidays.json) 또는 관측으로 추론된 휴장일 → 휴장
+    3. 주말 → 휴장, 그 외 평일 → 거래일
+
+    용도:
+    - '최근 N거래일'을 정확히 요청하기 위한 조회 시작일 계산
+    - 주말/공휴일에 실행해도 마지막 거래일로 기준일을 맞춰 저장소 캐시 키를 일정하게 유지
+
+    학습 포인트:
+    - set 조회는 평균 O(1)이므로 날짜 하나를 판정하는 비용이 매우 작음
+    """
+
+    def __init__(self, holidays: Optional[Iterable[DateLike]] = None):
+        """
+        Args:
+            holidays: 휴장일 목록 (None이면 stock_v2/krx_holidays.json을 읽음)
+        """
+        if holidays is None:
+            holidays = self._load_holiday_file()
+        self.holidays: Set[date] = {to_date(d) for d in holidays}
+        self.observed: Set[date] = set()
+
+    @staticmethod
+    def _load_holiday_file() -> List[str]:
+        """stock_v2/krx_holidays.json에서 휴장일 목록 로드 (없으면 빈 목록)"""
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(base_dir, 'krx_holidays.json')
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return list(json.load(f).keys())
+
+    def observe(self, sessions: Iterable[DateLike], infer_holidays: bool = True,
+                ranges: Optional[Iterable[Tuple[DateLike, DateLike]]] = None) -> None:
+        """
+        실제 봉이 있는 날짜들로 달력을 보정
+
+        Args:
+            sessions: 봉이 존재하는 날짜들 (여러 종목의 날짜를 합쳐서 넘기는 것을 권장)
+            infer_holidays: True면 추론 구간 안에서 봉이 없는 평일을 휴장일로 추론
+                (종목 하나만 넘기면 거래정지일이 휴장으로 잘못 추론될 수 있으므로 주의)
+            ranges: 휴장일을 추론할 구간 [(시작, 끝), ...] - 빠짐없이 조회했다고 확인된 구간만 넘김
+                (None이면 sessions의 처음~끝 한 구간. 떨어진 구간 사이의 빈 기간이 휴장으로 추론되지 않도록
+                 저장소에서는 종목별 저장 범위를 넘김)
+        """
+        days = {to_date(d) for d in sessions}
+        self.observed |= days
+        if not infer_holidays:
+            return
+        if ranges is None:
+            if not days:
+                return
+            ranges = [(min(days), max(days))]
+        for start, last in _merge_ranges(ranges):
+            current = start
+            while current <= last:
+                if current.weekday() not in WEEKEND and current not in self.observed:
+                    self.holidays.add(current)
+                current += timedelta(days=1)
+
+    def seed_from_store(self, store: BarStore, tickers: Optional[Iterable[str]] = None) -> None:
+        """
+        로컬 일봉 저장소의 날짜들로 달력을 보정 (여러 종목의 날짜 합집합 사용)
+
+        휴장 추론은 종목별 저장 범위(coverage: 빠짐없이 조회한 구간) 안에서만 하고,
+        그 안에서도 어떤 종목도 봉이 없는 평일만 휴장으로 봄
+        → 거래정지 종목이나, 저장 범위가 떨어져 있는 기간(예: 백테스트용 과거 구간과 최근 구간 사이)이
+          휴장으로 오인되지 않음
+        """
+        dates: Set[int] = set()
+        ranges: List[Tuple[int, int]] = []
+        for ticker in (tickers if tickers is not None else store.tickers()):
+            # 날짜 컬럼(date.npy)만 읽으므로 종목이 많아도 가벼움
+            dates.update(int(d) for d in store.dates(ticker))
+            coverage = store.coverage(ticker)
+            if coverage is not None:
+                ranges.append(coverage)
+        self.observe(dates, ranges=ranges)
+
+    def is_session(self, day: DateLike) -> bool:
+        """거래일 여부"""
+        d = to_date(day)
+        if d in self.observed:
+            return True
+        return d.weekday() not in WEEKEND and d not in self.holidays
+
+    def previous_session(self, day: DateLike) -> date:
+        """day 당일(거래일이면) 또는 그 이전의 가장 가까운 거래일"""
+        d = to_date(day)
+        while not self.is_session(d):
+            d -= timedelta(days=1)
+        return d
+
+    def next_session(self, day: DateLike) -> date:
+        """day 다음 날 이후의 가장 가까운 거래일"""
+        d = to_date(day) + timedelta(days=1)
+        while not self.is_session(d):
+            d += timedelta(days=1)
+        return d
+
+    def sessions_back(self, end: DateLike, count: int) -> List[date]:
+        """
+        end(포함) 이전의 최근 count개 거래일 (오름차순)
+
+        Args:
+            end: 기준일 (휴장일이면 직전 거래일부터 셈)
+            count: 거래일 수
+        """
+        result: List[date] = []
+        d = self.previous_session(end)
+        while len(result) < count:
+            result.append(d)
+            d = self.previous_session(d - timedelta(days=1))
+        result.reverse()
+        return result
+
+    def sessions_between(self, start: DateLike, end: DateLike) -> List[date]:
+        """start~end(양 끝 포함) 사이의 거래일 목록 (오름차순)"""
+        d, last = to_date(start), to_date(end)
+        result: List[date] = []
+        while d <= last:
+            if self.is_session(d):
+                result.append(d)
+            d += timedelta(days=1)
+        return result
+
+    def window(self, end: DateLike, count: int) -> List[date]:
+        """
+        조회 창 [시작 거래일, 마지막 거래일] 반환 (count개 거래일을 정확히 덮는 구간)
+
+        Returns:
+            [start, end] 두 날짜의 리스트
+        """
+        sessions = self.sessions_back(end, count)
+        return [sessions[0], sessions[-1]]
+
+
+def _merge_ranges(ranges: Iterable[Tuple[DateLike, DateLike]]) -> List[Tuple[date, date]]:
+    """겹치거나 맞닿은 날짜 구간을 합침 (종목이 많아도 날짜마다 한 번만 훑도록)"""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted((to_date(a), to_date(b)) for a, b in ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# 프로세스 전체에서 공유하는 달력 (처음 사용할 때 휴장일 파일 + 저장소로 초기화)
+_CALENDAR: Optional[KrxCalendar] = None
+_CALENDAR_LOCK = threading.Lock()
+
+
+def get_calendar(store: Optional[BarStore] = None) -> KrxCalendar:
+    """
+    공유 KRX 달력 반환 (최초 호출 시 생성)
+
+    Args:
+        store: 최초 생성 시 관측 날짜를 가져올 저장소 (없으면 휴장일 파일만 사용)
+    """
+    global _CALENDAR
+    with _CALENDAR_LOCK:
+        if _CALENDAR is None:
+            calendar = KrxCalendar()
+            if store is not None:
+                try:
+                    calendar.seed_from_store(store)
+                except OSError as e:
+                    # 저장소를 읽지 못해도 휴장일 목록만으로 동작 가능
+                    print(f"[Calendar] 저장소 기반 보정 실패: {e}")
+            _CALENDAR = calendar
+        return _CALENDAR
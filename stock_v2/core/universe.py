@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 기본 종목 리스트 파일 (stock_v2/tickers.json)
+TICKERS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tickers.json')
+
+# 종목코드 고정 폭 (KRX 단축코드 6자리, 예: 005930, 0126Z0)
+CODE_WIDTH = 6
+
+# DataFrame으로 돌려줄 때의 컬럼 (기존 _load_tickers 결과와 같은 이름/순서)
+UNIVERSE_COLUMNS = ('code', 'name', 'market', 'cap')
+
+
+class MarketIndex:
+    """
+    한 시장의 종목 인덱스 (시가총액 내림차순으로 미리 정렬)
+
+    - codes: 고정 폭 문자열 배열 (dtype U6)
+    - caps: 시가총액(원) int64 배열
+    - names: 종목명 리스트
+
+    학습 포인트:
+    - 미리 정렬해 두면 '상위 N개'는 슬라이스 [:n] 한 번으로 끝남 (매번 정렬/마스킹 불필요)
+    - 내림차순 배열에서 '시총 X 이상'의 경계는 이진 탐색(searchsorted)으로 O(log N)에 찾음
+    """
+
+    def __init__(self, market: str, codes: np.ndarray, names: List[str], caps: np.ndarray):
+        # 안정 정렬: 시총이 같으면 파일 순서 유지
+        order = np.argsort(-caps, kind='stable')
+        self.market = market
+        self.codes = codes[order]
+        self.names = [names[i] for i in order]
+        self.caps = caps[order]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def top_slice(self, n: Optional[int]) -> slice:
+        """시총 상위 n개 구간 (None이면 전체)"""
+        return slice(0, len(self.codes) if n is None else max(0, n))
+
+    def above_slice(self, min_cap: float) -> slice:
+        """시총 min_cap 이상 구간"""
+        # 내림차순이므로 부호를 바꾼 오름차순 배열에서 경계를 찾음
+        end = int(np.searchsorted(-self.caps, -min_cap, side='right'))
+        return slice(0, end)
+
+    def frame(self, part: slice) -> pd.DataFrame:
+        """구간을 DataFrame(code, name, market, cap)으로 변환"""
+        codes = self.codes[part]
+        return pd.DataFrame({
+            'code': codes.astype(object),
+            'name': self.names[part],
+            'market': [self.market] * len(codes),
+            'cap': self.caps[part],
+        }, columns=list(UNIVERSE_COLUMNS))
+
+
+class TickerUniverse:
+    """
+    tickers.json을 한 번만 읽어 시장별 인덱스로 보관하는 종목 유니버스
+
+    - 파일의 수정 시각/크기가 바뀌었을 때만 다시 읽음 (조회마다 os.stat 한 번)
+    - 모든 진입점(스캐너, P1 스크립트, 백테스트)이 get_universe()로 같은 객체를 공유
+
+    사용법:
+        universe = get_universe()
+        top100 = universe.top("KOSPI", 100)          # 시총 상위 100 (DataFrame)
+        large = universe.above(1e12)                  # 전체 시장 시총 1조 이상
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or TICKERS_FILE
+        self._indexes: Dict[str, MarketIndex] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> Dict[str, MarketIndex]:
+        """파일이 바뀌었으면 다시 읽고, 현재 인덱스 반환"""
+        signature = self._file_signature()
+        with self._lock:
+            if signature != self._signature:
+                self._indexes = self._load() if signature is not None else {}
+                if signature is None:
+                    print(f"로컬 파일도 찾을 수 없습니다: {self.path}")
+                self._signature = signature
+            return self._indexes
+
+    def _load(self) -> Dict[str, MarketIndex]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        grouped: Dict[str, List[dict]] = {}
+        for record in records:
+            grouped.setdefault(record.get('market', ''), []).append(record)
+
+        indexes = {}
+        for market, items in grouped.items():
+            codes = np.array([str(item['code']).zfill(CODE_WIDTH) for item in items], dtype=f'U{CODE_WIDTH}')
+            names = [item.get('name', '') for item in items]
+            caps = np.array([int(item.get('cap') or 0) for item in items], dtype=np.int64)
+            indexes[market] = MarketIndex(market, codes, names, caps)
+        return indexes
+
+    def markets(self) -> List[str]:
+        return list(self._refresh().keys())
+
+    def index(self, market: str) -> Optional[MarketIndex]:
+        """시장 인덱스 (없는 시장이면 None)"""
+        return self._refresh().get(market)
+
+    def top(self, market: str, n: Optional[int] = None) -> pd.DataFrame:
+        """시장 market의 시가총액 상위 n개 (시총 내림차순, n=None이면 전체)"""
+        index = self.index(market)
+        if index is None:
+            return pd.DataFrame(columns=list(UNIVERSE_COLUMNS))
+        return index.frame(index.top_slice(n))
+
+    def above(self, min_cap: float, market: Optional[str] = None) -> pd.DataFrame:
+        """시가총액 min_cap 이상 종목 (market=None이면 전체 시장, 시장별로 시총 내림차순)"""
+        indexes = self._refresh()
+        markets = [market] if market is not None else list(indexes)
+        frames = [indexes[m].frame(indexes[m].above_slice(min_cap)) for m in markets if m in indexes]
+        if not frames:
+            return pd.DataFrame(columns=list(UNIVERSE_COLUMNS))
+        return pd.concat(frames, ignore_index=True)
+
+
+# 프로세스 전체에서 공유하는 유니버스 (파일 경로별 하나)
+_UNIVERSES: Dict[str, TickerUniverse] = {}
+_UNIVERSES_LOCK = threading.Lock()
+
+
+def get_universe(path: Optional[str] = None) -> TickerUniverse:
+    """
+    공유 종목 유니버스 반환 (경로별로 최초 호출 시 생성)
+
+    Args:
+        path: 종목 리스트 파일 (기본: stock_v2/tickers.json)
+    """
+    path = os.path.abspath(path or TICKERS_FILE)
+    with _UNIVERSES_LOCK:
+        if path not in _UNIVERSES:
+            _UNIVERSES[path] = TickerUniverse(path)
+        return _UNIVERSES[path]
@@ -1,17 +1,27 @@
 import sys
 import os
+import argparse
 import pandas as pd
 from datetime import datetime
+from tqdm import tqdm
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from stock_v2.core.pipeline import MarketScanner
+from stock_v2.tracing import enable_tracing
 
 def main():
+    parser = argparse.ArgumentParser(description="P1/P2 분석 (KOSPI + KOSDAQ 스캔)")
+    parser.add_argument("--trace", help="구간 추적을 켜고 Chrome trace JSON을 이 경로에 저장")
+    parser.add_argument("--metrics", help="스캔 후 KIS 요청 지표 저장 경로 (.prom: Prometheus 텍스트, 그 외: JSON)")
+    args = parser.parse_args()
+    tracer = enable_tracing() if args.trace else None
+
     print("=== Stock Analysis V2 (P1 & P2) ===")
     
     scanner = MarketScanner()
+    scanner.metrics_path = args.metrics
     
     # [수정] 오늘 날짜(2026-01-05) 기준으로 분석
     target_date = datetime.now()
@@ -20,13 +30,16 @@ def main():
     
     print(f"Target Date: {target_date.strftime('%Y-%m-%d')}")
     
-    # 1. Scan KOSPI
-    print("\n[1] Scanning KOSPI...")
-    df_kospi = scanner.run_scan(market_type="KOSPI", top_n=100, target_date=target_date)
-    
-    # 2. Scan KOSDAQ
-    print("\n[2] Scanning KOSDAQ...")
-    df_kosdaq = scanner.run_scan(market_type="KOSDAQ", top_n=100, target_date=target_date)
+    # 1~2. Scan KOSPI + KOSDAQ (한 작업 큐로 동시에 스캔, 조건 만족 종목은 나오는 대로 출력)
+    print("\n[1] Scanning KOSPI + KOSDAQ...")
+    view = None
+    # checkpoint=True: 중간에 끊기면 다시 실행했을 때 끝난 종목은 건너뛰고 이어서 스캔
+    for update in scanner.stream_scan(["KOSPI", "KOSDAQ"], top_n=100, target_date=target_date, checkpoint=True):
+        view = update.view
+        if update.result:
+            tqdm.write(f"  + [{update.market}] {update.result['name']} {update.result['reasons']}")
+    df_kospi = view.results("KOSPI") if view else pd.DataFrame()
+    df_kosdaq = view.results("KOSDAQ") if view else pd.DataFrame()
     
     # 3. Process P1 (Index Leaders) - Global Top 5
     print("\n[Processing P1: Index Leaders]")
@@ -39,7 +52,7 @@ def main():
     if not all_results.empty:
         # P1: Contribution Score > 0, Top 5
         p1_candidates = all_results[all_results['contribution'] > 0].copy()
-        p1_final = p1_candidates.sort_values(by='contribution', ascending=False).head(5)
+        p1_final = p1_candidates.sort_values(by='contribution', ascending=False).head(scanner.strategy.params.p1_top_k)
         
         print(f"-> P1 Top 5 Selected")
         print(p1_final[['code', 'name', '현재가', '등락률', 'contribution']].to_string(index=False))
@@ -77,5 +90,14 @@ def main():
             
         print(disp.to_string(index=False))
 
+    if args.metrics:
+        print(f"\n[Metrics] 저장: {args.metrics}")
+        print(scanner.data_fetcher.client.metrics.summary().to_string(index=False))
+
+    if tracer is not None:
+        tracer.export_chrome(args.trace)
+        print(f"\n[Trace] 저장: {args.trace} (chrome://tracing 또는 ui.perfetto.dev 에서 열기)")
+        print(tracer.summary().to_string(index=False))
+
 if __name__ == "__main__":
     main()
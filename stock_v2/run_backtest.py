@@ -0,0 +1,59 @@
+import sys
+import os
+import argparse
+import pandas as pd
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from stock_v2.core.backtest import HistoryPanel, Backtester, prefetch_history, SCAN_WINDOW
+from stock_v2.core.bar_store import date_to_int
+from stock_v2.core.universe import get_universe
+
+
+def load_tickers(top_n):
+    """시장별 시가총액 상위 top_n 종목 로드 (스캐너와 같은 공유 종목 유니버스)"""
+    universe = get_universe()
+    return pd.concat([universe.top(m, top_n) for m in ("KOSPI", "KOSDAQ")], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="P1/P2/P3 규칙 백테스트 (로컬 일봉 저장소 기준)")
+    parser.add_argument("--start", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"), help="평가 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=datetime.now().strftime("%Y-%m-%d"), help="평가 종료일 (YYYY-MM-DD)")
+    parser.add_argument("--top-n", type=int, default=100, help="시장별 시가총액 상위 종목 수")
+    parser.add_argument("--fetch", action="store_true", help="저장소에 없는 구간을 KIS API로 먼저 받아 둠")
+    parser.add_argument("--picks", help="선정 내역을 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d")
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    # 지표 계산용 여유 구간 (80거래일 ≈ 120달력일)
+    warmup_start = start - timedelta(days=SCAN_WINDOW * 3 // 2)
+
+    tickers_df = load_tickers(args.top_n)
+    print(f"=== Backtest {args.start} ~ {args.end} ({len(tickers_df)} stocks) ===")
+
+    if args.fetch:
+        print("저장소 채우는 중...")
+        prefetch_history(tickers_df['code'].tolist(), warmup_start, end)
+
+    panel = HistoryPanel.from_store(tickers_df, start=date_to_int(warmup_start), end=date_to_int(end))
+    if not panel.codes:
+        print("저장소에 데이터가 없습니다. --fetch 옵션으로 먼저 받아 주세요.")
+        return
+    print(f"로드: {len(panel.codes)}종목 × {len(panel.dates)}거래일")
+    print("참고: 종목 목록은 현재 시총 상위 기준(생존 편향), P1 시가총액은 현재 시총을 종가 비율로 되돌린 추정치")
+
+    result = Backtester(panel).run(start=date_to_int(start), end=date_to_int(end))
+    summary = result.summary()
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    if args.picks:
+        result.picks_frame().to_csv(args.picks, index=False, encoding='utf-8-sig')
+        print(f"선정 내역 저장: {args.picks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import sys
+import os
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from stock_v2.core.benchmark import (
+    ScanBenchmark, SUITES, DEFAULT_TOLERANCE, parse_case, default_baseline_path,
+    save_report, load_report, compare_reports,
+)
+
+# 기준선과 결과 조건이 다르면 비교 의미가 없는 메타 항목
+COMPARABLE_META = ('seed', 'fetch_sample', 'trace_memory', 'end_date', 'cpus')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 시장 기준 스캔 성능 벤치마크 (단계별 처리량, p50/p99, 메모리)")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick", help="미리 정해 둔 규모 묶음")
+    parser.add_argument("--case", action="append", help="직접 지정한 규모 (예: 2500x3 = 2500종목 × 3년, 여러 번 지정 가능)")
+    parser.add_argument("--seed", type=int, default=0, help="가상 시장 시드")
+    parser.add_argument("--fetch-sample", type=int, default=200, help="fetch 단계에서 조회할 종목 수")
+    parser.add_argument("--scan-repeat", type=int, default=1, help="scan 단계 반복 횟수")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 끔 (tracemalloc 오버헤드 제거)")
+    parser.add_argument("--out", default="benchmark.json", help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=default_baseline_path(), help="비교할 기준선 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="처리량 감소 허용 비율")
+    args = parser.parse_args()
+
+    cases = [parse_case(text) for text in args.case] if args.case else list(SUITES[args.suite])
+    bench = ScanBenchmark(seed=args.seed, fetch_sample=args.fetch_sample, scan_repeat=args.scan_repeat,
+                          trace_memory=not args.no_memory)
+    report = bench.run(cases)
+    save_report(report, args.out)
+    print(f"\n결과 저장: {args.out}")
+
+    exit_code = 0
+    baseline = load_report(args.baseline)
+    if baseline is None:
+        print(f"기준선 없음: {args.baseline}")
+    else:
+        changed = [key for key in COMPARABLE_META if baseline['meta'].get(key) != report['meta'].get(key)]
+        if changed:
+            print(f"주의: 기준선과 측정 조건이 다릅니다 ({', '.join(changed)})")
+        comparison = compare_reports(report, baseline, args.tolerance)
+        if comparison.empty:
+            print("기준선에 같은 규모의 결과가 없습니다.")
+        else:
+            print(f"\n=== 기준선 비교 ({baseline['meta'].get('created')}) ===")
+            print(comparison[['case', 'stage', 'throughput_before', 'throughput_after', 'change',
+                              'p50_before', 'p50_after', 'p99_before', 'p99_after', 'regression']].to_string(index=False))
+            if comparison['regression'].any():
+                print(f"\n처리량이 {args.tolerance:.0%} 이상 줄어든 단계가 있습니다.")
+                exit_code = 1
+
+    if args.update_baseline:
+        save_report(report, args.baseline)
+        print(f"기준선 갱신: {args.baseline}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
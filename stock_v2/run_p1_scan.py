@@ -3,43 +3,32 @@ import os
 import pandas as pd
 from tqdm import tqdm
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
 
 # Add project root to path
 # stock_v2/run_p1_scan.py -> stock_v2/ -> p1/
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from stock_v2.core.data_fetcher import DataFetcher
+from stock_v2.core.concurrency import AdaptiveConcurrency
+from stock_v2.core.p1_ranker import P1Ranker
+from stock_v2.core.trading_calendar import get_calendar
+from stock_v2.core.universe import get_universe
 
 def load_top_50_kospi():
-    # Load tickers from stock_v2/tickers.json
-    # __file__ = .../stock_v2/run_p1_scan.py
-    # dirname(__file__) = .../stock_v2
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(base_dir, "tickers.json")
-    
-    try:
-        df = pd.read_json(json_path)
-        # Filter KOSPI
-        df = df[df['market'] == 'KOSPI']
-        # Sort by Cap desc
-        df = df.sort_values(by='cap', ascending=False)
-        # Top 50
-        return df.head(50)
-    except Exception as e:
-        print(f"Error loading tickers: {e}")
-        return pd.DataFrame()
+    # KOSPI 시가총액 상위 50 (공유 종목 유니버스: tickers.json을 시장별 시총 내림차순으로 보관)
+    return get_universe().top('KOSPI', 50)
 
 def fetch_price_data(client, ticker, name, cap, target_date):
     try:
-        # Fetch chart data (small range)
+        # Fetch chart data (target session + previous session)
         # target_date format: YYYY-MM-DD
         # API needs YYYYMMDD
         target_str = target_date.replace("-", "")
         
-        end_dt = datetime.strptime(target_str, "%Y%m%d")
-        start_dt = end_dt - timedelta(days=10)
+        # 거래일 달력으로 '기준일 + 직전 거래일' 구간을 정확히 요청
+        # (고정 10일 창은 연휴가 길면 전일 종가를 놓칠 수 있었음)
+        calendar = get_calendar()
+        start_dt, end_dt = calendar.window(target_str, 2)
         
         start_str = start_dt.strftime("%Y%m%d")
         end_str = target_str
@@ -63,6 +52,7 @@ def fetch_price_data(client, ticker, name, cap, target_date):
                     prev_close = float(prev_day['stck_clpr'])
                     rate = ((close - prev_close) / prev_close) * 100
                 else:
+                    print(f"[{ticker}] 전일 종가 없음 ({start_str}~{end_str}), 등락률 0으로 처리")
                     rate = 0
                 
                 contribution = cap * rate
@@ -85,7 +75,11 @@ def main():
     print(f"Starting P1 (Index Contribution) Scan for date: {target_date} (Parallel)")
     print("Target: Top 50 KOSPI Stocks by Market Cap")
     
+    # DataFetcher 생성 시 공유 거래일 달력이 로컬 저장소 기준으로 보정됨
     fetcher = DataFetcher()
+    if not get_calendar().is_session(target_date):
+        print(f"{target_date} is not a KRX trading day.")
+        return
     # Ensure auth
     if not fetcher.client.access_token:
         if not fetcher.client.auth():
@@ -100,22 +94,31 @@ def main():
 
     print(f"Scanning {len(tickers_df)} stocks...")
     
-    results = []
     client = fetcher.client
     
-    max_workers = 2
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = []
-        for idx, row in tickers_df.iterrows():
-            ticker = str(row['code']).zfill(6)
-            name = row['name']
-            cap = row['cap']
-            futures.append(executor.submit(fetch_price_data, client, ticker, name, cap, target_date))
-            
-        for future in tqdm(as_completed(futures), total=len(futures)):
-            res = future.result()
-            if res:
-                results.append(res)
+    # 적응형 동시성: 모의/실전 한도에 맞춰 동시 요청 수를 자동 조절
+    controller = AdaptiveConcurrency.for_account(client.mock)
+
+    def evaluate(row):
+        ticker = str(row['code']).zfill(6)
+        return fetch_price_data(client, ticker, row['name'], row['cap'], target_date)
+
+    # 분기 한정: 시총 순으로 조회하다가 남은 종목이 Top 5에 들 수 없으면 조기 종료
+    ranker = P1Ranker(k=5)
+    progress = tqdm(total=len(tickers_df))
+
+    def on_progress(done, total):
+        progress.update(1)
+
+    client.add_listener(controller.on_request)
+    try:
+        results = ranker.rank(tickers_df, evaluate, max_workers=controller.max_limit,
+                              controller=controller, progress_callback=on_progress)
+    finally:
+        client.remove_listener(controller.on_request)
+        progress.close()
+    print(controller.summary())
+    print(ranker.summary())
         
     if not results:
         print("No data found for the target date.")
@@ -0,0 +1,48 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from stock_v2.api.simulator import KisSimulator, SimulatorConfig, SyntheticMarket, StoreMarket
+from stock_v2.core.bar_store import BarStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 KIS API 시뮬레이터 (부하 테스트/벤치마크용)")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8090, help="포트")
+    parser.add_argument("--latency", type=float, default=0.03, help="요청당 기본 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="추가 무작위 지연 상한(초)")
+    parser.add_argument("--rate-limit", type=float, default=20.0, help="초당 허용 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 주입 확률 (0~1)")
+    parser.add_argument("--seed", type=int, default=0, help="가상 시세/지연/오류 난수 시드")
+    parser.add_argument("--end-date", help="가상 시세의 마지막 거래일 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument("--store", help="가상 시세 대신 이 일봉 저장소 디렉토리의 기록된 봉을 제공")
+    args = parser.parse_args()
+
+    if args.store:
+        market = StoreMarket(BarStore(args.store))
+    else:
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date else None
+        market = SyntheticMarket(end_date=end_date, seed=args.seed)
+
+    config = SimulatorConfig(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                             error_rate=args.error_rate, seed=args.seed)
+    simulator = KisSimulator(market, config, host=args.host, port=args.port)
+
+    print(f"=== KIS Simulator: http://{args.host}:{args.port} ===")
+    print(f"지연 {args.latency}s(+{args.jitter}s), 초당 {args.rate_limit}건, 오류율 {args.error_rate}")
+    print("클라이언트 쪽에서:")
+    print(f"  export KIS_BASE_URL=http://{args.host}:{args.port}")
+    print("  export STOCK_V2_HOME=/tmp/stock_v2_sim   # 가상 시세가 실제 일봉 저장소에 섞이지 않도록")
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n종료. 통계: {simulator.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import argparse
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from stock_v2.core.backtest import HistoryPanel, Backtester, SCAN_WINDOW
+from stock_v2.core.bar_store import date_to_int
+from stock_v2.core.sweep import ParameterSweep, param_grid
+from stock_v2.run_backtest import load_tickers
+
+
+def parse_grid(items):
+    """['p2_max_disparity=100,105,110', ...] → {'p2_max_disparity': [100, 105, 110], ...}"""
+    ranges = {}
+    for item in items or []:
+        name, _, values = item.partition('=')
+        if not values:
+            raise SystemExit(f"--grid 형식 오류: {item} (예: p2_max_disparity=100,105,110)")
+        ranges[name.strip()] = [float(v) if '.' in v else int(v) for v in values.split(',')]
+    return ranges
+
+
+def main():
+    parser = argparse.ArgumentParser(description="P1/P2/P3 기준값 파라미터 스윕 (로컬 일봉 저장소 기준)")
+    parser.add_argument("--start", default=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"), help="평가 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=datetime.now().strftime("%Y-%m-%d"), help="평가 종료일 (YYYY-MM-DD)")
+    parser.add_argument("--top-n", type=int, default=100, help="시장별 시가총액 상위 종목 수")
+    parser.add_argument("--grid", action="append", help="기준값 범위 (예: --grid p2_max_disparity=100,105,110), 여러 번 지정 가능")
+    parser.add_argument("--horizon", type=int, default=5, help="결과 표에 보여줄 보유 기간 (거래일)")
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--out", help="전체 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d")
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    warmup_start = start - timedelta(days=SCAN_WINDOW * 3 // 2)
+
+    ranges = parse_grid(args.grid)
+    param_sets = param_grid(**ranges)
+    tickers_df = load_tickers(args.top_n)
+    print(f"=== Sweep {args.start} ~ {args.end} ({len(tickers_df)} stocks, {len(param_sets)} sets) ===")
+
+    panel = HistoryPanel.from_store(tickers_df, start=date_to_int(warmup_start), end=date_to_int(end))
+    if not panel.codes:
+        print("저장소에 데이터가 없습니다. run_backtest.py --fetch로 먼저 받아 주세요.")
+        return
+
+    backtester = Backtester(panel, horizons=sorted({1, args.horizon}))
+    table = ParameterSweep(backtester, max_workers=args.workers).run(
+        param_sets, start=date_to_int(start), end=date_to_int(end))
+
+    shown = table[table['horizon'] == args.horizon]
+    columns = list(ranges) + ['strategy', 'picks', 'mean_return', 'hit_rate', 'excess_return']
+    print(shown[columns].to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    if args.out:
+        table.to_csv(args.out, index=False, encoding='utf-8-sig')
+        print(f"결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 기록된 span: (이름, 분류, 시작(초), 끝(초), 스레드 ID, 스레드 이름, 인자)
+# asyncio 작업 안에서 기록된 span은 스레드 대신 작업(Task) ID/이름을 씀
+SpanRecord = Tuple[str, str, float, float, int, str, Dict[str, Any]]
+
+
+class Span:
+    """
+    구간 하나 (with 블록이 끝날 때 Tracer에 기록)
+
+    - set(**args)로 블록 안에서 알게 된 값(응답 코드, 대기 시간 등)을 덧붙일 수 있음
+    """
+
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc_info: Any) -> None:
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record((self.name, self.cat, self.start, end, *_lane(), self.args))
+
+
+def _lane() -> Tuple[int, str]:
+    """
+    span을 그릴 줄 (ID, 이름)
+
+    이벤트 루프의 코루틴들은 모두 한 스레드에서 번갈아 실행되므로, 스레드 기준으로 그리면
+    동시에 진행 중인 요청들의 구간이 한 줄에 겹쳐 보임 → asyncio 작업마다 줄을 나눔
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return id(task), task.get_name()
+    thread = threading.current_thread()
+    return thread.ident, thread.name
+
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 돌려주는 빈 span (모든 호출이 같은 객체를 공유)"""
+
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    스캔 구간 추적기 (인증, 차트/투자자 조회, 속도 제한 대기, DataFrame 구성, 지표, 판정, 필터)
+
+    - 꺼져 있으면 span()이 미리 만들어 둔 빈 객체를 돌려주므로 비용이 거의 없음
+    - 켜져 있으면 구간마다 (이름, 시작/끝, 스레드, 인자)를 메모리에 모아 둠
+    - export_chrome(): Chrome trace-event JSON (chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)
+    - summary(): 구간 이름별 횟수/합계/p50/p99 표
+
+    사용법:
+        tracer = enable_tracing()
+        scanner.run_scan("KOSPI", top_n=200)      # 끝나면 구간별 요약표 출력
+        tracer.export_chrome("scan_trace.json")
+
+    학습 포인트:
+    - 스레드 풀 작업은 스레드 ID별(비동기 경로는 asyncio 작업별) 줄로 나뉘어 보이므로, 어느 스레드가 무엇을 기다리는지
+      (속도 제한 대기 vs HTTP vs 분석) 타임라인에서 바로 확인 가능
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events: List[SpanRecord] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, cat: str = "scan", **args: Any):
+        """구간 시작 (with 문으로 사용)"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, cat, args)
+
+    def record(self, event: SpanRecord) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events = []
+            self._origin = time.perf_counter()
+
+    def mark(self) -> int:
+        """지금까지 기록된 구간 수 (이후 구간만 요약할 때 since로 사용)"""
+        with self._lock:
+            return len(self._events)
+
+    def events(self, since: int = 0) -> List[SpanRecord]:
+        with self._lock:
+            return self._events[since:]
+
+    def to_chrome(self, since: int = 0) -> Dict[str, Any]:
+        """Chrome trace-event 형식 (완료 이벤트 'X', 시간 단위 µs)"""
+        pid = os.getpid()
+        trace_events = []
+        threads = {}
+        for name, cat, start, end, tid, thread_name, args in self.events(since):
+            threads[tid] = thread_name
+            trace_events.append({
+                'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'args': {key: _jsonable(value) for key, value in args.items()},
+            })
+        for tid, thread_name in threads.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                                 'args': {'name': thread_name}})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome(self, path: str, since: int = 0) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome(since), f, ensure_ascii=False)
+
+    def summary(self, since: int = 0) -> pd.DataFrame:
+        """
+        구간 이름별 통계 (합계 시간 내림차순)
+
+        참고: 구간은 중첩되므로(예: kis.request 안의 kis.http) total_s를 모두 더하면 실제 시간보다 큼
+        threads는 구간이 기록된 스레드 수 (비동기 경로는 asyncio 작업 수)
+        """
+        durations: Dict[str, List[float]] = {}
+        threads: Dict[str, set] = {}
+        for name, _, start, end, tid, _, _ in self.events(since):
+            durations.setdefault(name, []).append(end - start)
+            threads.setdefault(name, set()).add(tid)
+        rows = []
+        for name, values in durations.items():
+            values = np.array(values)
+            rows.append({
+                'span': name,
+                'count': len(values),
+                'total_s': round(float(values.sum()), 3),
+                'mean_ms': round(float(values.mean()) * 1000, 2),
+                'p50_ms': round(float(np.percentile(values, 50)) * 1000, 2),
+                'p99_ms': round(float(np.percentile(values, 99)) * 1000, 2),
+                'max_ms': round(float(values.max()) * 1000, 2),
+                'threads': len(threads[name]),
+            })
+        if not rows:
+            return pd.DataFrame(columns=['span', 'count', 'total_s', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms', 'threads'])
+        return pd.DataFrame(rows).sort_values('total_s', ascending=False, ignore_index=True)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+# 프로세스 전체에서 공유하는 추적기
+_TRACER = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _TRACER
+
+
+def span(name: str, cat: str = "scan", **args: Any):
+    """공유 추적기의 구간 (추적이 꺼져 있으면 빈 span)"""
+    if not _TRACER.enabled:
+        return _NOOP_SPAN
+    return Span(_TRACER, name, cat, args)
+
+
+def traced(name: str, cat: str = "scan") -> Callable:
+    """
+    함수 호출 전체를 구간으로 기록하는 데코레이터 (본문을 with 블록으로 감싸지 않아도 됨)
+
+    사용법:
+        @traced("scan.filter_p2")
+        def filter_p2_stocks(self, df_results): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _TRACER.enabled:
+                return func(*args, **kwargs)
+            with Span(_TRACER, name, cat, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable_tracing(reset: bool = True) -> Tracer:
+    """공유 추적기 켜기 (reset이면 이전 기록 삭제)"""
+    if reset:
+        _TRACER.reset()
+    _TRACER.enabled = True
+    return _TRACER
+
+
+def disable_tracing() -> None:
+    _TRACER.enabled = False
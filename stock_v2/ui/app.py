@@ -11,6 +11,7 @@ import stock_v2.core.pipeline
 import importlib
 importlib.reload(stock_v2.core.pipeline)
 from stock_v2.core.pipeline import MarketScanner
+from stock_v2.core.prefilter import SnapshotPrefilter
 
 st.set_page_config(page_title="Stock V2 Analyzer", layout="wide")
 
@@ -53,9 +54,12 @@ with tab1:
     
     with col2:
         top_n = st.number_input("시장별 스캔 종목 수 (시총 상위)", min_value=50, max_value=300, value=100, step=50)
+        # 사전 필터: 현재가 스냅샷으로 시총 1조 미만/+10% 급등주를 상세 조회 전에 제외 (당일 스캔 전용)
+        use_prefilter = st.checkbox("사전 필터 (시총 1조↑, +10% 급등 제외)", value=False)
 
     if st.button("🚀 스캔 시작", key="btn_scan_v2"):
         scanner = MarketScanner()
+        prefilter = SnapshotPrefilter() if use_prefilter else None
         status_text = st.empty()
         progress_bar = st.progress(0)
         
@@ -63,35 +67,32 @@ with tab1:
         results_kosdaq = pd.DataFrame()
         
         try:
-            # 1. KOSPI Scan
+            # 1~2. 선택한 시장을 한 작업 큐로 동시에 스캔 (결과는 시장별로 받음)
+            markets = []
             if scan_mode != "KOSDAQ만":
-                status_text.text(f"KOSPI 시가총액 상위 {top_n}개 스캔 중...")
-                
-                def update_kospi(p, msg):
-                    # KOSPI는 전체의 0~50% 구간 사용
-                    current_p = int(p * 50)
-                    progress_bar.progress(current_p)
-                    status_text.text(msg)
-                    
-                results_kospi = scanner.run_scan(market_type="KOSPI", top_n=top_n, target_date=target_datetime, progress_callback=update_kospi)
-            
-            # 2. KOSDAQ Scan
+                markets.append("KOSPI")
             if scan_mode != "KOSPI만":
-                status_text.text(f"KOSDAQ 시가총액 상위 {top_n}개 스캔 중...")
-                
-                def update_kosdaq(p, msg):
-                    # KOSDAQ은 전체의 50~100% 구간 사용
-                    # KOSPI를 안 했으면 0~100% 사용해야 하지만, 여기서는 통합 스캔 기준
-                    base = 50 if scan_mode != "KOSDAQ만" else 0
-                    scale = 50 if scan_mode != "KOSDAQ만" else 100
-                    
-                    current_p = base + int(p * scale)
-                    if current_p > 100: current_p = 100
-                    progress_bar.progress(current_p)
-                    status_text.text(msg)
-                    
-                results_kosdaq = scanner.run_scan(market_type="KOSDAQ", top_n=top_n, target_date=target_datetime, progress_callback=update_kosdaq)
-                
+                markets.append("KOSDAQ")
+            status_text.text(f"{'+'.join(markets)} 시가총액 상위 {top_n}개씩 스캔 중...")
+
+            # 스트리밍 스캔: 조건을 만족한 종목이 나오는 대로 중간 결과 표에 표시
+            # (체크포인트 사용: 스캔 도중 앱이 재실행되어도 끝난 종목은 다시 조회하지 않음)
+            live_table = st.empty()
+            view = None
+            for update in scanner.stream_scan(markets, top_n=top_n, target_date=target_datetime, prefilter=prefilter,
+                                              checkpoint=True):
+                view = update.view
+                progress_bar.progress(min(int(update.progress * 100), 100))
+                status_text.text(f"[{'+'.join(markets)}] {update.done}/{update.total} 분석 중...")
+                if update.result:
+                    live = view.results()[['code', 'name', 'reasons', '등락률']]
+                    live_table.dataframe(live, use_container_width=True)
+            live_table.empty()
+
+            if view is not None:
+                results_kospi = view.results("KOSPI") if "KOSPI" in markets else pd.DataFrame()
+                results_kosdaq = view.results("KOSDAQ") if "KOSDAQ" in markets else pd.DataFrame()
+
             # 3. 결과 통합 및 P1/P2 필터링
             status_text.text("결과 분석 및 필터링 중...")
             
@@ -105,7 +106,7 @@ with tab1:
                 # 기여도(contribution) 양수인 것 중 상위 5개
                 p1_candidates = all_results[all_results['contribution'] > 0].copy()
                 if not p1_candidates.empty:
-                    p1_final = p1_candidates.sort_values(by='contribution', ascending=False).head(5)
+                    p1_final = p1_candidates.sort_values(by='contribution', ascending=False).head(scanner.strategy.params.p1_top_k)
                     
                     # 포맷팅
                     p1_display = p1_final[['code', 'name', '현재가', '등락률', 'contribution', '외국인순매수', '기관순매수']].copy()